@@ -1,5 +1,7 @@
 # Simple automatization for building an addon
 
+import importlib.util
+import re
 import sys
 import os
 import shutil
@@ -46,6 +48,44 @@ if not target:
 
 currentDir = os.path.dirname(os.path.realpath(__file__))
 
+
+def referencedIcons(sourceDir):
+    """ Names used through the icon registry (src/icons.py): (names to pack, names kept as files) """
+
+    packed, files = set(), set()
+    for fileName in os.listdir(sourceDir):
+        if not fileName.endswith('.py'):
+            continue
+        with open(os.path.join(sourceDir, fileName), encoding='utf-8') as f:
+            code = f.read()
+        for method, args in re.findall(r"icons\.(icon|pixmap|toggleIcon|path)\(([^)]*)\)", code):
+            (files if method == 'path' else packed).update(re.findall(r"'([\w-]+)'", args))
+    return packed, files
+
+
+def packAssets(addonDir):
+    """
+        Writes the icons used by the add-on into a single assets.pack and removes the loose files,
+        except the ones Anki needs as files (editor buttons). Unused assets are not shipped
+    """
+
+    spec = importlib.util.spec_from_file_location('asset_pack', os.path.join(currentDir, 'src', 'asset_pack.py'))
+    assetPack = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(assetPack)
+
+    packed, files = referencedIcons(os.path.join(currentDir, 'src'))
+    assetsDir = os.path.join(addonDir, 'assets')
+    size = assetPack.writePack({name: os.path.join(assetsDir, name + '.png') for name in packed},
+                               os.path.join(addonDir, 'assets.pack'))
+    removed = 0
+    for fileName in os.listdir(assetsDir):
+        if os.path.splitext(fileName)[0] not in files:
+            removed += os.path.getsize(os.path.join(assetsDir, fileName))
+            os.remove(os.path.join(assetsDir, fileName))
+    print('Packed {} icons ({} KB), {} kept as files, {} KB of loose assets removed'.format(
+        len(packed), size // 1024, len(files), removed // 1024))
+
+
 if mode == Const.ZIP:
     if os.path.exists('dist'):
         print('Cleaning dist directory')
@@ -55,6 +95,9 @@ if mode == Const.ZIP:
     shutil.copytree(currentDir,  './dist',
         ignore=shutil.ignore_patterns('tests', 'doc', '*_test*', '__pycache__'))
     
+    print('Packing assets')
+    packAssets('dist/src')
+
     print('Creating binary')
     shutil.make_archive('dist/anki-web-browser', format='zip', root_dir='dist/src')
 
@@ -68,6 +111,7 @@ elif mode == Const.ANKI:
     addonRoot = currentDir
     shutil.copytree(addonRoot + '/src',  target + '/anki-web-browser',
         ignore=shutil.ignore_patterns('tests', 'doc', '*_test*', '__pycache__'))
+    packAssets(target + '/anki-web-browser')
 
 # Deletes from anki addons
 elif mode == Const.CLEAR:
@@ -5,6 +5,9 @@
 __version__ = "4.1"
 
 import sys
+import time
+
+_importStartedAt = time.perf_counter()
 
 def logToConsole(*args, **kargs):
     try:
@@ -18,7 +21,7 @@ try:
     # Feedback.log = logToConsole
 
     from .review_controller import run
-    run()
+    run(_importStartedAt)
 except ImportError as ie:
     print(""" [WARNING] Anki-web-browser ::: It wasn\'t possible to resolve imports. 
         Probably anki was not found, duo to: Running In test mode !!! """)
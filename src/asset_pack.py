@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Single file holding several assets (icons), written by build.py
+# Layout: header size (4 bytes, big endian), JSON header {name: [offset, size]}, data
+# Only the standard library is used, so build.py can load it directly
+# --------------------------------------------------
+
+import json
+import struct
+
+_HEADER_SIZE = struct.Struct('>I')
+
+
+def writePack(files: dict, packFile: str) -> int:
+    """ Writes {name: file path} into packFile. Returns the number of data bytes """
+
+    index = {}
+    blobs = []
+    offset = 0
+    for name in sorted(files):
+        with open(files[name], 'rb') as f:
+            data = f.read()
+        index[name] = [offset, len(data)]
+        blobs.append(data)
+        offset += len(data)
+
+    header = json.dumps(index, sort_keys=True).encode('utf-8')
+    with open(packFile, 'wb') as f:
+        f.write(_HEADER_SIZE.pack(len(header)))
+        f.write(header)
+        for data in blobs:
+            f.write(data)
+    return offset
+
+
+def readPack(packFile: str) -> dict:
+    """ Reads the whole pack with a single read. Returns {name: bytes} """
+
+    with open(packFile, 'rb') as f:
+        content = f.read()
+
+    headerSize = _HEADER_SIZE.unpack_from(content)[0]
+    start = _HEADER_SIZE.size + headerSize
+    index = json.loads(content[_HEADER_SIZE.size:start].decode('utf-8'))
+    return {name: content[start + offset:start + offset + size] for name, (offset, size) in index.items()}
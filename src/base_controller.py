@@ -4,27 +4,88 @@
 # ---------------------------------- Base Controller -----------------------------------
 # ---------------------------------- ================ ---------------------------------
 
-from .config import service as cfg
-from .core import Feedback
+# The browser (QtWebEngine) and the dialogs are imported on first use, not while Anki starts
+
+from .config import service as cfg, ConfigHolder
+from .core import Feedback, formatTargetURL
 from .exception_handler import exceptionHandler
-from .browser import AwBrowser
-from .no_selection import NoSelectionController, NoSelectionResult
+from .lazy import LazyObject
+from .preload import ProviderPredictor
 from .provider_selection import ProviderSelectionController
+from .query_pipeline import QueryPipeline
+from .tracing import tracer
 
 class BaseController:
     "Concentrates common operations between both concrete controllers"
 
     browser = None
+    startupReport = None
+    _sharedBrowser = None
     _lastProvider = None
+    _predictedProvider = None
     _currentNote = None
     _ankiMw = None    
+    _queryPipeline = None   # (config version, QueryPipeline)
+    _contextKey = None      # the note last shown on the reviewer or editor
 
     def __init__(self, ankiMw):
         super().__init__()
         self._ankiMw = ankiMw
-        self.browser = AwBrowser.singleton(ankiMw, cfg.getInitialWindowSize())
-        self._noSelectionHandler = NoSelectionController(ankiMw)
+        self.browser = BaseController.sharedBrowser(ankiMw)
+        self._noSelectionHandler = LazyObject(lambda: BaseController._buildNoSelection(ankiMw),
+                                              'NoSelectionController', BaseController._onLazyBuild)
         self._providerSelection = ProviderSelectionController()
+        self._predictor = ProviderPredictor()
+
+    # ------------------------------ Lazy building ------------------------------
+
+    @classmethod
+    def sharedBrowser(cls, ankiMw) -> LazyObject:
+        """ The browser window is only built when used (or on idle time), as it's costly for Anki's startup """
+
+        if BaseController._sharedBrowser is None:
+            BaseController._sharedBrowser = LazyObject(lambda: cls._buildBrowser(ankiMw), 'AwBrowser',
+                                                       cls._onLazyBuild)
+        return BaseController._sharedBrowser
+
+    @staticmethod
+    def _buildBrowser(ankiMw):
+        """ A browser built on idle time starts on the note shown meanwhile """
+
+        from .browser import AwBrowser
+        browser = AwBrowser.singleton(ankiMw, cfg.getInitialWindowSize())
+        browser.switchContext(BaseController._contextKey)
+        return browser
+
+    @staticmethod
+    def _buildNoSelection(ankiMw):
+        from .no_selection import NoSelectionController
+        return NoSelectionController(ankiMw)
+
+    @staticmethod
+    def _onLazyBuild(name, milliseconds):
+        if BaseController.startupReport:
+            BaseController.startupReport.addDeferred(name, milliseconds)
+
+    @staticmethod
+    def _noteKey(note):
+        """
+            Identifies the note for the browser tabs. Notes being added have no id yet, and nothing stable
+            to identify them (id() is reused once they are gone): their tabs are not kept when the note changes
+        """
+
+        return (note.id or None) if note else None
+
+    def _setCurrentNote(self, note):
+        self._currentNote = note
+        BaseController._contextKey = self._noteKey(note)
+
+    def _ensureBrowser(self):
+        """ Builds the browser if needed. A new browser starts on the context of the current note """
+
+        if not self.browser:
+            self.browser.instance().switchContext(self._noteKey(self._currentNote))
+        return self.browser
 
     @exceptionHandler
     def _repeatProviderOrShowMenu(self, webView):
@@ -34,14 +95,62 @@ class BaseController:
         self.openInBrowser(query)
 
     def _filterQueryValue(self, query: str):
-        "Remove words defined on filteredWords from config"
+        "Cleans a selected text or field value through the query pipeline from config (HTML, cloze, filteredWords...)"
 
-        filteredWords = cfg.getConfig().filteredWords
-        if not filteredWords:
-            return query
-        querywords = query.split()
-        resultwords  = [word for word in querywords if word.lower() not in filteredWords]
-        return ' '.join(resultwords)
+        return BaseController.queryPipeline()(query)
+
+    @classmethod
+    def queryPipeline(cls) -> QueryPipeline:
+        """ Shared by the controllers; compiled again only when the config changes """
+
+        if cls._queryPipeline is None or cls._queryPipeline[0] != cfg.version:
+            cls._queryPipeline = (cfg.version, QueryPipeline.fromConfig(cfg.getConfig()))
+            Feedback.log('Query pipeline: {}'.format(cls._queryPipeline[1].names))
+        return cls._queryPipeline[1]
+
+    # ------------------------------ Preloading ------------------------------
+
+    @staticmethod
+    def _noteType(note):
+        return getattr(note, 'mid', None) if note else None
+
+    def _preloadPrediction(self, webView, note):
+        """
+            Called when the providers menu is about to be shown.
+            If the query is already known (text selected), loads the predicted provider in background
+        """
+
+        self._predictedProvider = None
+        config = cfg.getConfig()
+        if config.useSystemBrowser or not config.preloadPredictedProvider:
+            return
+        if not (webView and webView.hasSelection()):
+            return
+
+        query = self._filterQueryValue(webView.selectedText())
+        website = self._predictor.predict(self._noteType(note), self._lastProvider)
+        if not (query and isinstance(website, str)):     # groups are not preloaded
+            return
+
+        self._predictedProvider = website
+        self._ensureBrowser().preload(website, query)
+
+    def _onProviderMenuClosed(self):
+        """ A preload not used by the selected provider (or no selection at all) is dropped """
+
+        self._predictedProvider = None
+        if self.browser:
+            self.browser.dropPreload()
+
+    def _registerProviderChoice(self, website, note):
+        tracer.begin(self._providerName(website))
+        self._predictor.record(self._noteType(note), website, self._predictedProvider)
+
+    @staticmethod
+    def _providerName(website) -> str:
+        if isinstance(website, ConfigHolder.ProviderGroup):
+            return website.name
+        return next((p.name for p in cfg.getConfig().providers if p.url == website), website)
 
     def _getQueryValue(self, input):
         raise Exception('Must be overriden')
@@ -60,14 +169,23 @@ class BaseController:
 
         Feedback.log('OpenInBrowser: {}'.format(self._currentNote))
         website = self._lastProvider
+        isGroup = isinstance(website, ConfigHolder.ProviderGroup)
+        if not tracer.isOpen(tracer.current):     # the last provider repeated, without the menu
+            tracer.begin(self._providerName(website))
+        tracer.mark(tracer.current, 'openInBrowser')
 
         if cfg.getConfig().useSystemBrowser:
-            target = self.browser.formatTargetURL(website, query)
-            BaseController.openExternalLink(target)
+            for site in (cfg.getGroupWebsites(website) if isGroup else [website]):
+                BaseController.openExternalLink(formatTargetURL(site, query))
+            tracer.end(tracer.current)
             return
         
+        self._ensureBrowser()
         self.beforeOpenBrowser()
-        self.browser.open(website, query, True)
+        if isGroup:
+            self.browser.openGroup(cfg.getGroupWebsites(website), query)
+        else:
+            self.browser.open(website, query, True)
 
     def beforeOpenBrowser(self):
         raise Exception('Must be overriden')
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Interface between Anki's card browser and the batch lookup
+
+# This files is part of anki-web-browser addon
+# ------------------------------------------------
+
+from anki.hooks import addHook
+from aqt.qt import QAction
+from PyQt5.QtWidgets import QInputDialog
+
+from .base_controller import BaseController
+from .config import service as cfg
+from .core import Feedback, formatTargetURL
+from .note_fields import allFieldNames, fieldIndex, fieldValues
+
+
+class BatchLookupController:
+    """
+        Looks up many notes at once: the query of each note comes from one of its fields,
+        and the provider pages are loaded in background while the user goes through them
+    """
+
+    _window = None
+
+    def __init__(self, ankiMw):
+        self._ankiMw = ankiMw
+
+    def setupBindings(self):
+        addHook('browser.setupMenus', self.setupBrowserMenu)
+
+    def setupBrowserMenu(self, browser):
+        action = QAction('Web lookup for selected notes...', browser)
+        action.triggered.connect(lambda: self.onBatchLookup(browser))
+        browser.form.menuEdit.addSeparator()
+        browser.form.menuEdit.addAction(action)
+
+    def onBatchLookup(self, browser):
+        noteIds = browser.selectedNotes()
+        if not noteIds:
+            Feedback.showInfo('No notes selected')
+            return
+
+        collection = self._ankiMw.col
+        notes = [collection.getNote(noteId) for noteId in noteIds]
+        fieldNames = allFieldNames(notes)     # the selection may have several note types
+        fieldName, ok = QInputDialog.getItem(browser, 'Batch lookup', 'Search for the content of the field:',
+                                             fieldNames, 0, False)
+        if not ok:
+            return
+
+        providers = cfg.getConfig().providers
+        providerName, ok = QInputDialog.getItem(browser, 'Batch lookup', 'Provider:',
+                                                [p.name for p in providers], 0, False)
+        if not ok:
+            return
+        website = next(p.url for p in providers if p.name == providerName)
+
+        from .batch_lookup import BatchItem, BatchLookupWindow
+
+        items = []
+        for note, value in fieldValues(notes, fieldName):    # notes without the field are skipped
+            query = BaseController.queryPipeline()(value)
+            if query:
+                items.append(BatchItem(note.id, query, formatTargetURL(website, query)))
+
+        if not items:
+            Feedback.showInfo('The selected notes have no value on {}'.format(fieldName))
+            return
+
+        Feedback.log('Batch lookup: {} notes on {}'.format(len(items), providerName))
+        if self._window:
+            self._window.close()
+            self._window.deleteLater()
+        config = cfg.getConfig()
+        self._window = BatchLookupWindow(browser, items, fieldNames, self.assignToNote,
+                                         config.batchMaxConcurrent, config.batchHostIntervalMs / 1000)
+        self._window.start()
+
+    def assignToNote(self, noteId, fieldName: str, value: str, replace: bool):
+        """ The field is found by name on the note's own type """
+
+        note = self._ankiMw.col.getNote(noteId)
+        index = fieldIndex(note, fieldName)
+        if index is None or index >= len(note.fields):
+            Feedback.showWarn('The note has no field {}'.format(fieldName))
+            return
+
+        newValue = value if replace else note.fields[index] + ' ' + value
+        note.fields[index] = newValue.strip()
+        note.flush()
+        Feedback.showInfo('Saved on the note')
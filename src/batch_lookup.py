@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Batch lookup: loads the provider page for many notes in hidden tabs
+# and lets the user step through the results, assigning selections to a field
+# --------------------------------------------------
+
+import urllib.parse
+
+from PyQt5.QtCore import QUrl, QTimer, Qt
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, \
+    QProgressBar, QStackedWidget, QComboBox, QShortcut
+
+from .browser_engine import AwWebEngine
+from .core import Feedback, Style
+from .load_scheduler import LoadScheduler
+
+
+class BatchItem:
+    """ One note of the batch: the query built from it and the page loaded for it """
+
+    PENDING = 'pending'
+    LOADING = 'loading'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, noteId, query: str, url: str):
+        self.noteId = noteId
+        self.query = query
+        self.url = url
+        self.host = urllib.parse.urlsplit(url).hostname or ''
+        self.view = None
+        self.status = BatchItem.PENDING
+
+
+# noinspection PyPep8Naming
+class BatchLookupWindow(QMainWindow):
+    """
+        Feeds the items to a LoadScheduler, a few at a time, and keeps the loaded pages in a queue.
+        Only LOOKAHEAD pages are loaded ahead of the one being seen, and KEEP_BEHIND are kept after it,
+        so long batches don't hold one web engine per note
+    """
+
+    TITLE = 'Anki :: Web Browser Addon :: Batch lookup'
+    LOOKAHEAD = 8
+    KEEP_BEHIND = 3
+    LOAD_TIMEOUT_MS = 30000
+
+    def __init__(self, parent, items: list, fieldNames: list, assign, maxConcurrent: int = 3,
+                 hostInterval: float = 1.0):
+        super().__init__(parent)
+        self._items = items
+        self._assign = assign
+        self._ready = []
+        self._pos = -1
+        self._fed = 0
+        self._waiting = True
+        self._scheduler = LoadScheduler(self._startItem, maxConcurrent, hostInterval)
+        self.setupUI(fieldNames)
+
+    def setupUI(self, fieldNames: list):
+        self.setWindowTitle(self.TITLE)
+        self.setWindowFlags(Qt.Window)
+        self.setStyleSheet(Style.LIGHT_BG)
+        self.resize(900, 600)
+
+        central = QWidget(self)
+        layout = QVBoxLayout(central)
+
+        top = QHBoxLayout()
+        self._progress = QProgressBar(central)
+        self._progress.setRange(0, max(1, len(self._items)))
+        self._progress.setValue(0)
+        top.addWidget(self._progress)
+        self._lbStats = QLabel(central)
+        top.addWidget(self._lbStats)
+        self._btCancel = QPushButton('Cancel', central)
+        self._btCancel.clicked.connect(self.cancel)
+        top.addWidget(self._btCancel)
+        layout.addLayout(top)
+
+        self._stack = QStackedWidget(central)
+        self._lbWaiting = QLabel('Waiting for the next page...', self._stack)
+        self._lbWaiting.setAlignment(Qt.AlignCenter)
+        self._stack.addWidget(self._lbWaiting)
+        layout.addWidget(self._stack, 1)
+
+        bottom = QHBoxLayout()
+        self._btPrevious = QPushButton('<', central)
+        self._btPrevious.setToolTip('Previous note (Alt+Left)')
+        self._btPrevious.clicked.connect(self.showPrevious)
+        bottom.addWidget(self._btPrevious)
+        self._lbCurrent = QLabel(central)
+        bottom.addWidget(self._lbCurrent, 1)
+        self._btNext = QPushButton('>', central)
+        self._btNext.setToolTip('Next note (Alt+Right)')
+        self._btNext.clicked.connect(self.showNext)
+        bottom.addWidget(self._btNext)
+
+        bottom.addWidget(QLabel('Field:', central))
+        self._cbField = QComboBox(central)
+        for name in fieldNames:     # by name: the notes may be of different types
+            self._cbField.addItem(name, name)
+        bottom.addWidget(self._cbField)
+        self._btAppend = QPushButton('Append selection', central)
+        self._btAppend.setToolTip('Adds the selected text to the field and goes to the next note (Ctrl+Return)')
+        self._btAppend.clicked.connect(lambda: self.assignSelection(False))
+        bottom.addWidget(self._btAppend)
+        self._btReplace = QPushButton('Replace', central)
+        self._btReplace.setToolTip('Replaces the field with the selected text and goes to the next note')
+        self._btReplace.clicked.connect(lambda: self.assignSelection(True))
+        bottom.addWidget(self._btReplace)
+        layout.addLayout(bottom)
+
+        QShortcut(QKeySequence('Alt+Left'), self).activated.connect(self.showPrevious)
+        QShortcut(QKeySequence('Alt+Right'), self).activated.connect(self.showNext)
+        QShortcut(QKeySequence('Ctrl+Return'), self).activated.connect(lambda: self.assignSelection(False))
+
+        self.setCentralWidget(central)
+        self._updateStatus()
+
+    def start(self):
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self._feed()
+
+    # ------------------------------------ Loading ------------------------------------
+
+    def _feed(self):
+        """ Submits items while fewer than LOOKAHEAD are loading or waiting to be seen """
+
+        while self._fed < len(self._items) and self._fed - (self._pos + 1) < self.LOOKAHEAD:
+            item = self._items[self._fed]
+            self._fed += 1
+            self._scheduler.submit(item, item.host)
+
+    def _startItem(self, item: BatchItem):
+        item.status = BatchItem.LOADING
+        item.view = self._buildView(item)
+        QTimer.singleShot(self.LOAD_TIMEOUT_MS, lambda: self._onTimeout(item))
+
+    def _buildView(self, item: BatchItem):
+        view = AwWebEngine(self._stack)
+        view.loadFinished.connect(lambda ok: self._onItemLoaded(item, ok))
+        self._stack.addWidget(view)
+        view.setUrl(QUrl(item.url))
+        return view
+
+    def _onTimeout(self, item: BatchItem):
+        if item.status != BatchItem.LOADING:
+            return
+        Feedback.log('Batch lookup timeout: {}'.format(item.url))
+        item.view.stop()
+        self._onItemLoaded(item, False)
+
+    def _onItemLoaded(self, item: BatchItem, ok: bool):
+        if item.status != BatchItem.LOADING:     # later navigation on the page
+            return
+
+        item.status = BatchItem.DONE if ok else BatchItem.FAILED
+        self._ready.append(item)
+        self._scheduler.finish(item, ok)
+        if self._waiting:
+            self._show(len(self._ready) - 1)
+        self._feed()
+        self._updateStatus()
+
+    def cancel(self):
+        for item in self._scheduler.cancel():
+            item.status = BatchItem.CANCELLED
+            if item.view:
+                item.view.stop()
+        for item in self._items[self._fed:]:
+            item.status = BatchItem.CANCELLED
+        self._fed = len(self._items)
+        self._updateStatus()
+
+    # ------------------------------------ Queue ------------------------------------
+
+    def showNext(self):
+        if self._pos + 1 < len(self._ready):
+            self._show(self._pos + 1)
+        elif self._hasMore():
+            self._waiting = True
+            self._pos = len(self._ready)
+            self._stack.setCurrentWidget(self._lbWaiting)
+            self._feed()
+            self._updateStatus()
+
+    def _hasMore(self) -> bool:
+        return self._fed < len(self._items) or not self._scheduler.isIdle()
+
+    def showPrevious(self):
+        if self._pos > 0:
+            self._show(min(self._pos, len(self._ready)) - 1)
+
+    def _show(self, index: int):
+        self._waiting = False
+        self._pos = index
+        item = self._ready[index]
+        if item.view is None:   # released; loaded again, out of the scheduler as the user asked for it
+            item.view = self._buildView(item)
+        self._stack.setCurrentWidget(item.view)
+        self._releaseSeen()
+        self._updateStatus()
+
+    def _releaseSeen(self):
+        for item in self._ready[:max(0, self._pos - self.KEEP_BEHIND)]:
+            if item.view is not None:
+                self._stack.removeWidget(item.view)
+                item.view.deleteLater()
+                item.view = None
+
+    def currentItem(self):
+        if self._waiting or not (0 <= self._pos < len(self._ready)):
+            return None
+        return self._ready[self._pos]
+
+    def assignSelection(self, replace: bool):
+        item = self.currentItem()
+        if not item:
+            return
+        value = item.view.selectedText().strip()
+        if not value:
+            Feedback.showInfo('Select some text on the page first')
+            return
+        self._assign(item.noteId, self._cbField.currentData(), value, replace)
+        self.showNext()
+
+    def _updateStatus(self):
+        stats = self._scheduler.stats()
+        finished = stats['done'] + stats['failed']
+        self._progress.setValue(finished)
+        self._lbStats.setText('{} of {} loaded | {} failed | {:.1f} pages/min'.format(
+            finished, len(self._items), stats['failed'], stats['perMinute']))
+
+        item = self.currentItem()
+        if item:
+            failed = ' (failed to load)' if item.status == BatchItem.FAILED else ''
+            self._lbCurrent.setText('{} / {}: {}{}'.format(self._pos + 1, len(self._items), item.query, failed))
+        elif self._scheduler.cancelled:
+            self._lbCurrent.setText('Cancelled')
+        else:
+            self._lbCurrent.setText('Waiting...')
+
+        self._btPrevious.setEnabled(self._pos > 0)
+        self._btNext.setEnabled(self._pos + 1 < len(self._ready) or self._hasMore())
+        self._btCancel.setEnabled(self._hasMore())
+
+    def closeEvent(self, evt):
+        self.cancel()
+        for item in self._items:
+            if item.view is not None:
+                item.view.deleteLater()
+                item.view = None
+        super().closeEvent(evt)
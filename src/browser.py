@@ -6,24 +6,31 @@
 # --------------------------------------------------------
 
 import os
-import urllib.parse
 from threading import Timer
 
 from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtCore import QUrl, Qt, QSize, QObject
-from PyQt5.QtGui import QPixmap, QIcon, QKeySequence
+from PyQt5.QtGui import QKeySequence
 
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineContextMenuData, QWebEngineSettings, QWebEnginePage
 from PyQt5.QtWidgets import *
 
-from .config import service as cfg
-from .core import Label, Feedback, Style, CWD
+from .config import service as cfg, ConfigHolder
+from .core import Label, Feedback, Style, formatTargetURL
 from .exception_handler import exceptionHandler
 from .key_events import select_all
 from .provider_selection import ProviderSelectionController
 
 from .browser_context_menu import AwBrowserMenu, StandardMenuOption
 from .browser_engine import AwWebEngine
+from .engine_pool import AwWebEnginePool
+from .icons import icons
+from .fan_out import FanOut
+from .lazy_tab import LazyTab
+from .page_cache import PageSnapshotStore
+from .tab_cache import TabSet, TabSetCache
+from .tab_lifecycle import TabLifecycleManager
+from .tracing import tracer
 
 BLANK_PAGE = """
     <html>
@@ -102,11 +109,17 @@ class AwBrowser(QMainWindow):
 
     SINGLETON = None
     TITLE = 'Anki :: Web Browser Addon'
+    LIFECYCLE_INTERVAL_MS = 10000
+    THUMBNAIL_WIDTH = 480
 
     _parent = None
     _web = None
     _context = None
     _currentWeb = None
+    _preloaded = None
+    _contextKey = None
+    _fanOut = None
+    _providerSelection = None
     
     _toggle_actions = []
 
@@ -119,13 +132,36 @@ class AwBrowser(QMainWindow):
         self._setupShortcuts()
 
         self._menuDelegator = AwBrowserMenu([
-            StandardMenuOption('Open in new tab', lambda add: self.openUrl(add, True))
+            StandardMenuOption('Open in new tab', lambda add: self.openUrl(add, True, background=True))
         ])
 
+        self._enginePool = AwWebEnginePool(self._buildEngine, cfg.getConfig().enginePoolSize)
+        self._enginePool.scheduleRefill()
+        self._tabCache = TabSetCache(cfg.getConfig().tabCacheMaxTabs, self._disposeTabSet)
+        self._snapshots = PageSnapshotStore(os.path.join(cfg.getCachePath(), 'pages'), cfg.getCacheLimits()[1])
+
+        config = cfg.getConfig()
+        self._lifecycle = TabLifecycleManager(config.tabFreezeAfterSeconds, config.tabDiscardMaxTabs)
+        self._lifecycleTimer = QtCore.QTimer(self)
+        self._lifecycleTimer.setInterval(self.LIFECYCLE_INTERVAL_MS)
+        self._lifecycleTimer.timeout.connect(self._applyLifecycle)
+        self._lifecycleTimer.start()
+        cfg.subscribe(self._onConfigChanged)
+
         self.setFocus()
 
         # self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
 
+    def _onConfigChanged(self, config):
+        """ Applies the limits from a changed configuration. The other options are read when used """
+
+        self._enginePool.resize(config.enginePoolSize)
+        self._enginePool.scheduleRefill()
+        self._tabCache.maxTabs = config.tabCacheMaxTabs
+        self._snapshots.maxBytes = cfg.getCacheLimits()[1]
+        self._lifecycle.freezeAfter = config.tabFreezeAfterSeconds
+        self._lifecycle.maxLiveTabs = config.tabDiscardMaxTabs
+
     @classmethod
     def singleton(cls, parent, sizeConfig: tuple):
         if not cls.SINGLETON:
@@ -151,19 +187,19 @@ class AwBrowser(QMainWindow):
         navtbar.setIconSize(QSize(24, 24))
         mainLayout.addWidget(navtbar)
 
-        self.backBtn = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'arrow-back.png')), "back", self)
+        self.backBtn = QAction(icons.icon('arrow-back'), "back", self)
         self.backBtn.setStatusTip("back to previous page")
         navtbar.addAction(self.backBtn)
         self.backBtn.triggered.connect(self._onBack)
 
-        self.forwardBtn = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'arrow-forward.png')), "forward", self)
+        self.forwardBtn = QAction(icons.icon('arrow-forward'), "forward", self)
         self.forwardBtn.setStatusTip("forward to next page")
         navtbar.addAction(self.forwardBtn)
         self.forwardBtn.triggered.connect(self._onForward)
 
         navtbar.addSeparator()
 
-        self.select_all_action = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'select-all.png')), "select all F2", self)
+        self.select_all_action = QAction(icons.icon('select-all'), "select all F2", self)
         self.select_all_action.setStatusTip("select all F2")
         self.select_all_action.setShortcut(QKeySequence(Qt.Key_F2))
         navtbar.addAction(self.select_all_action)
@@ -171,10 +207,7 @@ class AwBrowser(QMainWindow):
 
         navtbar.addSeparator()
 
-        replace_icon = QtGui.QIcon()
-        replace_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-replace-off.png'))), QIcon.Normal,
-                              QIcon.Off);
-        replace_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-replace.png'))), QIcon.Normal, QIcon.On);
+        replace_icon = icons.toggleIcon('toggle-replace-off', 'toggle-replace')
         self.replace_action = QAction(replace_icon, "replace F3", self)
         self.replace_action.setStatusTip("replace F3")
         self.replace_action.setCheckable(True)
@@ -184,11 +217,7 @@ class AwBrowser(QMainWindow):
 
         navtbar.addSeparator()
 
-        copy_paste_icon = QtGui.QIcon()
-        copy_paste_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-copy-paste-off.png'))), QIcon.Normal,
-                              QIcon.Off);
-        copy_paste_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-copy-paste.png'))), QIcon.Normal,
-                                QIcon.On);
+        copy_paste_icon = icons.toggleIcon('toggle-copy-paste-off', 'toggle-copy-paste')
         self.copy_paste_action = QAction(copy_paste_icon, "copy -> paste F4", self)
         self.copy_paste_action.setStatusTip("copy -> paste F4")
         self.copy_paste_action.setCheckable(True)
@@ -199,11 +228,7 @@ class AwBrowser(QMainWindow):
 
         navtbar.addSeparator()
 
-        format_syntax_icon = QtGui.QIcon()
-        format_syntax_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-format-syntax-off.png'))),
-                                    QIcon.Normal, QIcon.Off);
-        format_syntax_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-format-syntax.png'))), QIcon.Normal,
-                                    QIcon.On);
+        format_syntax_icon = icons.toggleIcon('toggle-format-syntax-off', 'toggle-format-syntax')
         self.format_syntax_action = QAction(format_syntax_icon, "format syntax F5", self)
         self.format_syntax_action.setStatusTip("format syntax F5")
         self.format_syntax_action.setCheckable(True)
@@ -212,9 +237,7 @@ class AwBrowser(QMainWindow):
         self.format_syntax_action.toggled.connect(self._on_format_syntax_toggled)
         self._toggle_actions.append(self.format_syntax_action)
 
-        css_icon = QtGui.QIcon()
-        css_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-css-off.png'))), QIcon.Normal, QIcon.Off);
-        css_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-css.png'))), QIcon.Normal, QIcon.On);
+        css_icon = icons.toggleIcon('toggle-css-off', 'toggle-css')
         self.css_action = QAction(css_icon, "css F6", self)
         self.css_action.setStatusTip("css F6")
         self.css_action.setCheckable(True)
@@ -223,9 +246,7 @@ class AwBrowser(QMainWindow):
         self.css_action.toggled.connect(self._on_css_toggled)
         self._toggle_actions.append(self.css_action)
 
-        script_icon = QtGui.QIcon()
-        script_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-script-off.png'))), QIcon.Normal, QIcon.Off);
-        script_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-script.png'))), QIcon.Normal, QIcon.On);
+        script_icon = icons.toggleIcon('toggle-script-off', 'toggle-script')
         self.script_action = QAction(script_icon, "script F7", self)
         self.script_action.setStatusTip("script F7")
         self.script_action.setCheckable(True)
@@ -234,9 +255,7 @@ class AwBrowser(QMainWindow):
         self.script_action.toggled.connect(self._on_script_toggled)
         self._toggle_actions.append(self.script_action)
 
-        browser_compatibility_icon = QtGui.QIcon()
-        browser_compatibility_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-browser-compatibility-off.png'))), QIcon.Normal, QIcon.Off);
-        browser_compatibility_icon.addPixmap(QPixmap((os.path.join(CWD, 'assets', 'toggle-browser-compatibility.png'))), QIcon.Normal, QIcon.On);
+        browser_compatibility_icon = icons.toggleIcon('toggle-browser-compatibility-off', 'toggle-browser-compatibility')
         self.browser_compatibility_action = QAction(browser_compatibility_icon, "browser compatibility F8", self)
         self.browser_compatibility_action.setStatusTip("browser compatibility F8")
         self.browser_compatibility_action.setCheckable(True)
@@ -253,27 +272,27 @@ class AwBrowser(QMainWindow):
         self._itAddress.returnPressed.connect(self._goToAddress)
         navtbar.addWidget(self._itAddress)
 
-        self.refresh_action = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'reload.png')), "Reload", self)
+        self.refresh_action = QAction(icons.icon('reload'), "Reload", self)
         self.refresh_action.setStatusTip("Reload")
         navtbar.addAction(self.refresh_action)
         self.refresh_action.triggered.connect(self._onReload)
 
-        self.stop_action = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'stop.png')), "Stop", self)
+        self.stop_action = QAction(icons.icon('stop'), "Stop", self)
         self.stop_action.setStatusTip("Stop loading")
         self.stop_action.triggered.connect(self._onStopPressed)
         navtbar.addAction(self.stop_action)
 
-        self.newTabBtn = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'plus-signal.png')), "New Tab (Ctrl+t)", self)
+        self.newTabBtn = QAction(icons.icon('plus-signal'), "New Tab (Ctrl+t)", self)
         self.newTabBtn.setStatusTip("New tab (Ctrl+t)")
         navtbar.addAction(self.newTabBtn)
         self.newTabBtn.triggered.connect(lambda: self.newProviderMenu(True))
 
-        self.zoom_out_action = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'zoom-out.png')), "Zoom out Ctrl-", self)
+        self.zoom_out_action = QAction(icons.icon('zoom-out'), "Zoom out Ctrl-", self)
         self.zoom_out_action.setStatusTip("Zoom out Ctrl-")
         navtbar.addAction(self.zoom_out_action)
         self.zoom_out_action.triggered.connect(self._on_zoom_out_action)
 
-        self.zoom_in_action = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'zoom-in.png')), "Zoom in Ctrl+", self)
+        self.zoom_in_action = QAction(icons.icon('zoom-in'), "Zoom in Ctrl+", self)
         self.zoom_in_action.setStatusTip("Zoom in Ctrl+")
         navtbar.addAction(self.zoom_in_action)
         self.zoom_in_action.triggered.connect(self._on_zoom_in_action)
@@ -313,6 +332,15 @@ class AwBrowser(QMainWindow):
         lbSite.setStyleSheet('color: #d0d0d0;')
         bottomLayout.addWidget(self.ctxWidget)
 
+        self._blockedInfo = QtWidgets.QLabel(bottomWidget)
+        self._blockedInfo.setStyleSheet('color: #d0d0d0;')
+        bottomLayout.addWidget(self._blockedInfo)
+
+        self._lifecycleInfo = QtWidgets.QLabel(bottomWidget)
+        self._lifecycleInfo.setStyleSheet('color: #d0d0d0;')
+        self._lifecycleInfo.setToolTip('Background tabs paused (frozen) and unloaded (discarded) to save memory')
+        bottomLayout.addWidget(self._lifecycleInfo)
+
         self._loadingBar = QtWidgets.QProgressBar(bottomWidget)
         self._loadingBar.setFixedWidth(250)
         self._loadingBar.setTextVisible(False)
@@ -325,6 +353,8 @@ class AwBrowser(QMainWindow):
             self.setWindowFlags(Qt.WindowStaysOnTopHint)
         if cfg.getConfig().enableDarkReader:
             AwWebEngine.enableDarkReader()
+        if cfg.getConfig().enableContentBlocker:
+            AwWebEngine.enableContentBlocker()
 
     def _setupShortcuts(self):
         newTabShort = QShortcut(QtGui.QKeySequence("Ctrl+t"), self)
@@ -346,49 +376,153 @@ class AwBrowser(QMainWindow):
 
     # ======================================== Tabs =======================================
 
-    def add_new_tab(self, qurl=None, label="Blank"):
-
-        if qurl is None:
-            qurl = QUrl('')
+    def _buildEngine(self):
+        """ Creates a hidden web engine, already wired to the browser listeners """
 
         browser = AwWebEngine(self)
-        browser.setUrl(qurl)
+        browser.hide()
         browser.contextMenuEvent = self._menuDelegator.contextMenuEvent
         browser.page().loadStarted.connect(self.onStartLoading)
         browser.page().loadFinished.connect(self.onLoadFinish)
         browser.page().loadProgress.connect(self.onProgress)
         browser.page().urlChanged.connect(self.onPageChange)
+        return browser
 
-        i = self._tabs.addTab(browser, label)
-        self._tabs.setCurrentIndex(i)
-        self._currentWeb = self._tabs.currentWidget()
-        self._menuDelegator.setCurrentWeb(self._currentWeb)
+    def add_new_tab(self, qurl=None, label="Blank", browser=None, index=None, select=True):
+        """
+            Adds a tab loading qurl. A browser already loading (e.g. preloaded) may be given instead.
+            With select False, the tab is added in background
+        """
+
+        tracer.mark(tracer.current, 'add_new_tab')
+        if browser is None:
+            browser = self._enginePool.acquire()
+            browser.setUrl(qurl if qurl is not None else QUrl(''))
+
+        i = self._tabs.addTab(browser, label) if index is None else self._tabs.insertTab(index, browser, label)
+        if select:
+            self._tabs.setCurrentIndex(i)
+            self._currentWeb = self._tabs.currentWidget()
+            self._menuDelegator.setCurrentWeb(self._currentWeb)
 
         browser.urlChanged.connect(lambda qurl, browser=browser:
                                    self.update_urlbar(qurl, browser))
 
-        browser.loadFinished.connect(self.updateTabTitle(i, browser))
+        titleUpdater = self.updateTabTitle(browser)
+        browser.loadFinished.connect(titleUpdater)
+        if not browser.isLoading and not browser.url().isEmpty():
+            titleUpdater()
+
+    def addLazyTab(self, qurl: QUrl):
+        """ Adds a tab after the current one, without loading it nor changing the current tab """
+
+        label = qurl.host() or qurl.toString()
+        placeholder = LazyTab(qurl, label if len(label) < 18 else label[:15] + '...')
+        index = self._tabs.insertTab(self._tabs.currentIndex() + 1, placeholder, placeholder.title())
+        self._tabs.setTabToolTip(index, qurl.toString())
+
+    def _materialize(self, index: int, placeholder: LazyTab):
+        """ Replaces the placeholder on index by a web engine loading its URL """
+
+        Feedback.log('Loading background tab: {}'.format(placeholder.url().toString()))
+        view = self._enginePool.acquire()
+        view.lookupKey = placeholder.lookupKey
+        provider = placeholder.lookupKey[0] if placeholder.lookupKey else None
+        self._loadTarget(view, placeholder.url().toString(), bool(provider) and cfg.isCacheFirst(provider), provider)
+        self._tabs.blockSignals(True)
+        self._tabs.removeTab(index)
+        self.add_new_tab(label=placeholder.title(), browser=view, index=index)
+        self._tabs.setTabToolTip(index, '')
+        self._tabs.blockSignals(False)
+        placeholder.deleteLater()
 
     def current_tab_changed(self, i):
+        if isinstance(self._tabs.currentWidget(), LazyTab):
+            self._materialize(i, self._tabs.currentWidget())
+
         self._currentWeb = self._tabs.currentWidget()
         self._menuDelegator.setCurrentWeb(self._tabs.currentWidget())
 
         if self._tabs.currentWidget():
             qurl = self._tabs.currentWidget().url()
             self.update_urlbar(qurl, self._tabs.currentWidget())
+            self._setLifecycleState(self._currentWeb, 'Active')
+            self._lifecycle.touch(self._currentWeb)
 
         self._updateButtons()
+        self._updateBlockedInfo()
+
+    # ---------------------------------- Tab lifecycle ----------------------------------
+
+    def _applyLifecycle(self):
+        """ Freezes tabs inactive for long and discards the oldest ones when over the budget """
+
+        if not self._tabs.count():
+            return
+
+        tabs = [self._tabs.widget(i) for i in range(self._tabs.count())]
+        toFreeze, toDiscard = self._lifecycle.plan(tabs, self._currentWeb)
+        for view in toFreeze:
+            if self._setLifecycleState(view, 'Frozen'):
+                self._lifecycle.frozen(view)
+        for view in toDiscard:
+            self._discardTab(view)
+        if toFreeze or toDiscard:
+            Feedback.log('Tab lifecycle: {}'.format(self._lifecycle.stats()))
+        self._updateLifecycleInfo()
+
+    @staticmethod
+    def _setLifecycleState(view, name: str) -> bool:
+        """ Lifecycle states exist from Qt 5.14 on. Returns False if not supported """
+
+        state = getattr(getattr(QWebEnginePage, 'LifecycleState', None), name, None)
+        if state is None or view is None or isinstance(view, LazyTab):
+            return False
+        if view.page().lifecycleState() != state:
+            view.page().setLifecycleState(state)
+        return True
+
+    def _discardTab(self, view):
+        """ Releases the engine of a background tab, leaving a placeholder with a picture of its page """
+
+        index = self._tabs.indexOf(view)
+        if index < 0 or (self._fanOut and view in self._fanOut):
+            return      # tabs of a group being opened are kept until the group is loaded
+
+        label = self._tabs.tabText(index)
+        thumbnail = view.grab().scaledToWidth(self.THUMBNAIL_WIDTH, Qt.SmoothTransformation)   # its last frame
+        placeholder = LazyTab(view.url(), label, thumbnail=thumbnail,
+                              lookupKey=view.lookupKey)
+        self._tabs.blockSignals(True)
+        self._tabs.removeTab(index)
+        self._tabs.insertTab(index, placeholder, label)
+        self._tabs.setTabToolTip(index, view.url().toString())
+        self._tabs.blockSignals(False)
+        self._lifecycle.discarded(view)
+        view.stop()
+        view.deleteLater()
+
+    def _updateLifecycleInfo(self):
+        stats = self._lifecycle.stats()
+        if not (stats['frozen'] or stats['discardCount']):
+            self._lifecycleInfo.setText('')
+            return
+        self._lifecycleInfo.setText('Tabs frozen: %d, discarded: %d' % (stats['frozen'], stats['discardCount']))
 
     def close_current_tab(self, i):
         Feedback.log('Close current tab with index: %d' % i)
         if self._tabs.count() < 2:
             if self._currentWeb:
                 self._currentWeb.setUrl(QUrl('about:blank'))
+                self._currentWeb.lookupKey = None
             return
 
-        self._tabs.currentWidget().deleteLater()
-        self._tabs.setCurrentWidget(None)
+        widget = self._tabs.widget(i)
         self._tabs.removeTab(i)
+        if self._fanOut and widget in self._fanOut:
+            self._fanOut.remove(widget)
+            self._updateFanOutProgress()
+        widget.deleteLater()
 
     def update_urlbar(self, q, browser=None):
         if browser != self._tabs.currentWidget():
@@ -397,8 +531,11 @@ class AwBrowser(QMainWindow):
         self._itAddress.setText(q.toString())
         self._itAddress.setCursorPosition(0)
 
-    def updateTabTitle(self, index: int, browser: QWebEngineView):
-        def fn():
+    def updateTabTitle(self, browser: QWebEngineView):
+        def fn(*args):
+            index = self._tabs.indexOf(browser)
+            if index < 0:
+                return
             title = browser.page().title() if len(browser.page().title()) < 18 else (browser.page().title()[:15] + '...')
             self._tabs.setTabText(index, title)
             browser.setFocus()
@@ -415,8 +552,7 @@ class AwBrowser(QMainWindow):
 
     # =================================== General control ======================
 
-    def formatTargetURL(self, website: str, query: str = ''):
-        return website.format(urllib.parse.quote(query, encoding='utf8'))
+    formatTargetURL = staticmethod(formatTargetURL)
 
     @exceptionHandler
     def open(self, website, query: str, bringUp=True):
@@ -424,24 +560,281 @@ class AwBrowser(QMainWindow):
             Loads a given page with its replacing part with its query, and shows itself
         """
 
+        traceId = tracer.current
+        tracer.mark(traceId, 'open')
         self._context = query
         self._updateContextWidget()
         target = self.formatTargetURL(website, query)
 
-        self.openUrl(target)
+        if self._focusLookup(website, query):
+            tracer.end(traceId)
+        else:
+            preloaded = self._usePreloaded(target)
+            if not preloaded:
+                if self._tabs.count() == 0:
+                    self.add_new_tab(label='Loading...')
+                self._loadTarget(self._currentWeb, target, cfg.isCacheFirst(website), website)
+            self._currentWeb.lookupKey = (website, query)
+            self._currentWeb.traceId = traceId
+            if preloaded and not self._currentWeb.isLoading:
+                tracer.end(traceId)
+
+        if bringUp:
+            self.show()
+            self.raise_()
+            self.activateWindow()
+
+    @exceptionHandler
+    def openGroup(self, websites: list, query: str, bringUp=True):
+        """
+            Opens query on every website, each one on a new tab. At most fanOutMaxConcurrent pages load at once;
+            the others wait on their tabs. The first page loaded is shown
+        """
+
+        if not websites:
+            Feedback.showWarn('None of the providers on this group was found. Check the config "providerGroups"')
+            return
+
+        traceId = tracer.current
+        tracer.mark(traceId, 'open')
+        self._context = query
+        self._updateContextWidget()
+        self._cancelFanOut()
+
+        tabs = []
+        for website in websites:
+            view = self._enginePool.acquire()
+            view.lookupKey = (website, query)
+            view.traceId = traceId      # the first page loaded ends the lookup
+            view.fanOutTarget = (self.formatTargetURL(website, query), cfg.isCacheFirst(website))
+            view.loadProgress.connect(lambda value, view=view: self._onFanOutProgress(view, value))
+            view.loadFinished.connect(lambda ok, view=view: self._onFanOutFinished(view, ok))
+            self.add_new_tab(label='Waiting...', browser=view, select=False)
+            tabs.append(view)
+
+        Feedback.log('Opening {} providers for: {}'.format(len(tabs), query))
+        self._fanOut = FanOut(tabs, self._startFanOutTab, cfg.getConfig().fanOutMaxConcurrent)
+        self._loadingBar.setProperty("value", 1)
+        self._fanOut.begin()
+        if self._fanOut.isDone():
+            self._updateFanOutProgress()
 
         if bringUp:
             self.show()
             self.raise_()
             self.activateWindow()
 
-    def openUrl(self, address: str, newTab=False):
-        if self._tabs.count() == 0 or newTab:
+    def _startFanOutTab(self, view):
+        target, cacheFirst = view.fanOutTarget
+        index = self._tabs.indexOf(view)
+        if index >= 0:
+            self._tabs.setTabText(index, 'Loading...')
+        self._loadTarget(view, target, cacheFirst, view.lookupKey[0])
+
+    def _onFanOutProgress(self, view, value: int):
+        if not (self._fanOut and view in self._fanOut):
+            return
+        self._fanOut.progress(view, value)
+        self._updateFanOutProgress()
+
+    def _onFanOutFinished(self, view, ok: bool):
+        if not (self._fanOut and view in self._fanOut):
+            return
+        if self._fanOut.finished(view, ok) and self._tabs.indexOf(view) >= 0:
+            self._tabs.setCurrentWidget(view)
+        self._updateFanOutProgress()
+
+    def _updateFanOutProgress(self):
+        if self._fanOut.isDone():
+            Feedback.log('Providers group loaded: {}'.format(self._fanOut.stats()))
+            self._fanOut = None
+            self._loadingBar.reset()
+            return
+        self._loadingBar.setProperty("value", max(1, self._fanOut.combinedProgress()))
+
+    def _cancelFanOut(self):
+        """ A new group replaces the one being opened, whose waiting tabs start loading right away """
+
+        if not self._fanOut:
+            return
+        fanOut, self._fanOut = self._fanOut, None
+        fanOut.cancel()
+        for view in fanOut.tabs:
+            if view.url().isEmpty():
+                self._startFanOutTab(view)
+        self._loadingBar.reset()
+
+    def openUrl(self, address: str, newTab=False, background=False):
+        if newTab and background and self._tabs.count():
+            self.addLazyTab(QUrl(address))
+        elif self._tabs.count() == 0 or newTab:
             self.add_new_tab(QUrl(address), 'Loading...')
         elif self._currentWeb:
             self._currentWeb.setUrl(QUrl(address))
 
+    # ---------------------------------- Preloading ----------------------------------
+
+    def preload(self, website, query: str):
+        """ Starts loading a page in a hidden tab, expecting it to be opened soon """
+
+        target = self.formatTargetURL(website, query)
+        if self._preloaded and self._preloaded[0] == target:
+            return
+        self.dropPreload()
+
+        view = self._enginePool.acquire()
+        self._loadTarget(view, target, cfg.isCacheFirst(website), website)
+        self._preloaded = (target, view)
+        Feedback.log('Preloading: {}'.format(target))
+
+    def dropPreload(self):
+        if not self._preloaded:
+            return
+        view = self._preloaded[1]
+        self._preloaded = None
+        view.stop()
+        view.deleteLater()
+
+    def _usePreloaded(self, target: str) -> bool:
+        """ Shows the preloaded tab if it matches target. It replaces the current tab, as openUrl would do """
+
+        if not (self._preloaded and self._preloaded[0] == target):
+            return False
+
+        view = self._preloaded[1]
+        self._preloaded = None
+        Feedback.log('Preload used: {}'.format(target))
+
+        index = self._tabs.currentIndex()
+        if index < 0:
+            self.add_new_tab(label='Loading...', browser=view)
+        else:
+            old = self._tabs.widget(index)
+            self._tabs.removeTab(index)
+            old.deleteLater()
+            self.add_new_tab(label='Loading...', browser=view, index=index)
+        self._updateButtons()
+        return True
+
+    def _fromCurrentTab(self) -> bool:
+        """ Whether the signal being handled comes from the visible tab (hidden ones also load pages) """
+
+        sender = self.sender()
+        return sender is None or (self._currentWeb is not None and sender is self._currentWeb.page())
+
+    def _senderView(self):
+        """ The web engine whose page sent the signal being handled """
+
+        sender = self.sender()
+        return sender.view() if isinstance(sender, QWebEnginePage) else None
+
+    def _traceOf(self, view):
+        return view.traceId if view is not None else None
+
+    # ---------------------------------- Note context ----------------------------------
+
+    def switchContext(self, noteKey):
+        """
+            Called when the current note changes. Parks the tabs of the previous note in the cache,
+            and brings back the tabs of noteKey if they are still there
+        """
+
+        if noteKey == self._contextKey:
+            return
+
+        self.dropPreload()
+        if self._contextKey is not None and self._tabs.count():
+            self._tabCache.put(self._contextKey, self._detachTabs())
+        else:
+            self.clearContext()
+
+        self._contextKey = noteKey
+        tabSet = self._tabCache.take(noteKey) if noteKey is not None else None
+        if tabSet:
+            self._attachTabs(tabSet)
+        else:
+            self._context = None
+            self._updateContextWidget()
+
+    def _detachTabs(self) -> TabSet:
+        tabSet = TabSet([], self._tabs.currentIndex(), self._context)
+        while self._tabs.count():
+            tabSet.tabs.append((self._tabs.widget(0), self._tabs.tabText(0)))
+            self._tabs.removeTab(0)
+        self._currentWeb = None
+        self._menuDelegator.setCurrentWeb(None)
+        return tabSet
+
+    def _attachTabs(self, tabSet: TabSet):
+        self._tabs.blockSignals(True)     # only the selected tab is loaded, if it's a placeholder
+        for widget, label in tabSet.tabs:
+            self._tabs.addTab(widget, label)
+        self._tabs.setCurrentIndex(tabSet.currentIndex)
+        self._tabs.blockSignals(False)
+        self.current_tab_changed(self._tabs.currentIndex())
+        self._context = tabSet.context
+        self._updateContextWidget()
+        Feedback.log('Tabs restored: {}'.format(len(tabSet)))
+
+    def _disposeTabSet(self, tabSet: TabSet):
+        for widget, _ in tabSet.tabs:
+            widget.deleteLater()
+
+    def _focusLookup(self, website, query) -> bool:
+        """ If (website, query) is already open in some tab, just shows it """
+
+        for index in range(self._tabs.count()):
+            if getattr(self._tabs.widget(index), 'lookupKey', None) == (website, query):
+                self._tabs.setCurrentIndex(index)
+                return True
+        return False
+
+    # ---------------------------------- Cache first ----------------------------------
+
+    def _loadTarget(self, view, target: str, cacheFirst=False, provider: str = None):
+        """
+            Loads target on view. Cache first providers are served from their stored copy, if there is one.
+            Loads from the network count on the stats of provider
+        """
+
+        html = self._snapshots.get(target) if cacheFirst else None
+        if html:
+            Feedback.log('Serving stored copy: {}'.format(target))
+            view.measureLoad(None)
+            view.setHtml(html, QUrl(target))
+            return
+
+        view.measureLoad(provider)
+        view.setUrl(QUrl(target))
+        if cacheFirst:
+            self._storeWhenLoaded(view, target)
+
+    def _storeWhenLoaded(self, view, target: str):
+        """ Stores the page of target once loaded, unless the tab went to another page meanwhile (redirects are fine) """
+
+        def onFinished(ok):
+            view.loadFinished.disconnect(onFinished)
+            if not ok:
+                return
+            if not self._isPageOf(view, target):
+                Feedback.log('Not stored, the tab is on another page: {}'.format(view.url().toString()))
+                return
+            view.page().toHtml(lambda html: self._snapshots.put(target, html))
+        view.loadFinished.connect(onFinished)
+
+    @staticmethod
+    def _isPageOf(view, target: str) -> bool:
+        """ The page on view is target, or where target redirected to """
+
+        expected = QUrl(target)
+        urls = [view.url()]
+        item = view.history().currentItem()
+        if item.isValid():
+            urls.append(item.originalUrl())
+        return any(url.matches(expected, QUrl.StripTrailingSlash) for url in urls)
+
     def clearContext(self):
+        self.dropPreload()
         numTabs = self._tabs.count()
         if numTabs == 0:
             return
@@ -452,6 +845,7 @@ class AwBrowser(QMainWindow):
         self._updateContextWidget()
 
     def onClose(self):
+        self.dropPreload()
         if self._currentWeb:
             self._currentWeb.setUrl(QUrl('about:blank'))
             self._currentWeb = None
@@ -461,18 +855,36 @@ class AwBrowser(QMainWindow):
         super().close()
 
     def onStartLoading(self):
+        tracer.mark(self._traceOf(self._senderView()), 'loadStarted')
+        if not self._fromCurrentTab():
+            return
         self.refresh_action.setVisible(False)
         self.stop_action.setVisible(True)
-        self._loadingBar.setProperty("value", 1)
+        if not self._fanOut:    # a group being opened shows its combined progress
+            self._loadingBar.setProperty("value", 1)
 
     def onProgress(self, progress: int):
+        tracer.progress(self._traceOf(self._senderView()), progress)
+        if self._fanOut or not self._fromCurrentTab():
+            return
         self._loadingBar.setProperty("value", progress)
 
     def onLoadFinish(self, result):
-        self._loadingBar.setProperty("value", 100)
-        self.stop_action.setVisible(False)
-        self.refresh_action.setVisible(True)
-        self._loadingBar.reset()
+        view = self._senderView()
+        traceId = self._traceOf(view)
+        tracer.mark(traceId, 'loadFinished', ok=result)
+        if self._fromCurrentTab():
+            self.stop_action.setVisible(False)
+            self.refresh_action.setVisible(True)
+            if not self._fanOut:
+                self._loadingBar.setProperty("value", 100)
+                self._loadingBar.reset()
+            self._updateBlockedInfo()
+
+        if traceId is not None:
+            tracer.mark(traceId, 'postLoad')
+            tracer.end(traceId, result)
+            view.traceId = None
 
     def _updateButtons(self):
         isLoading: bool = self._currentWeb is not None and self._currentWeb.isLoading
@@ -482,6 +894,15 @@ class AwBrowser(QMainWindow):
         self.refresh_action.setVisible(not isLoading)
         self.forwardBtn.setEnabled(self._currentWeb is not None and self._currentWeb.history().canGoForward())
 
+    def _updateBlockedInfo(self):
+        blocker = AwWebEngine.BLOCKER
+        if not (blocker and self._currentWeb):
+            self._blockedInfo.setText('')
+            return
+
+        count, size = blocker.statsFor(self._currentWeb.url().toString())
+        self._blockedInfo.setText('Blocked: %d (~%d KB)' % (count, size // 1024) if count else '')
+
     def _goToAddress(self):
         q = QUrl(self._itAddress.text())
         if q.scheme() == "":
@@ -491,6 +912,8 @@ class AwBrowser(QMainWindow):
         self._currentWeb.show()
 
     def onPageChange(self, url):
+        if not self._fromCurrentTab():
+            return
         if url and url.toString().startswith('http'):
             self._itAddress.setText(url.toString())
         self.forwardBtn.setEnabled(self._currentWeb.history().canGoForward())
@@ -604,23 +1027,29 @@ class AwBrowser(QMainWindow):
 
     # ---------------------------------------------------------------------------------
     def createProvidersMenu(self, parentWidget):
-        multiBtn = QAction(QtGui.QIcon(os.path.join(CWD, 'assets', 'plus-signal.png')), "New tab (Ctrl+n)", parentWidget)
+        multiBtn = QAction(icons.icon('plus-signal'), "New tab (Ctrl+n)", parentWidget)
         multiBtn.setStatusTip("Open providers in new tab (Ctrl+n)")
         multiBtn.triggered.connect(lambda: self.newProviderMenu(True))
         parentWidget.addAction(multiBtn)
 
     def newProviderMenu(self, newTab=False):
-        ctx = ProviderSelectionController()
+        if not self._providerSelection:
+            self._providerSelection = ProviderSelectionController()
         callBack = self.reOpenQueryNewTab if newTab else self.reOpenSameQuery
-        ctx.showCustomMenu(self._itAddress, callBack)
+        self._providerSelection.showCustomMenu(self._itAddress, callBack)
 
     @exceptionHandler
     def reOpenSameQuery(self, website):
+        if isinstance(website, ConfigHolder.ProviderGroup):
+            return self.openGroup(cfg.getGroupWebsites(website), self._context)
         self.open(website, self._context)
 
     @exceptionHandler
     def reOpenQueryNewTab(self, website):
-        self.add_new_tab()
+        if isinstance(website, ConfigHolder.ProviderGroup):
+            return self.openGroup(cfg.getGroupWebsites(website), self._context)
+        if not self._focusLookup(website, self._context):
+            self.add_new_tab()
         self.open(website, self._context)
 
     # ------------------------------------ Menu ---------------------------------------
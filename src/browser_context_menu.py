@@ -6,6 +6,7 @@ from PyQt5.QtWebEngineWidgets import QWebEnginePage, QWebEngineView, QWebEngineC
 from PyQt5.QtWidgets import *
 
 from .core import Label, Feedback
+from .table_import import TABLE_JS
 
 
 class StandardMenuOption:
@@ -65,12 +66,19 @@ class AwBrowserMenu:
 
         def _processMenuSelection():
             self._lastAssignedField = field
-            self.selectionHandler(field, value, self._replace_checked, self._copy_paste_checked,
-                                  self._format_syntax_checked, self._css_checked, self._script_checked,
-                                  self._browser_compatibility, isLink)
+            if self._browser_compatibility and not isLink:
+                # the table holding the selection is read from the page; the selected text if there's none
+                self._web.page().runJavaScript(TABLE_JS, lambda table: self._deliver(field, table or value, isLink))
+            else:
+                self._deliver(field, value, isLink)
 
         return _processMenuSelection
 
+    def _deliver(self, field, value, isLink):
+        self.selectionHandler(field, value, self._replace_checked, self._copy_paste_checked,
+                              self._format_syntax_checked, self._css_checked, self._script_checked,
+                              self._browser_compatibility, isLink)
+
     def contextMenuEvent(self, evt):
         """
             Handles the context menu in the web view.
@@ -83,7 +91,7 @@ class AwBrowserMenu:
 
         isLink = False
         value = None
-        if self._copy_paste_checked or self._format_syntax_checked or self._browser_compatibility:
+        if self._copy_paste_checked or self._format_syntax_checked:
             self._web.triggerPageAction(QWebEnginePage.Copy)
         if self._web.selectedText():
             isLink = False
@@ -176,7 +184,7 @@ class AwBrowserMenu:
 
         if self._lastAssignedField:
             if self._lastAssignedField in self._fields:
-                self.selectionHandler(self._lastAssignedField, value, isLink)
+                self._makeMenuAction(self._lastAssignedField, value, isLink)()
                 return True
             else:
                 self._lastAssignedField = None
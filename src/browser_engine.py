@@ -5,47 +5,137 @@
 # --------------------------------------------------
 
 import os
+import time
 
 from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor
-from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineContextMenuData, QWebEngineSettings, QWebEnginePage
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineContextMenuData, QWebEngineSettings, QWebEnginePage, \
+    QWebEngineProfile, QWebEngineScript
 from PyQt5.QtWidgets import *
 
+from .config import service as cfg
+from .content_blocker import ContentBlocker
 from .core import Label, Feedback, CWD
+from .provider_stats import sharedStats, PAGE_BYTES_JS
+
+PROFILE_NAME = 'anki-web-browser'
+
+DARK_READER_SETUP = """
+    DarkReader.setFetchMethod(window.fetch);
+    DarkReader.enable({
+        brightness: 105,
+        contrast: 90,
+        sepia: 10
+    });
+"""
 
 
 # noinspection PyPep8Naming
 class AwWebEngine(QWebEngineView):
 
     isLoading = False
+    lookupKey = None        # (provider, query) which this tab was opened for
+    traceId = None          # lookup being traced (tracing.tracer) until its page is loaded
+    measuredProvider = None     # provider whose page is loading, for its stats (ProviderStats)
+    _loadStartedAt = None
+    PROFILE = None
     DARK_READER = None
+    INTERCEPTOR = None
+    BLOCKER = None
+    _profileReady = False
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        AwWebEngine.setupProfile()
+        self.setPage(QWebEnginePage(AwWebEngine.sharedProfile(), self))
         self.create()
-        self.interceptor = WebRequestInterceptor()
-        self.page().profile().setRequestInterceptor(self.interceptor)
+
+    @classmethod
+    def sharedProfile(clz) -> QWebEngineProfile:
+        """
+            The profile used by every tab, with a persistent and size capped disk cache.
+            Profile wide setup must go through here
+        """
+
+        if not clz.PROFILE:
+            clz.PROFILE = QWebEngineProfile(PROFILE_NAME, QApplication.instance())
+            clz.PROFILE.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+            clz.PROFILE.setCachePath(os.path.join(cfg.getCachePath(), 'http'))
+            clz.PROFILE.setHttpCacheMaximumSize(cfg.getCacheLimits()[0])
+        return clz.PROFILE
+
+    @classmethod
+    def clearCache(clz):
+        if clz.PROFILE:
+            clz.PROFILE.clearHttpCache()
+
+    @classmethod
+    def setupProfile(clz):
+        """ Settings shared by all tabs, applied only once """
+
+        if clz._profileReady:
+            return
+        settings = clz.sharedProfile().settings()
+        settings.setAttribute(QWebEngineSettings.LocalContentCanAccessFileUrls, True)
+        settings.setAttribute(QWebEngineSettings.ErrorPageEnabled, True)
+        settings.setAttribute(QWebEngineSettings.AllowRunningInsecureContent, True)
+        clz._profileReady = True
+
+    @classmethod
+    def interceptor(clz) -> 'WebRequestInterceptor':
+        if not clz.INTERCEPTOR:
+            clz.INTERCEPTOR = WebRequestInterceptor(clz.sharedProfile())
+        return clz.INTERCEPTOR
+
+    @classmethod
+    def enableContentBlocker(clz):
+        if clz.BLOCKER:
+            return
+        clz.BLOCKER = ContentBlocker.fromFolder()
+        if clz.BLOCKER:
+            clz.interceptor().addRule(clz.BLOCKER)
+        else:
+            Feedback.log('Content blocker: no block list found')
 
     @classmethod
     def enableDarkReader(clz):
-        if not clz.DARK_READER:
-            with open(os.path.join(CWD, 'resources', 'darkreader.js'), 'r') as ngJS:
-                clz.DARK_READER = ngJS.read()
-                Feedback.log('DarkReader loaded')
+        """
+            Registers DarkReader once on the profile, with its settings baked in.
+            It runs when each document is created, so pages are already dark while parsing
+        """
+
+        if clz.DARK_READER:
+            return
+        with open(os.path.join(CWD, 'resources', 'darkreader.js'), 'r') as ngJS:
+            source = ngJS.read()
+
+        script = QWebEngineScript()
+        script.setName('awb-dark-reader')
+        script.setSourceCode(source + DARK_READER_SETUP)
+        script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+        script.setWorldId(QWebEngineScript.MainWorld)
+        script.setRunsOnSubFrames(False)
+        clz.sharedProfile().scripts().insert(script)
+        clz.DARK_READER = script
+        Feedback.log('DarkReader loaded')
 
     def create(self):
-        self.settings().globalSettings().setAttribute(QWebEngineSettings.LocalContentCanAccessFileUrls, True)
-        self.settings().globalSettings().setAttribute(QWebEngineSettings.ErrorPageEnabled, True)
-        self.settings().globalSettings().setAttribute(QWebEngineSettings.AllowRunningInsecureContent, True)
-
         self.page().loadStarted.connect(self.onStartLoading)
         self.page().loadFinished.connect(self.onLoadFinish)
 
         return self
 
+    def measureLoad(self, provider: str):
+        """ The next load is recorded on the stats of provider (None: not recorded) """
+
+        self.measuredProvider = provider
+        self._loadStartedAt = None
+
 # ======   Listeners ======
 
     def onStartLoading(self):
         self.isLoading = True
+        if self.measuredProvider and self._loadStartedAt is None:
+            self._loadStartedAt = time.perf_counter()
 
         # self.page().runJavaScript("""
         # var loadingCss = 'body { background: red; }',
@@ -64,28 +154,54 @@ class AwWebEngine(QWebEngineView):
         self.isLoading = False
         if not result:
             Feedback.log('No result on loading page! ')
+        if self.measuredProvider and self._loadStartedAt is not None:
+            self._recordStats(self.measuredProvider, result)
 
-        if AwWebEngine.DARK_READER:
-            self.page().runJavaScript(AwWebEngine.DARK_READER)
-            # self.page().runJavaScript("document.getElementById('loadingBack').disabled = 'disabled';")
-            self.page().runJavaScript("DarkReader.setFetchMethod(window.fetch);")
-
-            self.page().runJavaScript("""
-                    DarkReader.enable({
-                        brightness: 105,
-                        contrast: 90,
-                        sepia: 10
-                    });
-    
-                    console.log('Dark reader come through');
-                """)
+    def _recordStats(self, provider: str, result: bool):
+        stats = sharedStats()
+        stats.record(provider, (time.perf_counter() - self._loadStartedAt) * 1000, result)
+        self.measuredProvider = self._loadStartedAt = None
+        if result:
+            self.page().runJavaScript(PAGE_BYTES_JS, lambda size: stats.recordBytes(provider, size)
+                                      if isinstance(size, (int, float)) else None)
 
 
 class WebRequestInterceptor(QWebEngineUrlRequestInterceptor):
+    """
+        Single interceptor for the shared profile, driven by a list of rules.
+        A rule is a callable receiving the QWebEngineUrlRequestInfo.
+        The interceptor is installed only while there is some rule, otherwise requests never reach Python
+    """
 
-    def __init__(self, parent=None):
+    def __init__(self, profile, parent=None):
         super().__init__(parent)
+        self._profile = profile
+        self._rules = tuple()
+        self._installed = False
+
+    def addRule(self, rule):
+        if rule not in self._rules:
+            self._rules = self._rules + (rule,)
+        self._updateInstallation()
+
+    def removeRule(self, rule):
+        self._rules = tuple(r for r in self._rules if r is not rule)
+        self._updateInstallation()
+
+    def hasRules(self) -> bool:
+        return len(self._rules) > 0
+
+    def _updateInstallation(self):
+        if self.hasRules() == self._installed:
+            return
+
+        # setUrlRequestInterceptor is only available from Qt 5.13
+        install = getattr(self._profile, 'setUrlRequestInterceptor', None) or self._profile.setRequestInterceptor
+        install(self if self.hasRules() else None)
+        self._installed = self.hasRules()
+        Feedback.log('WebRequestInterceptor installed: {}'.format(self._installed))
 
     def interceptRequest(self, info):
-        info.setHttpHeader(b'Access-Control-Allow-Origin', b'*')
+        for rule in self._rules:     # tuple: safe if rules change meanwhile
+            rule(info)
 
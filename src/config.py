@@ -1,21 +1,21 @@
 # -*- coding: utf-8 -*-
-# Handles Configuration reading, saving and the integration with the config UI
-# Contains model, service and view controller for Config
+# Handles Configuration reading and saving
+# Contains model and service for Config. The view controller is on config_dialog
 #
 # This files is part of anki-web-browser addon
 # @author ricardo saturnino
 # -------------------------------------------------------
 
-from .config_view import Ui_ConfigView
 from .core import Feedback
+from .query_pipeline import STEPS, DEFAULT_STEPS
 
 import os
 import json
 import re
-import shutil
-from PyQt5 import QtCore, QtWidgets
-from PyQt5.QtWidgets import QDialog
-from PyQt5.Qt import QIcon
+import hashlib
+from stat import S_IMODE
+import tempfile
+import weakref
 
 currentLocation = os.path.dirname(os.path.realpath(__file__))
 CONFIG_FILE = 'config.json'
@@ -28,10 +28,31 @@ class ConfigHolder:
     SHORTCUT = 'Ctrl+Shift+B'
     RP_SHORT = 'F10'
     INITIAL_SIZE = '850x500'
+    ENGINE_POOL_SIZE = 2
+    TAB_CACHE_MAX_TABS = 20
+    CACHE_SIZE = 300
+    BATCH_MAX_CONCURRENT = 3
+    BATCH_HOST_INTERVAL = 1000
+    TAB_FREEZE_AFTER = 300
+    TAB_DISCARD_MAX_TABS = 8
+    FAN_OUT_MAX_CONCURRENT = 3
+    QUERY_MAX_LENGTH = 200
+    IMAGE_MAX_DIMENSION = 1600
+    IMAGE_JPEG_QUALITY = 85
 
     def __init__(self, keepBrowserOpened=True, browserAlwaysOnTop = False, menuShortcut=SHORTCUT, \
                  providers=[], initialBrowserSize=INITIAL_SIZE, enableDarkReader=False,
-                 repeatShortcut=RP_SHORT, useSystemBrowser=False, filteredWords=[], **kargs):
+                 repeatShortcut=RP_SHORT, useSystemBrowser=False, filteredWords=[],
+                 enginePoolSize=ENGINE_POOL_SIZE, enableContentBlocker=False, preloadPredictedProvider=True,
+                 tabCacheMaxTabs=TAB_CACHE_MAX_TABS,
+                 cachePath='', cacheSizeMB=CACHE_SIZE, cacheFirstProviders=[],
+                 batchMaxConcurrent=BATCH_MAX_CONCURRENT, batchHostIntervalMs=BATCH_HOST_INTERVAL,
+                 tabFreezeAfterSeconds=TAB_FREEZE_AFTER, tabDiscardMaxTabs=TAB_DISCARD_MAX_TABS,
+                 buildBrowserWhenIdle=True, providerLauncher=True,
+                 providerGroups=[], fanOutMaxConcurrent=FAN_OUT_MAX_CONCURRENT, queryPipeline=DEFAULT_STEPS,
+                 queryMaxLength=QUERY_MAX_LENGTH, sortProvidersByScore=False,
+                 tableColumnMapping={}, imageMaxDimension=IMAGE_MAX_DIMENSION,
+                 imageJpegQuality=IMAGE_JPEG_QUALITY, **kargs):
         self.providers = [ConfigHolder.Provider(**p) for p in providers]
         self.keepBrowserOpened = keepBrowserOpened
         self.browserAlwaysOnTop = browserAlwaysOnTop
@@ -41,6 +62,27 @@ class ConfigHolder:
         self.filteredWords = filteredWords
         self.initialBrowserSize = initialBrowserSize
         self.enableDarkReader = enableDarkReader
+        self.enginePoolSize = enginePoolSize
+        self.enableContentBlocker = enableContentBlocker
+        self.preloadPredictedProvider = preloadPredictedProvider
+        self.tabCacheMaxTabs = tabCacheMaxTabs
+        self.cachePath = cachePath
+        self.cacheSizeMB = cacheSizeMB
+        self.cacheFirstProviders = cacheFirstProviders
+        self.batchMaxConcurrent = batchMaxConcurrent
+        self.batchHostIntervalMs = batchHostIntervalMs
+        self.tabFreezeAfterSeconds = tabFreezeAfterSeconds
+        self.tabDiscardMaxTabs = tabDiscardMaxTabs
+        self.buildBrowserWhenIdle = buildBrowserWhenIdle
+        self.providerLauncher = providerLauncher
+        self.providerGroups = [ConfigHolder.ProviderGroup(**g) for g in providerGroups]
+        self.fanOutMaxConcurrent = fanOutMaxConcurrent
+        self.queryPipeline = list(queryPipeline)
+        self.queryMaxLength = queryMaxLength
+        self.sortProvidersByScore = sortProvidersByScore
+        self.tableColumnMapping = tableColumnMapping
+        self.imageMaxDimension = imageMaxDimension
+        self.imageJpegQuality = imageJpegQuality
 
     def toDict(self):
         res = dict({
@@ -52,7 +94,28 @@ class ConfigHolder:
             'providers': [p for p in  map(lambda p: p.__dict__, self.providers)],
             'filteredWords': self.filteredWords,
             'initialBrowserSize': self.initialBrowserSize,
-            'enableDarkReader': self.enableDarkReader
+            'enableDarkReader': self.enableDarkReader,
+            'enginePoolSize': self.enginePoolSize,
+            'enableContentBlocker': self.enableContentBlocker,
+            'preloadPredictedProvider': self.preloadPredictedProvider,
+            'tabCacheMaxTabs': self.tabCacheMaxTabs,
+            'cachePath': self.cachePath,
+            'cacheSizeMB': self.cacheSizeMB,
+            'cacheFirstProviders': self.cacheFirstProviders,
+            'batchMaxConcurrent': self.batchMaxConcurrent,
+            'batchHostIntervalMs': self.batchHostIntervalMs,
+            'tabFreezeAfterSeconds': self.tabFreezeAfterSeconds,
+            'tabDiscardMaxTabs': self.tabDiscardMaxTabs,
+            'buildBrowserWhenIdle': self.buildBrowserWhenIdle,
+            'providerLauncher': self.providerLauncher,
+            'providerGroups': [g.__dict__ for g in self.providerGroups],
+            'fanOutMaxConcurrent': self.fanOutMaxConcurrent,
+            'queryPipeline': self.queryPipeline,
+            'queryMaxLength': self.queryMaxLength,
+            'sortProvidersByScore': self.sortProvidersByScore,
+            'tableColumnMapping': self.tableColumnMapping,
+            'imageMaxDimension': self.imageMaxDimension,
+            'imageJpegQuality': self.imageJpegQuality
         })
         return res
 
@@ -62,24 +125,43 @@ class ConfigHolder:
             self.name = name
             self.url = url
 
+    class ProviderGroup:
+        """ Providers (by name) opened together, each one on its own tab """
+
+        def __init__(self, name, providers, **kargs):
+            self.name = name
+            self.providers = providers
+
 
 # ------------------------------ Service class --------------------------
 # noinspection PyPep8Naming,PyMethodMayBeStatic
 class ConfigService:
     """
-        Responsible for reading and storing configurations
+        Responsible for reading and storing configurations.
+        Changes (saved from the Config window or edited on the file while Anki is open)
+        are sent to the subscribers, and increase version
     """
     _config = None
     _validURL = re.compile('^((http|ftp){1}s{0,1}://)([\w._/?&=%#@]|-)+{}([\w._/?&=%#+]|-)*$')
     firstTime = None
+    RELOAD_DELAY_MS = 300
+
+    def __init__(self):
+        self.version = 0
+        self._subscribers = []
+        self._fileState = None
+        self._watcher = None
 
     def getConfig(self):
         if not self._config:
             return self.load()
         return self._config        
 
+    def _filePath(self) -> str:
+        return currentLocation + '/' + CONFIG_FILE
+
     def load(self, createIfNotExists = True):
-        Feedback.log('[INFO] Trying to read config file in {}'.format(currentLocation + '/' + CONFIG_FILE))
+        Feedback.log('[INFO] Trying to read config file in {}'.format(self._filePath()))
         try:
             conf = self._readFileToObj()
         except:
@@ -91,29 +173,120 @@ class ConfigService:
         return conf
 
     def _readFileToObj(self):
-        with open(currentLocation + '/' + CONFIG_FILE) as f:
-            obj = json.load(f)
-            Feedback.log(obj)
-            conf = ConfigHolder(**obj)
+        with open(self._filePath(), 'rb') as f:
+            content = f.read()
+        obj = json.loads(content.decode('utf-8'))
+        Feedback.log(obj)
+        conf = ConfigHolder(**obj)
+        self._fileState = self._stateOf(content)
 
         return conf
 
     def __writeToFile(self, config):
-        """ Handles file writing... """
+        """
+            Writes on a temporary file on the same folder, which then replaces the config file.
+            The file is never left half written, even if Anki is closed while saving.
+            It keeps the permissions of the file replaced (temporary files are only readable by their owner)
+        """
 
-        bkpName = None  #
+        content = json.dumps(config.toDict()).encode('utf-8')
+        try:
+            mode = S_IMODE(os.stat(self._filePath()).st_mode)
+        except OSError:
+            mode = 0o644
+        fd, tempName = tempfile.mkstemp(prefix='.' + CONFIG_FILE, dir=currentLocation)
         try:
-            if os.path.exists(currentLocation + '/' + CONFIG_FILE):
-                bkpName = shutil.copyfile(currentLocation + '/' + CONFIG_FILE, currentLocation + '/.bkp_' + CONFIG_FILE)
-            with(open(currentLocation + '/' + CONFIG_FILE, 'w')) as cfgFile:
-                json.dump(config.toDict(), cfgFile)
+            with os.fdopen(fd, 'wb') as cfgFile:
+                cfgFile.write(content)
+                cfgFile.flush()
+                os.fsync(cfgFile.fileno())
+            os.chmod(tempName, mode)
+            os.replace(tempName, self._filePath())
+            self._fileState = self._stateOf(content)
         except Exception as e:
-            if bkpName:
-                shutil.copyfile(bkpName, currentLocation + '/' + CONFIG_FILE)  # restore
+            if os.path.exists(tempName):
+                os.remove(tempName)
             Feedback.showError(e)
-        finally:
-            if bkpName:
-                os.remove(bkpName)
+
+    # ---------------------------------- Changes ------------------------------------
+
+    def _stateOf(self, content: bytes) -> tuple:
+        """ (modification time, size, hash) of the config file, content being what it holds """
+
+        stat = os.stat(self._filePath())
+        return stat.st_mtime_ns, stat.st_size, hashlib.sha1(content).hexdigest()
+
+    def subscribe(self, callback):
+        """
+            callback(config) is called after the configuration changes.
+            Bound methods are weakly referenced, so a subscribed object can still be garbage collected
+        """
+
+        ref = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else (lambda: callback)
+        self._subscribers.append(ref)
+
+    def unsubscribe(self, callback):
+        self._subscribers = [ref for ref in self._subscribers if ref() not in (None, callback)]
+
+    def _notify(self):
+        self.version += 1
+        Feedback.log('[INFO] Config changed (version {})'.format(self.version))
+        for ref in list(self._subscribers):
+            callback = ref()
+            if callback is None:
+                self._subscribers.remove(ref)
+                continue
+            try:
+                callback(self._config)
+            except Exception as e:
+                Feedback.log('Config subscriber failed: {}'.format(e))
+
+    def watchFile(self):
+        """ Reloads the config file when it's changed outside Anki """
+
+        if self._watcher:
+            return
+        from PyQt5.QtCore import QFileSystemWatcher, QTimer
+
+        self._watcher = QFileSystemWatcher([self._filePath(), currentLocation])
+        reload = lambda *args: QTimer.singleShot(self.RELOAD_DELAY_MS, self.reloadIfChanged)
+        self._watcher.fileChanged.connect(reload)
+        self._watcher.directoryChanged.connect(reload)
+
+    def reloadIfChanged(self) -> bool:
+        """
+            Reads the file again when its modification time, size and content differ from what was last read or written.
+            Invalid content (e.g. a file still being edited) is ignored, keeping the current configuration
+        """
+
+        path = self._filePath()
+        if self._watcher and path not in self._watcher.files() and os.path.exists(path):
+            self._watcher.addPath(path)     # replacing the file drops it from the watcher
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if self._fileState and self._fileState[:2] == (stat.st_mtime_ns, stat.st_size):
+            return False
+
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            if self._fileState and self._fileState[2] == hashlib.sha1(content).hexdigest():
+                self._fileState = self._stateOf(content)
+                return False
+            conf = ConfigHolder(**json.loads(content.decode('utf-8')))
+            self.validate(conf)
+        except Exception as e:
+            Feedback.log('[WARN] Config file changed but not reloaded: {}'.format(e))
+            return False
+
+        Feedback.log('[INFO] Config file reloaded')
+        self._fileState = self._stateOf(content)
+        self._config = conf
+        self._notify()
+        return True
 
     def _createConfiguration(self):
         """
@@ -153,6 +326,7 @@ class ConfigService:
         Feedback.log('[INFO] Saving config file in {}'.format(currentLocation + '/' + CONFIG_FILE))
         self.__writeToFile(config)
         self._config = config
+        self._notify()
         Feedback.showInfo('Anki-Web-Browser configuration saved')
         return True
 
@@ -164,7 +338,18 @@ class ConfigService:
 
         checkedTypes = [(config, ConfigHolder), (config.keepBrowserOpened, bool), (config.browserAlwaysOnTop, bool),
                         (config.useSystemBrowser, bool), (config.providers, list),
-                        (config.enableDarkReader, bool)]
+                        (config.enableDarkReader, bool), (config.enginePoolSize, int),
+                        (config.enableContentBlocker, bool), (config.preloadPredictedProvider, bool),
+                        (config.tabCacheMaxTabs, int),
+                        (config.cachePath, str), (config.cacheSizeMB, int), (config.cacheFirstProviders, list),
+                        (config.batchMaxConcurrent, int), (config.batchHostIntervalMs, int),
+                        (config.tabFreezeAfterSeconds, int), (config.tabDiscardMaxTabs, int),
+                        (config.buildBrowserWhenIdle, bool),
+                        (config.providerLauncher, bool), (config.providerGroups, list),
+                        (config.fanOutMaxConcurrent, int), (config.queryPipeline, list),
+                        (config.queryMaxLength, int), (config.sortProvidersByScore, bool),
+                        (config.tableColumnMapping, dict), (config.imageMaxDimension, int),
+                        (config.imageJpegQuality, int)]
         for current, expected in checkedTypes:
             if not isinstance(current, expected):
                 raise ValueError('{} should be {}'.format(current, expected))
@@ -173,6 +358,21 @@ class ConfigService:
             if not name or not url:
                 raise ValueError('There is an illegal value for one provider (%s %s)' % (name, url))
 
+        for group in config.providerGroups:
+            if not group.name or not isinstance(group.providers, list) or not group.providers:
+                raise ValueError('There is an illegal value for one provider group (%s)' % group.name)
+
+        if not 1 <= config.imageJpegQuality <= 100:
+            raise ValueError('imageJpegQuality should be from 1 to 100')
+
+        if not all(isinstance(k, str) and isinstance(v, str) for k, v in config.tableColumnMapping.items()):
+            raise ValueError('tableColumnMapping should map column headers to field names')
+
+        unknownSteps = [step for step in config.queryPipeline if step not in STEPS]
+        if unknownSteps:
+            raise ValueError('Unknown query pipeline steps: {}. Available: {}'.format(
+                ', '.join(map(str, unknownSteps)), ', '.join(STEPS)))
+
         if not self.isValidSize(config.initialBrowserSize):
             raise ValueError('Initial browser size contains invalid values')
 
@@ -215,212 +415,42 @@ class ConfigService:
                 return tuple(map(lambda i: int(i), cValue.split('x')))
         return tuple(map(lambda i: int(i), self._config.INITIAL_SIZE.split('x')))
 
-    
-# ------------------------------ View Controller --------------------------
-
-# noinspection PyPep8Naming
-class ConfigController:
-    """
-        Manages the view interface for configurations
-    """
-
-    _ui = None
-    _hasSelection = False
-    _pendingChanges = False
-    _tempCfg = None
-
-    def __init__(self, myParent):
-        self._tempCfg = service.getConfig()
-        self._ui = ConfigViewAdapter(myParent)
-        self.setupBinds()
-        self.setupInitialState()
-
-    def setupBinds(self):
-        """Sets the relations between the UI actions and handler functions"""
-
-        self._ui.btSave.clicked.connect(lambda: self.onSaveClick())
-        self._ui.btCancel.clicked.connect(lambda: self.onCancelClick())
-
-        self._ui.btAdd.clicked.connect(lambda: self.onAddClick())
-        self._ui.btRemove.clicked.connect(lambda: self.onRemoveClick())
-        self._ui.btSortProvider.clicked.connect(self.onSortProviders)
-        self._ui.btProviderUp.clicked.connect(self.onProviderUp)
-        self._ui.btProviderDown.clicked.connect(self.onProviderDown)
-        self._ui.tbProviders.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self._ui.cbSystemBrowser.stateChanged.connect(lambda: self.onUsedBrowserChange())
-
-    def setupInitialState(self):
-        self.onUsedBrowserChange()        
-
-    def onUsedBrowserChange(self):
-        useSystemBrowser = self._ui.cbSystemBrowser.isChecked()
-        self._ui.browserInfo.setVisible(useSystemBrowser)
-        self._ui.rbKeepOpened.setEnabled(not useSystemBrowser)
-        self._ui.rbOnTop.setEnabled(not useSystemBrowser)
-
-    def open(self):
-        """Opens the Config window"""
-
-        self._tempCfg = service.getConfig()
-        self._ui.rbKeepOpened.setChecked(bool(self._tempCfg.keepBrowserOpened))
-        self._ui.rbOnTop.setChecked(bool(self._tempCfg.browserAlwaysOnTop))
-        self._ui.cbSystemBrowser.setChecked(bool(self._tempCfg.useSystemBrowser))
-        self._ui.teShortcutMenu.setText(self._tempCfg.menuShortcut)
-        self._ui.teShortcutRepeat.setText(self._tempCfg.repeatShortcut)
-        self._ui.teWordFilter.setText(' '.join(self._tempCfg.filteredWords))
-        self._ui.cbDarkReader.setChecked(bool(self._tempCfg.enableDarkReader))
-
-        (width, height) = self._tempCfg.initialBrowserSize.split('x')
-        self._ui.leWidth.setText(width)
-        self._ui.leHeight.setText(height)
-
-        self.setupDataTable()
-        self._ui.window.show()
-
-    def setupDataTable(self):
-        """Prepares the data table and loads the providers from the config"""
-
-        data = self._tempCfg.providers
-        tb = self._ui.tbProviders
-        tb.setColumnCount(2)
-        tb.setRowCount(len(data))
-
-        for index, item in enumerate(data):
-            tb.setItem(index, 0, QtWidgets.QTableWidgetItem(item.name))
-            tb.setItem(index, 1, QtWidgets.QTableWidgetItem(item.url))
-
-    # ----------------------------------- View handles -------------------------------
-
-    def onAddClick(self):
-        """Handles Add button on view"""
-
-        tb = self._ui.tbProviders
-        tb.insertRow(tb.rowCount())
-        newUrl = QtWidgets.QTableWidgetItem('http://something/{}')
-        tb.setItem(tb.rowCount() - 1, 0, QtWidgets.QTableWidgetItem('My New Provider'))
-        tb.setItem(tb.rowCount() - 1, 1, newUrl)
-        tb.clearSelection()
-        newUrl.setSelected(True)
-        tb.selectRow(tb.rowCount() - 1)
-        self._tempCfg.providers.append(ConfigHolder.Provider("My New Provider", "http://something/{}"))
-
-    def onRemoveClick(self):
-        """ Handles Remove button on view """
-
-        tab = self._ui.tbProviders
-
-        if not tab.selectedIndexes():
-            Feedback.showInfo('Please select the item to be removed')
-            return
-
-        rowIndex = tab.selectedIndexes()[0].row()
-        tab.removeRow(rowIndex)
-        self._tempCfg.providers.pop(rowIndex)
-
-    def onCancelClick(self):
-        self._tempCfg = None
-        self._ui.window.close()
-
-    def onSaveClick(self):
-        _tempCfg = ConfigHolder()
-        _tempCfg.browserAlwaysOnTop = self._ui.rbOnTop.isChecked()
-        _tempCfg.keepBrowserOpened = self._ui.rbKeepOpened.isChecked()
-        _tempCfg.useSystemBrowser = self._ui.cbSystemBrowser.isChecked()
-        _tempCfg.menuShortcut = self._ui.teShortcutMenu.text().strip()
-        _tempCfg.repeatShortcut = self._ui.teShortcutRepeat.text().strip()
-        _tempCfg.filteredWords = self._ui.teWordFilter.text().strip().split(' ')
-        _tempCfg.enableDarkReader = self._ui.cbDarkReader.isChecked()
-        _tempCfg.initialBrowserSize = ('%sx%s' % (self._ui.leWidth.text(), self._ui.leHeight.text()))
-
-        tab = self._ui.tbProviders
-        _tempCfg.providers = [None] * tab.rowCount()
-
-        for index in range(tab.rowCount()):
-            _tempCfg.providers[index] = ConfigHolder.Provider(tab.item(index, 0).text(), tab.item(index, 1).text())
-
-        res = service.save(_tempCfg)
-        if res:
-            self.onCancelClick()
-
-    def onSelectItem(self):
-        self._hasSelection = True
-        self._ui.btRemove.setEnabled(True)
-        self._ui.btProviderUp.setEnabled(True)
-        self._ui.btProviderDown.setEnabled(True)
-
-    def onUnSelectItem(self):
-        self._hasSelection = False
-        self._ui.btRemove.setEnabled(False)
-        self._ui.btProviderUp.setEnabled(False)
-        self._ui.btProviderDown.setEnabled(False)
-    
-    def onChangeItem(self):
-        self._pendingChanges = True
-
-    def onSortProviders(self):
-        self._ui.tbProviders.clearSelection()
-        service.sortProviders(self._tempCfg)
-        self.setupDataTable()
+    def getGroupWebsites(self, group: ConfigHolder.ProviderGroup) -> list:
+        """ URLs of the providers on group, in the group order. Names not found are skipped """
 
-    def onProviderUp(self):
-        tab = self._ui.tbProviders
+        byName = {p.name: p.url for p in self.getConfig().providers}
+        return [byName[name] for name in group.providers if name in byName]
 
-        if not tab.selectedIndexes():
-            Feedback.showInfo('Please select an item')
-            return
-
-        rowIndex = tab.selectedIndexes()[0].row()
-        print("Index: %d, count: %d"  % (rowIndex, tab.rowCount()))
-        service.moveProvider(self._tempCfg, rowIndex, True)
-
-        self.setupDataTable()
-        tab.selectRow(rowIndex - 1)
-
-    def onProviderDown(self):
-        tab = self._ui.tbProviders
+    # ---------------------------------- Cache ------------------------------------
 
-        if not tab.selectedIndexes():
-            Feedback.showInfo('Please select an item')
-            return
-
-        rowIndex = tab.selectedIndexes()[0].row()
-        service.moveProvider(self._tempCfg, rowIndex, False)
-
-        self.setupDataTable()
-        tab.selectRow(rowIndex + 1)
-        
-# ----------------------------------------------------------------------------
-# Adjust on View
+    def getCachePath(self) -> str:
+        return self.getConfig().cachePath or os.path.join(currentLocation, 'user_files', 'cache')
 
-class ConfigViewAdapter(Ui_ConfigView):
+    def getCacheLimits(self) -> tuple:
+        """ Sizes in bytes for (HTTP cache, stored pages). A quarter of the configured size goes to stored pages """
 
-    def __init__(self, myParent):
-        self.window = QtWidgets.QDialog(parent=myParent)
-        self.setupUi(self.window)
-        w = self.window.width()
-        h = self.window.height()
-        # self.window.setFixedSize(w, h)
+        total = max(0, self.getConfig().cacheSizeMB) * 1024 * 1024
+        return total - total // 4, total // 4
 
-        # self.verticalLayWidget.setFixedSize(510, 540)
-        self.browserInfo.setVisible(self.cbSystemBrowser.isChecked()) #keep
+    def isCacheFirst(self, website: str) -> bool:
+        """ Whether the provider with the given URL should be served from a stored copy, when there is one """
 
-        self.btRemove.setIcon(self.getIcon(QtWidgets.QStyle.SP_TrashIcon)) 
-        self.btAdd.setIcon(self.getIcon(QtWidgets.QStyle.SP_DirLinkIcon))
-        self.btSave.setIcon(self.getIcon(QtWidgets.QStyle.SP_DialogApplyButton))
-        self.btCancel.setIcon(self.getIcon(QtWidgets.QStyle.SP_DialogCancelButton))
-        self.btSortProvider.setIcon(self.getIcon(QtWidgets.QStyle.SP_BrowserReload))
-
-        self.btProviderUp.setIcon(self.getIcon(QtWidgets.QStyle.SP_ArrowUp))
-        self.btProviderUp.setText('')
-        self.btProviderDown.setIcon(self.getIcon(QtWidgets.QStyle.SP_ArrowDown))
-        self.btProviderDown.setText('')
+        config = self.getConfig()
+        if not config.cacheFirstProviders:
+            return False
+        return any(p.url == website and p.name in config.cacheFirstProviders for p in config.providers)
 
-    def getIcon(self, qtStyle):
-        return QIcon(QtWidgets.QApplication.style().standardIcon(qtStyle))
+    
+# -----------------------------------------------------------------------------
+# global instances
 
+service = ConfigService()
 
 
-# -----------------------------------------------------------------------------
-# global instances
+def __getattr__(name):
+    """ The Config window is only imported when used; it's kept reachable from here """
 
-service = ConfigService()
\ No newline at end of file
+    if name in ('ConfigController', 'ConfigViewAdapter'):
+        from . import config_dialog
+        return getattr(config_dialog, name)
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# Integration between the configuration and the config UI
+# Contains the view controller for Config
+#
+# This files is part of anki-web-browser addon
+# -------------------------------------------------------
+
+import os
+import shutil
+
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.Qt import QIcon
+
+from .config import ConfigHolder, service
+from .config_view import Ui_ConfigView
+from .core import Feedback
+from .page_cache import PageSnapshotStore, folderSize
+from .provider_stats import sharedStats
+
+# ------------------------------ View Controller --------------------------
+
+# noinspection PyPep8Naming
+class ConfigController:
+    """
+        Manages the view interface for configurations
+    """
+
+    _ui = None
+    _hasSelection = False
+    _pendingChanges = False
+    _tempCfg = None
+
+    def __init__(self, myParent):
+        self._tempCfg = service.getConfig()
+        self._ui = ConfigViewAdapter(myParent)
+        self.setupBinds()
+        self.setupInitialState()
+
+    def setupBinds(self):
+        """Sets the relations between the UI actions and handler functions"""
+
+        self._ui.btSave.clicked.connect(lambda: self.onSaveClick())
+        self._ui.btCancel.clicked.connect(lambda: self.onCancelClick())
+
+        self._ui.btAdd.clicked.connect(lambda: self.onAddClick())
+        self._ui.btRemove.clicked.connect(lambda: self.onRemoveClick())
+        self._ui.btSortProvider.clicked.connect(self.onSortProviders)
+        self._ui.btProviderUp.clicked.connect(self.onProviderUp)
+        self._ui.btProviderDown.clicked.connect(self.onProviderDown)
+        self._ui.tbProviders.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self._ui.cbSystemBrowser.stateChanged.connect(lambda: self.onUsedBrowserChange())
+        self._ui.btClearCache.clicked.connect(self.onClearCacheClick)
+
+    def setupInitialState(self):
+        self.onUsedBrowserChange()        
+
+    def onUsedBrowserChange(self):
+        useSystemBrowser = self._ui.cbSystemBrowser.isChecked()
+        self._ui.browserInfo.setVisible(useSystemBrowser)
+        self._ui.rbKeepOpened.setEnabled(not useSystemBrowser)
+        self._ui.rbOnTop.setEnabled(not useSystemBrowser)
+
+    def open(self):
+        """Opens the Config window"""
+
+        self._tempCfg = service.getConfig()
+        self._ui.rbKeepOpened.setChecked(bool(self._tempCfg.keepBrowserOpened))
+        self._ui.rbOnTop.setChecked(bool(self._tempCfg.browserAlwaysOnTop))
+        self._ui.cbSystemBrowser.setChecked(bool(self._tempCfg.useSystemBrowser))
+        self._ui.teShortcutMenu.setText(self._tempCfg.menuShortcut)
+        self._ui.teShortcutRepeat.setText(self._tempCfg.repeatShortcut)
+        self._ui.teWordFilter.setText(' '.join(self._tempCfg.filteredWords))
+        self._ui.cbDarkReader.setChecked(bool(self._tempCfg.enableDarkReader))
+
+        (width, height) = self._tempCfg.initialBrowserSize.split('x')
+        self._ui.leWidth.setText(width)
+        self._ui.leHeight.setText(height)
+
+        self.setupDataTable()
+        self.updateCacheUsage()
+        self._ui.window.show()
+
+    def setupDataTable(self):
+        """Prepares the data table and loads the providers from the config"""
+
+        data = self._tempCfg.providers
+        stats = sharedStats()
+        tb = self._ui.tbProviders
+        tb.setColumnCount(3)
+        tb.setHorizontalHeaderItem(2, QtWidgets.QTableWidgetItem('Load time, size, success'))
+        tb.horizontalHeader().setStretchLastSection(False)
+        tb.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.Stretch)
+        tb.horizontalHeader().setSectionResizeMode(2, QtWidgets.QHeaderView.ResizeToContents)
+        tb.setRowCount(len(data))
+
+        for index, item in enumerate(data):
+            tb.setItem(index, 0, QtWidgets.QTableWidgetItem(item.name))
+            tb.setItem(index, 1, QtWidgets.QTableWidgetItem(item.url))
+            tb.setItem(index, 2, self._statsItem(stats.label(item.url)))
+
+    @staticmethod
+    def _statsItem(text: str) -> QtWidgets.QTableWidgetItem:
+        """ Read only cell with the stats of a provider """
+
+        item = QtWidgets.QTableWidgetItem(text)
+        item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
+        return item
+
+    # ----------------------------------- View handles -------------------------------
+
+    def onAddClick(self):
+        """Handles Add button on view"""
+
+        tb = self._ui.tbProviders
+        tb.insertRow(tb.rowCount())
+        newUrl = QtWidgets.QTableWidgetItem('http://something/{}')
+        tb.setItem(tb.rowCount() - 1, 0, QtWidgets.QTableWidgetItem('My New Provider'))
+        tb.setItem(tb.rowCount() - 1, 1, newUrl)
+        tb.setItem(tb.rowCount() - 1, 2, self._statsItem(''))
+        tb.clearSelection()
+        newUrl.setSelected(True)
+        tb.selectRow(tb.rowCount() - 1)
+        self._tempCfg.providers.append(ConfigHolder.Provider("My New Provider", "http://something/{}"))
+
+    def onRemoveClick(self):
+        """ Handles Remove button on view """
+
+        tab = self._ui.tbProviders
+
+        if not tab.selectedIndexes():
+            Feedback.showInfo('Please select the item to be removed')
+            return
+
+        rowIndex = tab.selectedIndexes()[0].row()
+        tab.removeRow(rowIndex)
+        self._tempCfg.providers.pop(rowIndex)
+
+    def updateCacheUsage(self):
+        usage = folderSize(service.getCachePath())
+        self._ui.lbCacheUsage.setText('Cache usage: %.1f MB' % (usage / (1024 * 1024)))
+
+    def onClearCacheClick(self):
+        PageSnapshotStore(os.path.join(service.getCachePath(), 'pages'), 0).clear()
+
+        from .browser_engine import AwWebEngine
+        if AwWebEngine.PROFILE:
+            AwWebEngine.clearCache()    # asynchronous; the profile owns the folder
+        else:
+            shutil.rmtree(os.path.join(service.getCachePath(), 'http'), ignore_errors=True)
+
+        self.updateCacheUsage()
+        QtCore.QTimer.singleShot(1000, self.updateCacheUsage)
+
+    def onCancelClick(self):
+        self._tempCfg = None
+        self._ui.window.close()
+
+    def onSaveClick(self):
+        _tempCfg = ConfigHolder(**service.getConfig().toDict())    # keeps values not shown on the view
+        _tempCfg.browserAlwaysOnTop = self._ui.rbOnTop.isChecked()
+        _tempCfg.keepBrowserOpened = self._ui.rbKeepOpened.isChecked()
+        _tempCfg.useSystemBrowser = self._ui.cbSystemBrowser.isChecked()
+        _tempCfg.menuShortcut = self._ui.teShortcutMenu.text().strip()
+        _tempCfg.repeatShortcut = self._ui.teShortcutRepeat.text().strip()
+        _tempCfg.filteredWords = self._ui.teWordFilter.text().strip().split(' ')
+        _tempCfg.enableDarkReader = self._ui.cbDarkReader.isChecked()
+        _tempCfg.initialBrowserSize = ('%sx%s' % (self._ui.leWidth.text(), self._ui.leHeight.text()))
+
+        tab = self._ui.tbProviders
+        _tempCfg.providers = [None] * tab.rowCount()
+
+        for index in range(tab.rowCount()):
+            _tempCfg.providers[index] = ConfigHolder.Provider(tab.item(index, 0).text(), tab.item(index, 1).text())
+
+        res = service.save(_tempCfg)
+        if res:
+            self.onCancelClick()
+
+    def onSelectItem(self):
+        self._hasSelection = True
+        self._ui.btRemove.setEnabled(True)
+        self._ui.btProviderUp.setEnabled(True)
+        self._ui.btProviderDown.setEnabled(True)
+
+    def onUnSelectItem(self):
+        self._hasSelection = False
+        self._ui.btRemove.setEnabled(False)
+        self._ui.btProviderUp.setEnabled(False)
+        self._ui.btProviderDown.setEnabled(False)
+    
+    def onChangeItem(self):
+        self._pendingChanges = True
+
+    def onSortProviders(self):
+        self._ui.tbProviders.clearSelection()
+        service.sortProviders(self._tempCfg)
+        self.setupDataTable()
+
+    def onProviderUp(self):
+        tab = self._ui.tbProviders
+
+        if not tab.selectedIndexes():
+            Feedback.showInfo('Please select an item')
+            return
+
+        rowIndex = tab.selectedIndexes()[0].row()
+        service.moveProvider(self._tempCfg, rowIndex, True)
+
+        self.setupDataTable()
+        tab.selectRow(rowIndex - 1)
+
+    def onProviderDown(self):
+        tab = self._ui.tbProviders
+
+        if not tab.selectedIndexes():
+            Feedback.showInfo('Please select an item')
+            return
+
+        rowIndex = tab.selectedIndexes()[0].row()
+        service.moveProvider(self._tempCfg, rowIndex, False)
+
+        self.setupDataTable()
+        tab.selectRow(rowIndex + 1)
+        
+# ----------------------------------------------------------------------------
+# Adjust on View
+
+class ConfigViewAdapter(Ui_ConfigView):
+
+    def __init__(self, myParent):
+        self.window = QtWidgets.QDialog(parent=myParent)
+        self.setupUi(self.window)
+        w = self.window.width()
+        h = self.window.height()
+        # self.window.setFixedSize(w, h)
+
+        # self.verticalLayWidget.setFixedSize(510, 540)
+        self.browserInfo.setVisible(self.cbSystemBrowser.isChecked()) #keep
+
+        self.btRemove.setIcon(self.getIcon(QtWidgets.QStyle.SP_TrashIcon)) 
+        self.btAdd.setIcon(self.getIcon(QtWidgets.QStyle.SP_DirLinkIcon))
+        self.btSave.setIcon(self.getIcon(QtWidgets.QStyle.SP_DialogApplyButton))
+        self.btCancel.setIcon(self.getIcon(QtWidgets.QStyle.SP_DialogCancelButton))
+        self.btSortProvider.setIcon(self.getIcon(QtWidgets.QStyle.SP_BrowserReload))
+
+        self.btProviderUp.setIcon(self.getIcon(QtWidgets.QStyle.SP_ArrowUp))
+        self.btProviderUp.setText('')
+        self.btProviderDown.setIcon(self.getIcon(QtWidgets.QStyle.SP_ArrowDown))
+        self.btProviderDown.setText('')
+
+    def getIcon(self, qtStyle):
+        return QIcon(QtWidgets.QApplication.style().standardIcon(qtStyle))
@@ -150,7 +150,7 @@ class Ui_ConfigView(object):
         self.tab = QtWidgets.QWidget()
         self.tab.setObjectName("tab")
         self.formLayoutWidget = QtWidgets.QWidget(self.tab)
-        self.formLayoutWidget.setGeometry(QtCore.QRect(9, 9, 521, 201))
+        self.formLayoutWidget.setGeometry(QtCore.QRect(9, 9, 521, 241))
         self.formLayoutWidget.setObjectName("formLayoutWidget")
         self.verticalLayout = QtWidgets.QVBoxLayout(self.formLayoutWidget)
         self.verticalLayout.setContentsMargins(0, 0, 0, 0)
@@ -217,6 +217,17 @@ class Ui_ConfigView(object):
         spacerItem = QtWidgets.QSpacerItem(100, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout_5.addItem(spacerItem)
         self.verticalLayout.addLayout(self.horizontalLayout_5)
+        self.horizontalLayoutCache = QtWidgets.QHBoxLayout()
+        self.horizontalLayoutCache.setObjectName("horizontalLayoutCache")
+        self.lbCacheUsage = QtWidgets.QLabel(self.formLayoutWidget)
+        self.lbCacheUsage.setObjectName("lbCacheUsage")
+        self.horizontalLayoutCache.addWidget(self.lbCacheUsage)
+        self.btClearCache = QtWidgets.QPushButton(self.formLayoutWidget)
+        self.btClearCache.setObjectName("btClearCache")
+        self.horizontalLayoutCache.addWidget(self.btClearCache)
+        spacerCache = QtWidgets.QSpacerItem(100, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayoutCache.addItem(spacerCache)
+        self.verticalLayout.addLayout(self.horizontalLayoutCache)
         self.bottomInfo = QtWidgets.QLabel(self.formLayoutWidget)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
@@ -274,6 +285,8 @@ class Ui_ConfigView(object):
         self.label.setText(_translate("ConfigView", "Initial size:"))
         self.leWidth.setPlaceholderText(_translate("ConfigView", "Width"))
         self.leHeight.setPlaceholderText(_translate("ConfigView", "Height"))
+        self.lbCacheUsage.setText(_translate("ConfigView", "Cache usage:"))
+        self.btClearCache.setText(_translate("ConfigView", "Clear cache"))
         self.bottomInfo.setText(_translate("ConfigView", "It may be necessary to restart Anki to apply the changes"))
         self.tabWidget.setTabText(1, _translate("ConfigView", "Behaviour"))
         self.btSave.setText(_translate("ConfigView", "&Save"))
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Blocks ads and trackers using local block lists
+# Accepts hosts files and EasyList domain rules (||domain.com^)
+# --------------------------------------------------
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from .core import Feedback, CWD
+
+BLOCKLISTS_FOLDER = os.path.join(CWD, 'user_files', 'blocklists')
+CACHE_FILE = os.path.join(CWD, 'user_files', 'blocklists.cache.json')
+
+_HOSTS_ADDRESSES = ('0.0.0.0', '127.0.0.1', '::', '::1')
+_EASYLIST_OPTIONS = ('', 'third-party', '3p')
+
+
+# noinspection PyPep8Naming
+class DomainMatcher:
+    """
+        Set of blocked domains. A host matches if itself or one of its parent domains is in the set
+    """
+
+    def __init__(self, domains=()):
+        self._domains = frozenset(domains)
+
+    def __len__(self):
+        return len(self._domains)
+
+    def domains(self) -> frozenset:
+        return self._domains
+
+    def matches(self, host: str) -> bool:
+        domains = self._domains
+        while host:
+            if host in domains:
+                return True
+            dot = host.find('.')
+            if dot < 0:
+                return False
+            host = host[dot + 1:]
+        return False
+
+
+def parseRules(lines) -> set:
+    """
+        Reads domains from hosts or EasyList formatted lines.
+        EasyList rules other than plain domain ones (paths, exceptions, element hiding) are ignored
+    """
+
+    result = set()
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] in '!#[' or '##' in line or '#@#' in line or '#?#' in line:
+            continue
+
+        if line.startswith('||'):
+            rule, _, options = line[2:].partition('$')
+            if not rule.endswith('^') or options not in _EASYLIST_OPTIONS:
+                continue
+            domain = rule[:-1]
+            if not domain or any(c in domain for c in '/*^|'):
+                continue
+        else:
+            parts = line.split('#', 1)[0].split()
+            if len(parts) == 2 and parts[0] in _HOSTS_ADDRESSES:
+                domain = parts[1]
+            elif len(parts) == 1 and '.' in parts[0] and not any(c in parts[0] for c in '/*^|$@'):
+                domain = parts[0]
+            else:
+                continue
+
+        domain = domain.lower().rstrip('.')
+        if domain and domain not in ('localhost', 'localhost.localdomain'):
+            result.add(domain)
+    return result
+
+
+def compileFolder(folder: str = BLOCKLISTS_FOLDER, cacheFile: str = CACHE_FILE) -> DomainMatcher:
+    """
+        Builds the matcher from every list in folder.
+        The compiled domains are stored on cacheFile and reused while the lists don't change
+    """
+
+    if not os.path.isdir(folder):
+        return DomainMatcher()
+
+    files = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                   if os.path.isfile(os.path.join(folder, f)) and not f.startswith('.'))
+    signature = hashlib.sha1(json.dumps(
+        [(os.path.basename(f), os.path.getsize(f), os.path.getmtime(f)) for f in files]).encode()).hexdigest()
+
+    try:
+        with open(cacheFile) as f:
+            cached = json.load(f)
+        if cached.get('signature') == signature:
+            return DomainMatcher(cached['domains'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    domains = set()
+    for path in files:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            domains.update(parseRules(f))
+
+    try:
+        os.makedirs(os.path.dirname(cacheFile), exist_ok=True)
+        with open(cacheFile, 'w') as f:
+            json.dump({'signature': signature, 'domains': sorted(domains)}, f)
+    except OSError as e:
+        Feedback.log('Block lists cache not saved: {}'.format(e))
+
+    Feedback.log('Block lists compiled: {} domains'.format(len(domains)))
+    return DomainMatcher(domains)
+
+
+# noinspection PyPep8Naming
+class ContentBlocker:
+    """
+        Request rule (see WebRequestInterceptor) blocking requests to listed domains.
+        Keeps blocked counts and estimated bytes saved for each page (first party URL)
+    """
+
+    # Keys are QWebEngineUrlRequestInfo.ResourceType values; sizes are rough averages
+    MAIN_FRAME = 0
+    ESTIMATED_BYTES = {
+        1: 30000,   # sub frame
+        2: 10000,   # stylesheet
+        3: 25000,   # script
+        4: 15000,   # image
+        5: 20000,   # font
+        8: 100000,  # media
+        13: 5000,   # xhr
+    }
+    DEFAULT_BYTES = 2000
+    MAX_PAGES = 200
+
+    def __init__(self, matcher: DomainMatcher):
+        self.matcher = matcher
+        self._stats = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fromFolder(cls, folder: str = BLOCKLISTS_FOLDER):
+        matcher = compileFolder(folder)
+        return cls(matcher) if len(matcher) else None
+
+    def __call__(self, info):
+        resourceType = info.resourceType()
+        if resourceType == self.MAIN_FRAME or not self.matcher.matches(info.requestUrl().host()):
+            return
+
+        info.block(True)
+        self._record(info.firstPartyUrl().toString(), self.ESTIMATED_BYTES.get(resourceType, self.DEFAULT_BYTES))
+
+    def _record(self, page: str, size: int):
+        with self._lock:
+            count, total = self._stats.pop(page, (0, 0))
+            self._stats[page] = (count + 1, total + size)
+            if len(self._stats) > self.MAX_PAGES:
+                self._stats.popitem(last=False)
+
+    def statsFor(self, page: str) -> tuple:
+        """ Returns (blocked requests, estimated bytes saved) for the given page URL """
+
+        with self._lock:
+            return self._stats.get(page, (0, 0))
@@ -7,6 +7,7 @@
 # ------------------------------------------------
 
 import os
+import urllib.parse
 CWD = os.path.dirname(os.path.realpath(__file__))
 
 class Label:
@@ -14,8 +15,28 @@ class Label:
     BROWSER_ASSIGN_TO = 'Assign to field:'
 
 
+class NoSelectionResult:
+    SELECTION_NEEDED = -1
+    NO_RESULT = 0
+    USE_QUERY = 1
+    USE_FIELD = 2
+
+    resultType = None
+    value = None
+
+    def __init__(self, rType, rValue):
+        self.resultType = rType
+        self.value = rValue
+
+
 # --------------------------- Useful function ----------------------------
 
+def formatTargetURL(website: str, query: str = ''):
+    """ Replaces the {} on the provider URL by the query """
+
+    return website.format(urllib.parse.quote(query, encoding='utf8'))
+
+
 class Feedback:
     'Responsible for messages and logs'
 
@@ -8,27 +8,29 @@
 # ---------------------------------- Editor Control -----------------------------------
 # ---------------------------------- ================ ---------------------------------
 
+import html
 import json
-import os
-import re
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import QApplication, QWidget
 from anki.hooks import addHook
 from aqt.editor import Editor
+from aqt.utils import tooltip
 
 from .base_controller import BaseController
 from .config import service as cfg
-from .core import Feedback, CWD
+from .core import Feedback, NoSelectionResult
+from .field_updater import FieldUpdater
+from .icons import icons
 from .key_events import delete, paste, press_alt_s, select_all
-from .no_selection import NoSelectionResult
 
 
 class EditorController(BaseController):
     _editorReference = None
     _lastProvider = None
-    _browser_compatibility = re.compile(r"(Yes).*?\t|(Yes).*?$|(No).*?\t|(No).*?$|(\d+\.?\d?).*?\t|(\d+\.?\d?).*?$")
+    _imageImporter = None
+    PROGRESS_STEP = 25      # % of an image download between progress messages
 
     def __init__(self, ankiMw):
         super(EditorController, self).__init__(ankiMw)
@@ -50,14 +52,16 @@ class EditorController(BaseController):
         Feedback.log('loadNote')
 
         self._editorReference = editor
-        if not self.browser:
+        if self._currentNote == self._editorReference.note:
             return
 
-        if self._currentNote == self._editorReference.note:
+        self._setCurrentNote(self._editorReference.note)
+        if self._imageImporter:     # images for the previous note are not needed anymore
+            self._imageImporter.cancelAll()
+        if not self.browser:    # not built yet; it will start on this note
             return
 
-        self._currentNote = self._editorReference.note
-        # self.browser.clearContext()
+        self.browser.switchContext(self._noteKey(self._currentNote))
         if not cfg.getConfig().keepBrowserOpened:
             self.browser.close()
 
@@ -80,23 +84,23 @@ class EditorController(BaseController):
         select_all()
 
     def setupEditorButtons(self, buttons, editor):
-        buttons.insert(0, editor.addButton(os.path.join(CWD, 'assets', 'delete.png'),
+        buttons.insert(0, editor.addButton(icons.path('delete'),
                                            "delete F3",
                                            self._delete,
                                            tip="delete F3",
                                            keys=QKeySequence(Qt.Key_F3),
                                            ))
-        buttons.insert(0, editor.addButton(os.path.join(CWD, 'assets', 'select-all.png'),
+        buttons.insert(0, editor.addButton(icons.path('select-all'),
                                            "select all F2",
                                            self._select_all,
                                            tip="select all F2",
                                            keys=QKeySequence(Qt.Key_F2),
                                            ))
-        buttons.insert(0, editor.addButton(os.path.join(CWD, 'assets', 'reconnect.png'),
+        buttons.insert(0, editor.addButton(icons.path('reconnect'),
                                            "reconnect",
                                            self.newLoadNote,
                                            tip="reconnect web browser to this note"))
-        buttons.insert(0, editor.addButton(os.path.join(CWD, 'assets', 'www.png'),
+        buttons.insert(0, editor.addButton(icons.path('www'),
                                            "search web",
                                            self._callRepeatProviderOrShowMenu,
                                            tip="search web"))
@@ -131,7 +135,9 @@ class EditorController(BaseController):
     def createEditorMenu(self, parent, menuFn):
         """ Deletegate the menu creation and work related to providers """
 
-        return self._providerSelection.showCustomMenu(parent, menuFn)
+        if self._editorReference:
+            self._preloadPrediction(self._editorReference.web, self._editorReference.note)
+        return self._providerSelection.showCustomMenu(parent, menuFn, self._onProviderMenuClosed)
 
     def handleProviderSelection(self, result):
         if not self._editorReference:
@@ -139,6 +145,7 @@ class EditorController(BaseController):
                 'Illegal state found. It was not possible to recover the reference to Anki editor')
         webview = self._editorReference.web
         query = self._getQueryValue(webview)
+        self._registerProviderChoice(result, self._editorReference.note)
         self._lastProvider = result
         if not query:
             return
@@ -210,57 +217,110 @@ class EditorController(BaseController):
 
     def handleUrlSelection(self, fieldIndex, value):
         """
-        Imports an image from the link 'value' to the collection. 
-        Adds this new img tag to the given field in the current note"""
+        Imports an image from the link 'value' to the collection, in background.
+        Adds this new img tag to the given field in the current note, once downloaded"""
 
         url = value.toString() if value else ''
         Feedback.log("Selected from browser: {} || ".format(url))
+        if not url.startswith(('http://', 'https://', 'file://', 'data:')):
+            Feedback.showWarn('URL invalid! Only links to images are supported (ex: http://images.com/any.jpg)')
+            return
 
-        imgReference = self._editorReference.urlToLink(url)
-
-        if (not imgReference) or not imgReference.startswith('<img'):
-            Feedback.showWarn(
-                'URL invalid! Only URLs with references to image files are supported (ex: http://images.com/any.jpg, any.png)')
+        self._getImageImporter().download(url, (self._currentNote, fieldIndex))
+        tooltip('Downloading image...')
+
+    def _getImageImporter(self):
+        """ Built (and its module imported) on the first image, not while Anki starts """
+
+        from .image_import import ImageImporter
+
+        config = cfg.getConfig()
+        mediaDir = self._ankiMw.col.media.dir()
+        if not self._imageImporter or self._imageImporter.mediaDir != mediaDir:     # e.g. another profile
+            if self._imageImporter:
+                self._imageImporter.shutdown()
+            self._imageImporter = ImageImporter(mediaDir)
+            self._imageImporter.progress.connect(self._onImageProgress)
+            self._imageImporter.finished.connect(self._onImageImported)
+            self._imageImporter.failed.connect(self._onImageFailed)
+        self._imageImporter.maxDimension = config.imageMaxDimension
+        self._imageImporter.quality = config.imageJpegQuality
+        return self._imageImporter
+
+    def _onImageProgress(self, job, received: int, total: int):
+        if not total:
+            return
+        step = received * 100 // total // self.PROGRESS_STEP
+        if step > getattr(job, 'shownStep', 0):
+            job.shownStep = step
+            tooltip('Downloading image... {}%'.format(min(100, step * self.PROGRESS_STEP)))
+
+    def _onImageImported(self, job, fileName: str):
+        note, fieldIndex = job.context
+        if not self._editorReference or self._editorReference.note is not note:
+            Feedback.log('Image for another note, not added: {}'.format(fileName))
             return
 
+        if job.data is not None:
+            fileName = self._ankiMw.col.media.writeData(fileName, job.data)
+        imgReference = '<img src="{}">'.format(html.escape(fileName))
         Feedback.log('handleUrlSelection.imgReference: ' + imgReference)
 
         self._editorReference.web.eval("focusField(%d);" % fieldIndex)
         self._editorReference.web.eval(
             "setFormat('inserthtml', %s);" % json.dumps(imgReference))
 
+    def _onImageFailed(self, job, message: str):
+        Feedback.showWarn('It was not possible to import the image ({}):\n{}'.format(message, job.url))
+
+    def _importTable(self, fields: FieldUpdater, fieldIndex: int, selection, replace: bool):
+        """
+            Cells of a table read from the page (table_import.TABLE_JS), or support values on a selected text,
+            set on their fields
+        """
+
+        from .table_import import mapTable, mapText, fieldChanges
+
+        fieldNames = {ind: fld['name'] for ind, fld in enumerate(self._currentNote.model()['flds'])}
+        if isinstance(selection, dict):
+            values = mapTable(selection, fieldIndex, fieldNames, cfg.getConfig().tableColumnMapping)
+            Feedback.log('Table import: {} rows, {} fields'.format(len(selection.get('rows') or []), len(values)))
+        else:
+            values = mapText(selection, fieldIndex, fieldNames)
+        for index, value in fieldChanges(values, self._currentNote.fields, replace).items():
+            fields.set(index, value)
+
     def handleTextSelection(self, fieldIndex, value, replace, copy_paste, format_syntax, css, script,
                             browser_compatibility):
+        """ The fields changed are updated on the editor together, after the whole selection is handled """
+
         def paste_(not_needed):
             if copy_paste:
                 paste()
             else:
                 press_alt_s()
 
+        fields = FieldUpdater(self._editorReference)
         if copy_paste or format_syntax:
             if replace:
-                self._currentNote.fields[fieldIndex] = ''
-                self._editorReference.setNote(self._currentNote)
-            self._editorReference.parentWindow.activateWindow()
-            self._editorReference.web.evalWithCallback("focusField(%d);" % fieldIndex, paste_)
+                fields.set(fieldIndex, '')
+
+            def focusAndPaste():
+                self._editorReference.parentWindow.activateWindow()
+                self._editorReference.web.evalWithCallback("focusField(%d);" % fieldIndex, paste_)
+            fields.commit(focusAndPaste)
         elif browser_compatibility:
-            clipboard = QApplication.clipboard()
-            clip_text = clipboard.text()
-            matches = self._browser_compatibility.findall(clip_text)
-            for index, group in enumerate(matches):
-                for match in group:
-                    if match and match.lower() != 'no':
-                        new_value = match if replace else self._currentNote.fields[fieldIndex] + ' ' + match
-                        self._currentNote.fields[fieldIndex + index] = new_value.strip()
-                        self._editorReference.setNote(self._currentNote)
-                        break
+            self._importTable(fields, fieldIndex, value, replace)
+            fields.commit()
         else:
             if css:
                 value = f'<style>{value}</style>'
             elif script:
                 value = f'<script>{value}</script>'
             new_value = value if replace else self._currentNote.fields[fieldIndex] + ' ' + value
-            self._currentNote.fields[fieldIndex] = new_value.strip()
-            self._editorReference.setNote(self._currentNote)
-            self._editorReference.web.eval("focusField(%d);" % fieldIndex)
-            self._editorReference.parentWindow.activateWindow()
+            fields.set(fieldIndex, new_value.strip())
+
+            def focus():
+                self._editorReference.web.eval("focusField(%d);" % fieldIndex)
+                self._editorReference.parentWindow.activateWindow()
+            fields.commit(focus)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Pool of web engines built ahead of time
+# Opening a tab takes a ready view instead of building one
+# --------------------------------------------------
+
+from PyQt5.QtCore import QTimer
+
+from .core import Feedback
+
+
+# noinspection PyPep8Naming
+class AwWebEnginePool:
+    """
+        Keeps hidden, already wired web engines.
+        Views are taken by acquire(); the pool is refilled on idle time, one view per pass
+    """
+
+    MAX_SIZE = 6
+    REFILL_DELAY_MS = 150
+
+    def __init__(self, factory, size: int = 2):
+        self._factory = factory
+        self._views = []
+        self._refillScheduled = False
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.resize(size)
+
+    def acquire(self):
+        """ Returns a ready view, or builds one right away if the pool is empty """
+
+        if self._views:
+            self.hits += 1
+            view = self._views.pop()
+        else:
+            self.misses += 1
+            view = self._factory()
+
+        Feedback.log('EnginePool acquire: {}'.format(self.stats()))
+        self.scheduleRefill()
+        return view
+
+    def resize(self, size: int):
+        self.size = max(0, min(int(size), self.MAX_SIZE))
+        while len(self._views) > self.size:
+            self._views.pop().deleteLater()
+
+    def scheduleRefill(self):
+        if self._refillScheduled or len(self._views) >= self.size:
+            return
+        self._refillScheduled = True
+        QTimer.singleShot(self.REFILL_DELAY_MS, self._refillOne)
+
+    def _refillOne(self):
+        self._refillScheduled = False
+        if len(self._views) >= self.size:
+            return
+        self._views.append(self._factory())
+        self.scheduleRefill()
+
+    def available(self) -> int:
+        return len(self._views)
+
+    def clear(self):
+        for view in self._views:
+            view.deleteLater()
+        self._views = []
+
+    def stats(self) -> dict:
+        return {
+            'size': self.size,
+            'available': len(self._views),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -5,31 +5,132 @@
 
 import sys
 import os
+import queue
+import reprlib
+import threading
+import time
 import traceback
 from .core import Feedback
 
 CWD = os.path.dirname(os.path.realpath(__file__))
 RAISE_EXCEPTION = False     # Util on tests
 CONFIG_FILE = '/awb-exception.log'
+MAX_LOCAL_LENGTH = 300      # characters kept of each local variable on the report
+
+_localRepr = reprlib.Repr()
+_localRepr.maxstring = _localRepr.maxother = MAX_LOCAL_LENGTH
+
+
+# noinspection PyPep8Naming
+class ExceptionLogWriter:
+    """
+        Writes the exception reports on a background thread, so a slow disk doesn't stall the UI.
+        At most queueSize reports wait to be written; the others are dropped.
+        The file is rotated when it would go over maxBytes (keeping backups old files: .1, .2...).
+        The same traceback is written once per repeatInterval seconds; the next report tells how many were skipped
+    """
+
+    MAX_BYTES = 512 * 1024
+    BACKUPS = 2
+    QUEUE_SIZE = 50
+    REPEAT_INTERVAL = 60
+    MAX_KNOWN = 200     # tracebacks remembered for the repeat check
+
+    def __init__(self, path: str, maxBytes=MAX_BYTES, backups=BACKUPS, queueSize=QUEUE_SIZE,
+                 repeatInterval=REPEAT_INTERVAL, clock=time.monotonic):
+        self.path = path
+        self.maxBytes = maxBytes
+        self.backups = backups
+        self.repeatInterval = repeatInterval
+        self.dropped = 0
+        self._clock = clock
+        self._queue = queue.Queue(queueSize)
+        self._known = {}        # traceback key: (last written, repeats skipped since)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, report: str, key) -> bool:
+        """ Queues report to be written, unless key (e.g. the traceback frames) was written recently """
+
+        now = self._clock()
+        last, skipped = self._known.get(key, (None, 0))
+        if last is not None and now - last < self.repeatInterval:
+            self._known[key] = (last, skipped + 1)
+            return False
+
+        if skipped:
+            report = '(Same error {} more times in the last {:.0f}s)\n{}'.format(skipped, now - last, report)
+        if len(self._known) >= self.MAX_KNOWN:
+            self._known.clear()
+        self._known[key] = (now, 0)
+
+        try:
+            self._queue.put_nowait(report)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self._ensureThread()
+        return True
+
+    def _ensureThread(self):
+        with self._lock:
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name='awb-exception-log', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            report = self._queue.get()
+            try:
+                self._write(report)
+            except OSError:
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _write(self, report: str):
+        data = report.encode('utf-8', 'replace')
+        if os.path.isfile(self.path) and os.path.getsize(self.path) + len(data) > self.maxBytes:
+            self._rotate()
+        with open(self.path, 'ab') as f:
+            f.write(data)
+
+    def _rotate(self):
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = '{}.{}'.format(self.path, index)
+            if os.path.isfile(older):
+                os.replace(older, '{}.{}'.format(self.path, index + 1))
+        os.replace(self.path, self.path + '.1')
+
+    def flush(self):
+        """ Waits until the queued reports are written """
+
+        self._queue.join()
+
+
+logWriter = ExceptionLogWriter(CWD + CONFIG_FILE)
+
+
+def tracebackKey(exc_type, exc_tb) -> tuple:
+    """ Identifies a failure by its type and the lines it went through, regardless of the values involved """
+
+    return (exc_type, tuple((frame.filename, frame.lineno) for frame in traceback.extract_tb(exc_tb)))
+
 
 def exceptionHandler(fn):
     def handler(*args, **kargs):
         try:
             return fn(*args, **kargs)
         except Exception as e:
-            exc_type, exc_value, _ = sys.exc_info()
+            exc_type, exc_value, exc_tb = sys.exc_info()
             Feedback.log(exc_value)
             infoCode = tryGettingInfo()
 
-            fileInfo = ''
-            try:
-                f = open(CWD + CONFIG_FILE, 'a+')
-                f.write(traceback.format_exc())
-                f.write('\n\n' + infoCode + '\n')
-                f.close()
-                fileInfo = '\nReport stores on ' + CWD + CONFIG_FILE
-            except:
-                pass
+            logWriter.submit(traceback.format_exc() + '\n\n' + infoCode + '\n', tracebackKey(exc_type, exc_tb))
+            fileInfo = '\nReport stored on ' + logWriter.path
 
             Feedback.showWarn("Unexpected event: it wasn't possible to complete the operation." + fileInfo)
 
@@ -63,11 +164,16 @@ def cleanVargs(input):
     return False if key == 'self' or (key.startswith('__')) else True
 
 def mapParameters(input):
+    """ The value of a local variable, cut on MAX_LOCAL_LENGTH (fields and clipboard contents may be long) """
+
     try:
         if not (input and input[1]):
             return ''
         if not isinstance(input[1], str):
-            return '' if callable(input[1]) else str(input[1])
-        return input[1]
+            return '' if callable(input[1]) else _localRepr.repr(input[1])
+        value = input[1]
+        if len(value) > MAX_LOCAL_LENGTH:
+            return '{}...({} chars)'.format(value[:MAX_LOCAL_LENGTH], len(value))
+        return value
     except:
         return ''
\ No newline at end of file
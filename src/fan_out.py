@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# One query opened at once on every provider of a group
+# --------------------------------------------------
+
+from .load_scheduler import LoadScheduler
+
+
+# noinspection PyPep8Naming
+class FanOut:
+    """
+        Tabs (one per provider of a group) loaded through a LoadScheduler, at most maxConcurrent at a time.
+        start(tab) begins loading a tab; the browser reports its progress and its end.
+        Keeps the combined progress and which tab finished first
+    """
+
+    def __init__(self, tabs: list, start, maxConcurrent: int = 3, defer=None):
+        self.tabs = list(tabs)
+        self.first = None
+        self._progress = {id(tab): 0 for tab in self.tabs}
+        self._scheduler = LoadScheduler(start, maxConcurrent, hostInterval=0, defer=defer)
+
+    def begin(self):
+        for tab in self.tabs:
+            self._scheduler.submit(tab)
+
+    def __contains__(self, tab) -> bool:
+        return id(tab) in self._progress
+
+    def progress(self, tab, value: int):
+        if tab in self and self._progress[id(tab)] < 100:
+            self._progress[id(tab)] = value
+
+    def finished(self, tab, ok: bool) -> bool:
+        """ Registers the end of a tab load. Returns True when it's the first tab loaded successfully """
+
+        if tab not in self or self._progress[id(tab)] >= 100:
+            return False
+        self._progress[id(tab)] = 100
+        self._scheduler.finish(tab, ok)
+        if ok and self.first is None:
+            self.first = tab
+            return True
+        return False
+
+    def remove(self, tab):
+        """ The tab was closed: it's not loaded (if waiting) and no longer counted """
+
+        if tab not in self:
+            return
+        if not self._scheduler.drop(tab):
+            self._scheduler.finish(tab, False)
+        del self._progress[id(tab)]
+        self.tabs = [t for t in self.tabs if t is not tab]
+
+    def cancel(self) -> list:
+        """ Stops starting tabs. Returns the ones still loading """
+
+        return self._scheduler.cancel()
+
+    def combinedProgress(self) -> int:
+        if not self._progress:
+            return 100
+        return sum(self._progress.values()) // len(self._progress)
+
+    def isDone(self) -> bool:
+        return self._scheduler.isIdle()
+
+    def stats(self) -> dict:
+        return self._scheduler.stats()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Changes fields of the note on Anki's editor without reloading the whole note
+# --------------------------------------------------
+
+import json
+
+from .core import Feedback
+
+# Sets the HTML of the given fields ({ord: html}) on the editor page. Returns false, changing nothing,
+# when some field is not found (editors which don't keep a #f<ord> element per field)
+UPDATE_FIELDS_JS = """
+(function (fields) {
+    var elements = {}, ord;
+    for (ord in fields) {
+        elements[ord] = document.getElementById('f' + ord);
+        if (!elements[ord]) {
+            return false;
+        }
+    }
+    for (ord in fields) {
+        elements[ord].innerHTML = fields[ord];
+    }
+    return true;
+})(%s)
+"""
+
+
+# noinspection PyPep8Naming
+class FieldUpdater:
+    """
+        Collects the field changes of one action and applies them with commit(): the note is changed at once,
+        and the editor page with a single script. When the page can't be changed that way,
+        the editor reloads the note (setNote), once
+    """
+
+    def __init__(self, editor):
+        self._editor = editor
+        self._changed = {}
+
+    @property
+    def note(self):
+        return self._editor.note
+
+    def set(self, index: int, value: str):
+        self.note.fields[index] = value
+        self._changed[index] = value
+
+    def commit(self, then=None):
+        """ Sends the changes to the editor. then() is called after they are shown """
+
+        changed, self._changed = self._changed, {}
+        if not changed:
+            if then:
+                then()
+            return
+
+        script = UPDATE_FIELDS_JS % json.dumps({str(index): value for index, value in changed.items()})
+        self._editor.web.evalWithCallback(script, lambda updated: self._onApplied(updated, then))
+
+    def _onApplied(self, updated, then):
+        if not updated:
+            Feedback.log('Fields not found on the editor page, reloading the note')
+            self._editor.setNote(self._editor.note)
+        if then:
+            then()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Shared registry of the add-on icons
+# Each icon is decoded once. They come from the assets pack built by build.py,
+# or from the assets folder when running from the sources
+# --------------------------------------------------
+
+import os
+
+from PyQt5.QtGui import QIcon, QPixmap
+
+from .asset_pack import readPack
+from .core import CWD, Feedback
+
+ASSETS_FOLDER = os.path.join(CWD, 'assets')
+PACK_FILE = os.path.join(CWD, 'assets.pack')
+
+
+# noinspection PyPep8Naming
+class IconRegistry:
+    """
+        Icons by name (file name on the assets folder, without ".png").
+        Names used through icon(), pixmap() and toggleIcon() are packed by build.py;
+        names used through path() are kept as files, for the Anki editor buttons which need one
+    """
+
+    def __init__(self, packFile: str = PACK_FILE, folder: str = ASSETS_FOLDER):
+        self._packFile = packFile
+        self._folder = folder
+        self._packed = None
+        self._pixmaps = {}
+        self._icons = {}
+
+    def _data(self, name: str) -> bytes:
+        if self._packed is None:
+            self._packed = readPack(self._packFile) if os.path.isfile(self._packFile) else {}
+            Feedback.log('IconRegistry: {} packed icons'.format(len(self._packed)))
+
+        data = self._packed.get(name)
+        if data is None:
+            with open(self.path(name), 'rb') as f:
+                data = f.read()
+        return data
+
+    def pixmap(self, name: str) -> QPixmap:
+        if name not in self._pixmaps:
+            pixmap = QPixmap()
+            if not pixmap.loadFromData(self._data(name)):
+                Feedback.log('Icon not decoded: {}'.format(name))
+            self._pixmaps[name] = pixmap
+        return self._pixmaps[name]
+
+    def icon(self, name: str) -> QIcon:
+        if name not in self._icons:
+            self._icons[name] = QIcon(self.pixmap(name))
+        return self._icons[name]
+
+    def toggleIcon(self, offName: str, onName: str) -> QIcon:
+        """ Icon for checkable actions: offName when unchecked, onName when checked """
+
+        key = (offName, onName)
+        if key not in self._icons:
+            icon = QIcon()
+            icon.addPixmap(self.pixmap(offName), QIcon.Normal, QIcon.Off)
+            icon.addPixmap(self.pixmap(onName), QIcon.Normal, QIcon.On)
+            self._icons[key] = icon
+        return self._icons[key]
+
+    def path(self, name: str) -> str:
+        return os.path.join(self._folder, name + '.png')
+
+    def clear(self):
+        self._packed = None
+        self._pixmaps = {}
+        self._icons = {}
+
+
+icons = IconRegistry()
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Downloads images chosen on the browser for Anki's media folder, on background threads.
+# Images already on the folder (same content) are reused; very large ones are scaled down
+# --------------------------------------------------
+
+import hashlib
+import os
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal, Qt, QBuffer, QByteArray, QIODevice
+from PyQt5.QtGui import QImage
+
+from .core import Feedback
+
+USER_AGENT = 'Mozilla/5.0 (anki-web-browser)'
+
+_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'BM', 'bmp'),
+)
+
+
+def imageType(data: bytes) -> str:
+    """ The file extension for the image in data, from its first bytes. None when it's not an image """
+
+    for signature, ext in _SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    head = data[:512].lstrip().lower()
+    if head.startswith(b'<svg') or (head.startswith(b'<?xml') and b'<svg' in head):
+        return 'svg'
+    return None
+
+
+def shrink(data: bytes, ext: str, maxDimension: int, quality: int) -> tuple:
+    """
+        (data, ext) of the image scaled down to maxDimension pixels on its longest side, and compressed again:
+        JPEG, or PNG when it has transparency. The original is kept when it's small enough,
+        can't be decoded, is animated (GIF) or vector (SVG), or when the result would be bigger
+    """
+
+    if maxDimension <= 0 or ext in ('gif', 'svg'):
+        return data, ext
+    image = QImage.fromData(data)
+    if image.isNull() or max(image.width(), image.height()) <= maxDimension:
+        return data, ext
+
+    image = image.scaled(maxDimension, maxDimension, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    newExt = 'png' if image.hasAlphaChannel() else 'jpg'
+    array = QByteArray()
+    buffer = QBuffer(array)
+    buffer.open(QIODevice.WriteOnly)
+    if not image.save(buffer, 'PNG' if newExt == 'png' else 'JPEG', -1 if newExt == 'png' else quality):
+        return data, ext
+    result = bytes(array)
+    return (result, newExt) if len(result) < len(data) else (data, ext)
+
+
+# noinspection PyPep8Naming
+class MediaIndex:
+    """
+        Finds a file on the media folder with some content. The file named by the content hash is tried first,
+        then the files of the same size are hashed (sha1). The size of each file is read once: when the folder
+        changes, only the files added since are looked at. Hashes are kept while a file doesn't change.
+        Safe to use from several threads
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._sizes = {}        # name: size
+        self._bySize = {}       # size: {names}
+        self._folderMtime = None
+        self._hashes = {}       # name: (size, mtime, sha1)
+        self._lock = threading.Lock()
+
+    def find(self, data: bytes, digest: str, ext: str) -> str:
+        size = len(data)
+        named = '{}.{}'.format(digest, ext)
+        if self._hashOf(named, size) == digest:
+            return named
+        for name in self._namesOfSize(size):
+            if name != named and self._hashOf(name, size) == digest:
+                return name
+        return None
+
+    def _namesOfSize(self, size: int) -> list:
+        with self._lock:
+            self._refresh()
+            return sorted(self._bySize.get(size, ()))
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.folder).st_mtime_ns
+            if mtime == self._folderMtime:
+                return
+            names = {entry.name for entry in os.scandir(self.folder) if entry.is_file()}
+        except OSError:
+            return
+        self._folderMtime = mtime
+
+        for name in set(self._sizes) - names:
+            self._bySize[self._sizes.pop(name)].discard(name)
+            self._hashes.pop(name, None)
+        for name in names - set(self._sizes):
+            try:
+                size = os.stat(os.path.join(self.folder, name)).st_size
+            except OSError:
+                continue
+            self._sizes[name] = size
+            self._bySize.setdefault(size, set()).add(name)
+
+    def _hashOf(self, name: str, size: int) -> str:
+        """ sha1 of the file name, if it has size bytes. None when it doesn't exist or has another size """
+
+        path = os.path.join(self.folder, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != size:
+            return None
+        cached = self._hashes.get(name)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime):
+            return cached[2]
+        try:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+        self._hashes[name] = (stat.st_size, stat.st_mtime, digest)
+        return digest
+
+
+# noinspection PyPep8Naming
+class ImageJob:
+    """
+        One image being imported. context is kept for the caller (e.g. the note and field it's for).
+        Once imported, data has the content to add to the media folder (None when it's already there)
+    """
+
+    def __init__(self, url: str, context=None):
+        self.url = url
+        self.context = context
+        self.data = None
+        self.received = 0
+        self.total = 0
+        self._cancelled = threading.Event()
+        self.future = None
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.future:
+            self.future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+# noinspection PyPep8Naming
+class ImageImporter(QObject):
+    """
+        Downloads images on a thread pool, named by their content hash, or by the file on mediaDir with
+        the same content. Nothing is written here: the caller adds job.data to the collection's media when
+        it uses the image. Signals are delivered on the thread the importer lives in (the GUI):
+        progress(job, received, total) while downloading (total 0 when unknown),
+        finished(job, file name) and failed(job, message). Cancelled jobs emit nothing
+    """
+
+    progress = pyqtSignal(object, int, int)
+    finished = pyqtSignal(object, str)
+    failed = pyqtSignal(object, str)
+
+    MAX_WORKERS = 3
+    CHUNK_SIZE = 64 * 1024
+    MAX_BYTES = 30 * 1024 * 1024
+    TIMEOUT = 30
+
+    def __init__(self, mediaDir: str, maxDimension: int = 0, quality: int = 85, opener=None, parent=None):
+        super().__init__(parent)
+        self.mediaDir = mediaDir
+        self.maxDimension = maxDimension
+        self.quality = quality
+        self._opener = opener or (lambda request: urllib.request.urlopen(request, timeout=self.TIMEOUT))
+        self._index = MediaIndex(mediaDir)
+        self._executor = ThreadPoolExecutor(self.MAX_WORKERS, thread_name_prefix='awb-image')
+        self._jobs = set()
+
+    def download(self, url: str, context=None) -> ImageJob:
+        job = ImageJob(url, context)
+        self._jobs.add(job)
+        job.future = self._executor.submit(self._run, job)
+        job.future.add_done_callback(lambda future: self._jobs.discard(job))
+        return job
+
+    def cancelAll(self):
+        for job in list(self._jobs):
+            job.cancel()
+
+    def shutdown(self):
+        self.cancelAll()
+        self._executor.shutdown(wait=False)
+
+    def _run(self, job: ImageJob):
+        try:
+            name = self.importImage(job)
+        except Exception as e:
+            if not job.cancelled:
+                Feedback.log('Image not imported: {} ({})'.format(job.url, e))
+                self.failed.emit(job, str(e))
+            return
+        if name and not job.cancelled:
+            self.finished.emit(job, name)
+
+    def importImage(self, job: ImageJob) -> str:
+        """
+            Downloads, checks and shrinks the image. Returns its name on mediaDir (None if cancelled),
+            leaving on job.data the content to write, unless the file is already there
+        """
+
+        data = self._fetch(job)
+        if data is None:
+            return None
+        ext = imageType(data)
+        if not ext:
+            raise ValueError('not an image')
+
+        data, ext = shrink(data, ext, self.maxDimension, self.quality)
+        digest = hashlib.sha1(data).hexdigest()
+        existing = self._index.find(data, digest, ext)
+        if existing:
+            Feedback.log('Image already on the media folder: {}'.format(existing))
+            return existing
+        if job.cancelled:
+            return None
+        job.data = data
+        return '{}.{}'.format(digest, ext)
+
+    def _fetch(self, job: ImageJob) -> bytes:
+        request = urllib.request.Request(job.url, headers={'User-Agent': USER_AGENT})
+        chunks = []
+        with self._opener(request) as response:
+            job.total = int(response.headers.get('Content-Length') or 0)
+            while True:
+                if job.cancelled:
+                    return None
+                chunk = response.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                job.received += len(chunk)
+                if job.received > self.MAX_BYTES:
+                    raise ValueError('image over {} MB'.format(self.MAX_BYTES // (1024 * 1024)))
+                self.progress.emit(job, job.received, job.total)
+        return b''.join(chunks)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Small data kept by the add-on as JSON files on user_files (provider usage, provider stats...).
+# A missing or invalid file is read as empty; errors are only logged.
+# Data changed often is written a while after it changes, many changes at once
+# --------------------------------------------------
+
+import json
+import os
+
+from .core import Feedback
+
+
+def loadJson(path: str, description: str, convert=dict):
+    """ convert(the content of path), or None when there is no path, no file or it's not valid """
+
+    if not (path and os.path.isfile(path)):
+        return None
+    try:
+        with open(path) as f:
+            return convert(json.load(f))
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        Feedback.log('{} not read: {}'.format(description, e))
+        return None
+
+
+def saveJson(path: str, data, description: str):
+    """ Writes data on path, creating its folder. Nothing is done without a path """
+
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+    except OSError as e:
+        Feedback.log('{} not saved: {}'.format(description, e))
+
+
+# noinspection PyPep8Naming
+class DelayedSave:
+    """
+        Calls save delayMs after the first change not saved yet, so data changed on every page load is written
+        once for many changes. flush() saves the pending changes right away (e.g. when the profile is closed)
+    """
+
+    DELAY_MS = 10000
+
+    def __init__(self, save, delayMs: int = DELAY_MS):
+        self._save = save
+        self.delayMs = delayMs
+        self.pending = False
+
+    def changed(self):
+        if self.pending:
+            return
+        self.pending = True
+        from PyQt5.QtCore import QTimer
+        QTimer.singleShot(self.delayMs, self.flush)
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.pending = False
+        self._save()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Stand-in for objects that are expensive to build,
+# built on first use or when the application is idle
+# --------------------------------------------------
+
+import time
+
+from .core import Feedback
+
+
+# noinspection PyPep8Naming
+class LazyObject:
+    """
+        Builds the real object through factory on the first attribute access, and then forwards to it.
+        Evaluates to False while not built, so "if not obj: return" guards skip work on an object never used.
+        onBuild(name, milliseconds) is called once the object exists
+    """
+
+    def __init__(self, factory, name: str = None, onBuild=None):
+        self.__dict__['_factory'] = factory
+        self.__dict__['_name'] = name or getattr(factory, '__name__', 'object')
+        self.__dict__['_onBuild'] = onBuild
+        self.__dict__['_instance'] = None
+
+    def instance(self):
+        if self._instance is None:
+            start = time.perf_counter()
+            self.__dict__['_instance'] = self._factory()
+            elapsed = (time.perf_counter() - start) * 1000
+            Feedback.log('{} built in {:.1f} ms'.format(self._name, elapsed))
+            if self._onBuild:
+                self._onBuild(self._name, elapsed)
+        return self._instance
+
+    def isBuilt(self) -> bool:
+        return self._instance is not None
+
+    def buildWhenIdle(self, delayMs: int = 0):
+        """ Builds the object once the event loop is free, after delayMs """
+
+        from PyQt5.QtCore import QTimer
+        QTimer.singleShot(delayMs, self.instance)
+
+    def __bool__(self):
+        return self.isBuilt()
+
+    def __getattr__(self, name):
+        return getattr(self.instance(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.instance(), name, value)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Placeholder for tabs whose page is not loaded (yet or anymore),
+# replaced by a real web engine when the tab is shown
+# --------------------------------------------------
+
+from PyQt5.QtCore import QUrl, Qt
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout
+
+
+# noinspection PyPep8Naming
+class LazyTab(QWidget):
+    """
+        Keeps only the URL and the title of a page, and a thumbnail if it was discarded.
+        Answers the few calls the browser makes on any tab
+    """
+
+    isPlaceholder = True
+    isLoading = False
+    lookupKey = None
+
+    def __init__(self, url: QUrl, title: str, parent=None, thumbnail: QPixmap = None, lookupKey=None):
+        super().__init__(parent)
+        self._url = url
+        self._title = title
+        self.lookupKey = lookupKey
+
+        layout = QVBoxLayout(self)
+        label = QLabel(self)
+        label.setAlignment(Qt.AlignCenter)
+        if thumbnail is not None and not thumbnail.isNull():
+            label.setPixmap(thumbnail)
+        else:
+            label.setText(url.toString())
+        layout.addWidget(label)
+
+    def url(self) -> QUrl:
+        return self._url
+
+    def title(self) -> str:
+        return self._title
+
+    def stop(self):
+        pass
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Starts page loads with a bound on how many run at once
+# and on how often the same host is hit
+# --------------------------------------------------
+
+import time
+from collections import deque
+
+from PyQt5.QtCore import QTimer
+
+
+# noinspection PyPep8Naming
+class LoadScheduler:
+    """
+        Queue of jobs given to start(job) in submission order, keeping at most maxConcurrent running
+        and at least hostInterval seconds between two starts on the same host.
+        Jobs for a host that must wait don't hold the ones for other hosts.
+        The caller reports the end of each job through finish()
+    """
+
+    def __init__(self, start, maxConcurrent: int = 3, hostInterval: float = 1.0,
+                 clock=time.monotonic, defer=None):
+        self._start = start
+        self.maxConcurrent = max(1, maxConcurrent)
+        self.hostInterval = max(0.0, hostInterval)
+        self._clock = clock
+        self._defer = defer or (lambda delayMs, fn: QTimer.singleShot(delayMs, fn))
+        self._pending = deque()
+        self._running = []
+        self._lastStart = {}
+        self._wakeScheduled = False
+        self._firstStart = None
+        self.cancelled = False
+        self.done = 0
+        self.failed = 0
+
+    def submit(self, job, host: str = ''):
+        if self.cancelled:
+            return
+        self._pending.append((job, host))
+        self.pump()
+
+    def finish(self, job, ok: bool = True):
+        for i, (running, _) in enumerate(self._running):
+            if running == job:
+                del self._running[i]
+                break
+        else:
+            return
+
+        if ok:
+            self.done += 1
+        else:
+            self.failed += 1
+        self.pump()
+
+    def drop(self, job) -> bool:
+        """ Removes a job not started yet (e.g. its tab was closed). Returns whether it was pending """
+
+        for i, (pending, _) in enumerate(self._pending):
+            if pending == job:
+                del self._pending[i]
+                return True
+        return False
+
+    def cancel(self) -> list:
+        """ Drops the jobs not started yet. Returns the running ones, which the caller should stop """
+
+        self.cancelled = True
+        self._pending.clear()
+        running = [job for job, _ in self._running]
+        self._running = []
+        return running
+
+    def pump(self):
+        if self.cancelled:
+            return
+
+        now = self._clock()
+        waitFor = None
+        index = 0
+        while index < len(self._pending) and len(self._running) < self.maxConcurrent:
+            job, host = self._pending[index]
+            remaining = self._lastStart.get(host, now - self.hostInterval) + self.hostInterval - now
+            if host and remaining > 0:
+                waitFor = remaining if waitFor is None else min(waitFor, remaining)
+                index += 1
+                continue
+
+            del self._pending[index]
+            self._running.append((job, host))
+            self._lastStart[host] = now
+            if self._firstStart is None:
+                self._firstStart = now
+            self._start(job)
+
+        if waitFor is not None and not self._wakeScheduled:
+            self._wakeScheduled = True
+            self._defer(int(waitFor * 1000) + 1, self._wake)
+
+    def _wake(self):
+        self._wakeScheduled = False
+        self.pump()
+
+    def isIdle(self) -> bool:
+        return not self._pending and not self._running
+
+    def stats(self) -> dict:
+        elapsed = (self._clock() - self._firstStart) if self._firstStart is not None else 0
+        finished = self.done + self.failed
+        return {
+            'pending': len(self._pending),
+            'running': len(self._running),
+            'done': self.done,
+            'failed': self.failed,
+            'perMinute': (finished * 60.0 / elapsed) if elapsed > 0 else 0.0
+        }
@@ -4,7 +4,7 @@
 # Decorates View, making changes without affect generated file.
 # ---------------------------------------
 from .no_selection_view import Ui_Dialog
-from .core import Feedback
+from .core import Feedback, NoSelectionResult
 
 import os
 import json
@@ -14,20 +14,6 @@ from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtWidgets import QDialog, QMessageBox, QAction
 from PyQt5.Qt import QIcon
 
-class NoSelectionResult:
-    SELECTION_NEEDED = -1
-    NO_RESULT = 0
-    USE_QUERY = 1
-    USE_FIELD = 2
-
-    resultType = None
-    value = None
-
-    def __init__(self, rType, rValue):
-        self.resultType = rType
-        self.value = rValue
-
-
 class NoSelectionController:
     _ui = None
     _callback = None
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Fields of notes looked up by name, as notes of different types
+# have different fields at the same positions
+# --------------------------------------------------
+
+
+def fieldNames(note) -> list:
+    return [field['name'] for field in note.model()['flds']]
+
+
+def fieldIndex(note, name: str):
+    """ Position of the field name on note, or None when its note type has no such field """
+
+    names = fieldNames(note)
+    return names.index(name) if name in names else None
+
+
+def allFieldNames(notes) -> list:
+    """ Names of the fields of every note type among notes, in the order they first appear """
+
+    names = []
+    for note in notes:
+        names.extend(name for name in fieldNames(note) if name not in names)
+    return names
+
+
+def fieldValues(notes, name: str) -> list:
+    """ (note, value of the field name) for the notes having that field """
+
+    values = []
+    for note in notes:
+        index = fieldIndex(note, name)
+        if index is not None and index < len(note.fields):
+            values.append((note, note.fields[index]))
+    return values
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Stored copies of provider pages, used by "cache first" providers
+# and helpers for the browser disk cache
+# --------------------------------------------------
+
+import hashlib
+import os
+import re
+import shutil
+
+from .core import Feedback
+
+_SCRIPTS = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def folderSize(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+# noinspection PyPep8Naming
+class PageSnapshotStore:
+    """
+        Keeps the rendered HTML of pages on disk, one file per URL.
+        Scripts are removed, as the stored DOM already contains their result.
+        When the folder goes over maxBytes the oldest copies are removed
+    """
+
+    # QWebEnginePage.setHtml doesn't accept content larger than 2 MB
+    MAX_PAGE_BYTES = 2 * 1024 * 1024 - 4096
+
+    def __init__(self, folder: str, maxBytes: int):
+        self.folder = folder
+        self.maxBytes = maxBytes
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.folder, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html')
+
+    def get(self, url: str):
+        path = self._path(url)
+        try:
+            with open(path, encoding='utf-8') as f:
+                html = f.read()
+            os.utime(path)      # keeps recently used pages longer
+            return html
+        except OSError:
+            return None
+
+    def put(self, url: str, html: str):
+        if not html:
+            return
+        html = _SCRIPTS.sub('', html)
+        if len(html.encode('utf-8')) > self.MAX_PAGE_BYTES:
+            return
+
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(self._path(url), 'w', encoding='utf-8') as f:
+                f.write(html)
+            self._shrink()
+        except OSError as e:
+            Feedback.log('Page not stored: {}'.format(e))
+
+    def _shrink(self):
+        entries = []
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+
+        total = sum(e[1] for e in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def size(self) -> int:
+        return folderSize(self.folder)
+
+    def clear(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Guesses which provider is going to be chosen,
+# so its page can be loaded while the menu is still open
+# --------------------------------------------------
+
+from .core import Feedback
+
+
+# noinspection PyPep8Naming
+class ProviderPredictor:
+    """
+        Predicts a provider based on the last one used and on the usage per note type (current session).
+        Also counts whether the predictions were right
+    """
+
+    LAST_PROVIDER_BONUS = 2
+
+    def __init__(self):
+        self._usage = {}
+        self.hits = 0
+        self.misses = 0
+
+    def predict(self, noteType, lastProvider=None):
+        scores = dict(self._usage.get(noteType, {}))
+        if lastProvider:
+            scores[lastProvider] = scores.get(lastProvider, 0) + self.LAST_PROVIDER_BONUS
+        if not scores:
+            return None
+        return max(scores.items(), key=lambda item: item[1])[0]
+
+    def record(self, noteType, provider, predicted=None):
+        """ Registers the provider chosen by the user. If something was predicted, counts hit or miss """
+
+        perType = self._usage.setdefault(noteType, {})
+        perType[provider] = perType.get(provider, 0) + 1
+
+        if predicted is None:
+            return
+        if predicted == provider:
+            self.hits += 1
+        else:
+            self.misses += 1
+        Feedback.log('Preload hit rate: {}/{} ({:.0%})'.format(self.hits, self.hits + self.misses, self.hitRate()))
+
+    def hitRate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# In-memory search over the providers (names and URLs),
+# ranked by how often and how recently each one was used
+# --------------------------------------------------
+
+import os
+import re
+import time
+
+from .core import CWD
+from .json_store import loadJson, saveJson, DelayedSave
+
+USAGE_FILE = os.path.join(CWD, 'user_files', 'provider_usage.json')
+_WORD = re.compile(r'[a-z0-9]+')
+_IGNORED_WORDS = {'http', 'https', 'www', 'com', 'org', 'net'}
+_EMPTY = frozenset()
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# noinspection PyPep8Naming
+class FrecencyRanking:
+    """
+        Usage score per provider URL. Each use adds 1 to a score which halves every halfLifeDays.
+        Kept on USAGE_FILE, so the ranking survives restarts
+    """
+
+    def __init__(self, path: str = USAGE_FILE, halfLifeDays: float = 14, clock=time.time):
+        self.path = path
+        self._halfLife = halfLifeDays * 24 * 3600
+        self.clock = clock
+        self._scores = {}       # url: (score, last used)
+        self.version = 0
+        self._delayedSave = DelayedSave(self.save)
+        self._load()
+
+    def _load(self):
+        scores = loadJson(self.path, 'Provider usage',
+                          lambda content: {url: tuple(value) for url, value in content.items()})
+        if scores is not None:
+            self._scores = scores
+
+    def save(self):
+        saveJson(self.path, self._scores, 'Provider usage')
+
+    def flush(self):
+        """ Saves the uses recorded and not saved yet """
+
+        self._delayedSave.flush()
+
+    def score(self, url: str, now: float = None) -> float:
+        entry = self._scores.get(url)
+        if not entry:
+            return 0.0
+        now = self.clock() if now is None else now
+        return entry[0] * 0.5 ** (max(0.0, now - entry[1]) / self._halfLife)
+
+    def record(self, url: str):
+        now = self.clock()
+        self._scores[url] = (self.score(url, now) + 1, now)
+        self.version += 1
+        self._delayedSave.changed()
+
+
+# noinspection PyPep8Naming
+class ProviderIndex:
+    """
+        Finds providers whose name or URL contain every typed word.
+        Words shorter than 3 characters match the start of a word (prefix index);
+        longer ones match anywhere (trigram index). A query extending the previous one
+        is only searched within the previous matches.
+        Results are ranked by usage, plus a bonus when the name starts with the first word.
+        Lookups are set operations, so typing stays fast with thousands of providers
+    """
+
+    MAX_PREFIX = 8
+    NAME_START_BONUS = 1.0
+    WORD_START_BONUS = 0.5
+
+    def __init__(self, providers: list, ranking: FrecencyRanking = None):
+        self.providers = list(providers)
+        self.ranking = ranking
+        self._texts = []
+        self._names = []
+        self._nameWords = []
+        self._prefixes = {}          # start of any word: providers
+        self._nameStarts = {}        # start of the name: providers
+        self._nameWordStarts = {}    # start of a word on the name: providers
+        self._trigrams = {}
+        self._lastTerms = None
+        self._lastMatches = None
+        self._usage = None
+        self._usageVersion = None
+        self._used = set()
+        self._byUsage = []
+        self._build()
+
+    def _build(self):
+        for pid, provider in enumerate(self.providers):
+            name = provider.name.lower()
+            text = name + ' ' + provider.url.lower()
+            nameWords = _WORD.findall(name)
+            self._names.append(name)
+            self._nameWords.append(nameWords)
+            self._texts.append(text)
+
+            for word in set(w for w in _WORD.findall(text) if w not in _IGNORED_WORDS):
+                self._addPrefixes(self._prefixes, word, pid)
+            for word in set(nameWords):
+                self._addPrefixes(self._nameWordStarts, word, pid)
+            self._addPrefixes(self._nameStarts, name, pid)
+            for gram in _trigrams(text):
+                self._trigrams.setdefault(gram, set()).add(pid)
+
+    def _addPrefixes(self, index: dict, word: str, pid: int):
+        for size in range(1, min(len(word), self.MAX_PREFIX) + 1):
+            index.setdefault(word[:size], set()).add(pid)
+
+    def _lookup(self, term: str, within: set = None) -> set:
+        """ Providers matching term, among within (all when None). The returned set must not be changed """
+
+        if len(term) < 3:
+            found = self._prefixes.get(term, _EMPTY)
+            return found if within is None else found & within
+
+        grams = sorted((self._trigrams.get(g, _EMPTY) for g in _trigrams(term)), key=len)
+        if within is not None:
+            grams.insert(0, within)
+        found = grams[0].intersection(*grams[1:])
+        if len(term) == 3:
+            return found
+        return {pid for pid in found if term in self._texts[pid]}
+
+    def _candidates(self, terms: list) -> set:
+        matches = self._lastMatches if self._extends(terms, self._lastTerms) else None
+        for term in sorted(terms, key=len, reverse=True):
+            matches = self._lookup(term, matches)
+            if not matches:
+                break
+        return matches
+
+    @staticmethod
+    def _extends(terms: list, previous: list) -> bool:
+        """
+            Whether every match of terms is also a match of previous (typing more on the same query).
+            Not the case when a short word (start of a word) grows into a long one (anywhere)
+        """
+
+        if not previous or len(terms) < len(previous):
+            return False
+        return all(term.startswith(old) and (len(old) >= 3 or len(term) < 3)
+                   for term, old in zip(terms, previous))
+
+    def _startsWith(self, index: dict, first: str, check) -> set:
+        found = index.get(first[:self.MAX_PREFIX], _EMPTY)
+        if len(first) <= self.MAX_PREFIX:
+            return found
+        return {pid for pid in found if check(pid)}
+
+    def _usageScores(self) -> list:
+        """
+            Usage score of each provider, computed again only after some usage is recorded.
+            Scores decay at the same rate, so their order doesn't change while nothing is recorded
+        """
+
+        version = self.ranking.version if self.ranking else 0
+        if self._usage is None or version != self._usageVersion:
+            now = self.ranking.clock() if self.ranking else 0
+            self._usage = [self.ranking.score(p.url, now) if self.ranking else 0.0 for p in self.providers]
+            self._usageVersion = version
+            self._used = {pid for pid, score in enumerate(self._usage) if score > 0}
+            self._byUsage = sorted(range(len(self.providers)), key=lambda pid: -self._usage[pid])
+        return self._usage
+
+    def _best(self, matches: set, first: str, limit: int) -> list:
+        """
+            Providers not used yet and with the same bonus only differ by their position on the list,
+            so only the first ones of each group (and the used ones) need a score
+        """
+
+        usage = self._usageScores()
+        nameStart = self._startsWith(self._nameStarts, first, lambda pid: self._names[pid].startswith(first)) \
+            & matches
+        wordStart = self._startsWith(self._nameWordStarts, first,
+                                     lambda pid: any(w.startswith(first) for w in self._nameWords[pid])) \
+            & matches - nameStart
+
+        picked = self._used & matches
+        unused = 0
+        for group in (lambda: nameStart, lambda: wordStart, lambda: matches - nameStart - wordStart):
+            if unused >= limit:
+                break    # unused providers of a group can't beat the unused ones of the groups before
+            first = sorted(group() - self._used)[:limit]
+            picked.update(first)
+            unused += len(first)
+
+        def score(pid):
+            bonus = self.NAME_START_BONUS if pid in nameStart else self.WORD_START_BONUS if pid in wordStart else 0
+            return -(usage[pid] + bonus), pid
+        return sorted(picked, key=score)[:limit]
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """ The best providers for query, up to limit. An empty query returns the most used ones """
+
+        terms = _WORD.findall(query.lower())
+        if not terms:
+            self._usageScores()
+            self._lastTerms = None
+            return [self.providers[pid] for pid in self._byUsage[:limit]]
+
+        matches = self._candidates(terms)
+        self._lastTerms = terms
+        self._lastMatches = matches
+        return [self.providers[pid] for pid in self._best(matches, terms[0], limit)]
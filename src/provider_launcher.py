@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Keyboard driven popup to choose a provider by typing part of its name or URL
+# --------------------------------------------------
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+
+from .core import Label, Style
+from .provider_index import ProviderIndex
+
+
+# noinspection PyPep8Naming
+class ProviderLauncher(QDialog):
+    """
+        Filters the providers on each key typed. Up/Down move on the list, Enter chooses and Esc closes.
+        The provider groups matching every typed word (on their name or their providers) come after the providers.
+        onChoose(url) is called with the provider chosen, or onChoose(group)
+    """
+
+    MAX_RESULTS = 15
+
+    def __init__(self, index: ProviderIndex, onChoose, parent=None, groups: list = ()):
+        super().__init__(parent, Qt.Popup | Qt.FramelessWindowHint)
+        self._index = index
+        self._onChoose = onChoose
+        self._groups = [('{} ({})'.format(group.name, ', '.join(group.providers)), group) for group in groups]
+        self.setStyleSheet(Style.MENU_STYLE)
+        self.setMinimumWidth(420)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self._input = QLineEdit(self)
+        self._input.setPlaceholderText(Label.CARD_MENU.replace('&', '') + '...')
+        self._input.textChanged.connect(self._filter)
+        self._input.installEventFilter(self)
+        self._input.returnPressed.connect(self._choose)
+        layout.addWidget(self._input)
+
+        self._results = QListWidget(self)
+        self._results.setFocusPolicy(Qt.NoFocus)
+        self._results.itemActivated.connect(self._choose)
+        self._results.itemClicked.connect(self._choose)
+        layout.addWidget(self._results)
+
+        self._filter('')
+
+    def _filter(self, text: str):
+        self._results.clear()
+        for provider in self._index.search(text, self.MAX_RESULTS):
+            item = QListWidgetItem(provider.name)
+            item.setToolTip(provider.url)
+            item.setData(Qt.UserRole, provider.url)
+            self._results.addItem(item)
+
+        words = text.lower().split()
+        for label, group in self._groups:
+            if all(word in label.lower() for word in words):
+                item = QListWidgetItem(label)
+                item.setData(Qt.UserRole, group)
+                self._results.addItem(item)
+        self._results.setCurrentRow(0)
+
+    def eventFilter(self, obj, event):
+        if obj is self._input and event.type() == event.KeyPress and event.key() in (Qt.Key_Up, Qt.Key_Down):
+            step = -1 if event.key() == Qt.Key_Up else 1
+            count = self._results.count()
+            if count:
+                self._results.setCurrentRow((self._results.currentRow() + step) % count)
+            return True
+        return super().eventFilter(obj, event)
+
+    def _choose(self, *args):
+        item = self._results.currentItem()
+        self.close()
+        if not item:
+            return
+        choice = item.data(Qt.UserRole)
+        if isinstance(choice, str) and self._index.ranking:
+            self._index.ranking.record(choice)
+        self._onChoose(choice)
+
+    def popup(self, widget):
+        """ Shows the launcher over widget, with the typing focus """
+
+        center = widget.mapToGlobal(widget.rect().center()) if widget else None
+        if center:
+            self.move(center.x() - self.minimumWidth() // 2, center.y() - 150)
+        self.show()
+        self._input.setFocus()
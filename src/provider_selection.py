@@ -6,19 +6,58 @@
 
 from .core import Label, Feedback, Style
 from .config import service as cfgService
+from .provider_index import ProviderIndex, FrecencyRanking
+from .provider_stats import sharedStats
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QMenu, QAction
 
 
 class ProviderSelectionController:
 
     _providerList = []
+    _ranking = None
+    _menus = {}     # parent type: CachedMenu
+    _index = None   # (config version, ProviderIndex), shared by the launchers
+    MENU_PAGE_SIZE = 20
 
     def __init__(self):
         self._providerList = cfgService.getConfig().providers
+        cfgService.subscribe(self._onConfigChanged)
 
+    def _onConfigChanged(self, config):
+        self._providerList = config.providers
 
-    def showCustomMenu(self, menuParent, menuFn):
-        """ Builds the addon entry in the context menu, adding options according to the providers """
+    @classmethod
+    def ranking(cls) -> FrecencyRanking:
+        """ Usage of the providers, shared by the menus and the launcher """
+
+        if not cls._ranking:
+            cls._ranking = FrecencyRanking()
+        return cls._ranking
+
+    @classmethod
+    def flushRanking(cls):
+        """ Saves the usage not saved yet, if it was used """
+
+        if cls._ranking:
+            cls._ranking.flush()
+
+    def _getIndex(self) -> ProviderIndex:
+        """ Built again only when the config changes """
+
+        cached = ProviderSelectionController._index
+        if cached is None or cached[0] != cfgService.version:
+            cached = ProviderSelectionController._index = (cfgService.version,
+                                                           ProviderIndex(self._providerList, self.ranking()))
+        return cached[1]
+
+
+    def showCustomMenu(self, menuParent, menuFn, onClose=None):
+        """
+            Adds the addon entry to the context menu (or shows it as a popup), with options according to the providers.
+            The menu is built once per parent type and kept until the providers change (config version).
+            onClose is called once the menu is gone, after the selected action (if any) has run
+        """
 
         if not menuFn:
             raise AttributeError('Callback Fn must be not null')
@@ -26,26 +65,156 @@ class ProviderSelectionController:
         if not menuParent:
             raise AttributeError('menuParent must be not null')
 
-        submenu = QMenu(Label.CARD_MENU, menuParent)
-        submenu.setStyleSheet(Style.MENU_STYLE)
+        if not isinstance(menuParent, QMenu) and cfgService.getConfig().providerLauncher:
+            return self.showLauncher(menuParent, menuFn, onClose)
 
-        pList = self._providerList
-        for index, prov in enumerate(pList):
-            act = QAction('(&' + str(index + 1) + ') ' + prov.name, submenu, 
-                triggered=self._makeMenuAction(prov.url, menuFn))
-            submenu.addAction(act)
+        cached = self._getMenu(type(menuParent))
+        cached.menuFn = menuFn
+        cached.onClose = None
 
-        if not isinstance(menuParent, QMenu):
-            submenu.popup(menuParent.mapToGlobal( menuParent.pos() ))
+        if isinstance(menuParent, QMenu):
+            if onClose:
+                menuParent.aboutToHide.connect(lambda: QTimer.singleShot(0, onClose))
+            menuParent.addMenu(cached.menu)
         else:
-            menuParent.addMenu(submenu)
-
+            cached.onClose = onClose
+            cached.menu.popup(menuParent.mapToGlobal( menuParent.pos() ))
+
+    def _menuVersion(self) -> tuple:
+        """ The menu changes with the config and, when sorted by score, the usage. The stats shown are updated on show """
+
+        sortByScore = cfgService.getConfig().sortProvidersByScore
+        return cfgService.version, self.ranking().version if sortByScore else None
+
+    def _getMenu(self, parentType) -> 'CachedMenu':
+        version = self._menuVersion()
+        cached = ProviderSelectionController._menus.get(parentType)
+        if cached and cached.version == version:
+            return cached
+
+        if cached:
+            cached.menu.deleteLater()
+        cached = CachedMenu(version)
+        self._fillMenu(cached)
+        ProviderSelectionController._menus[parentType] = cached
+        Feedback.log('Providers menu built for {}'.format(parentType.__name__))
+        return cached
+
+    def _fillMenu(self, cached: 'CachedMenu'):
+        """ The first providers go on the menu; the others on submenus, only built when opened """
+
+        providers = self._providerList
+        if cfgService.getConfig().sortProvidersByScore:
+            providers = self.sortedByScore(providers)
+        size = self.MENU_PAGE_SIZE
+        self._addProviderActions(cached, cached.menu, providers[:size], 0)
+        for start in range(size, len(providers), size):
+            page = providers[start:start + size]
+            self.addLazySubmenu(cached.menu, 'More ({}-{})'.format(start + 1, start + len(page)),
+                                lambda submenu, page=page, start=start:
+                                self._addProviderActions(cached, submenu, page, start))
+
+        groups = cfgService.getConfig().providerGroups
+        if groups:
+            cached.menu.addSeparator()
+        for group in groups:
+            cached.menu.addAction(QAction('{} ({})'.format(group.name, ', '.join(group.providers)), cached.menu,
+                                          triggered=self._makeMenuAction(group, cached.choose)))
+
+    def sortedByScore(self, providers: list) -> list:
+        """ By usage (frecency) weighted by speed and success rate. Providers never used keep their order """
+
+        ranking, stats = self.ranking(), sharedStats()
+        return sorted(providers, key=lambda prov: -ranking.score(prov.url) * stats.weight(prov.url))
+
+    def _addProviderActions(self, cached: 'CachedMenu', menu: QMenu, providers: list, start: int):
+        for index, prov in enumerate(providers, start):
+            act = QAction(menu, triggered=self._makeMenuAction(prov.url, cached.choose))
+            cached.addProviderAction(act, '(&' + str(index + 1) + ') ' + prov.name, prov.url)
+            menu.addAction(act)
+
+    @staticmethod
+    def addLazySubmenu(menu: QMenu, title: str, fill) -> QMenu:
+        """ Adds a submenu which is filled by fill(submenu) the first time it's opened """
+
+        submenu = menu.addMenu(title)
+
+        def onShow():
+            submenu.aboutToShow.disconnect(onShow)
+            fill(submenu)
+
+        submenu.aboutToShow.connect(onShow)
+        return submenu
+
+    def showLauncher(self, parent, menuFn, onClose=None):
+        """ Opens the search box over parent. menuFn receives the URL of the chosen provider, or the group """
+
+        from .provider_launcher import ProviderLauncher
+
+        launcher = ProviderLauncher(self._getIndex(), menuFn, parent, cfgService.getConfig().providerGroups)
+        if onClose:
+            launcher.finished.connect(lambda *args: QTimer.singleShot(0, onClose))
+        launcher.popup(parent)
+        return launcher
 
     def _makeMenuAction(self, value, menuCallback):
         """
             Creates correct action for the context menu selection. Otherwise, it would repeat only the last element
         """
-        return lambda: menuCallback(value)
+
+        def action():
+            if isinstance(value, str):      # not for provider groups
+                self.ranking().record(value)
+            menuCallback(value)
+        return action
+
+
+# noinspection PyPep8Naming
+class CachedMenu:
+    """
+        A providers menu kept between uses. Its actions call menuFn, which is set on every use,
+        and onClose is called when it's hidden (menus shown as popup).
+        The stats of the providers are shown next to their names, updated when the menu is shown
+    """
+
+    def __init__(self, version: tuple):
+        self.version = version
+        self.menuFn = None
+        self.onClose = None
+        self._providerActions = []      # (action, text, url)
+        self._statsVersion = None
+        self.menu = QMenu(Label.CARD_MENU)
+        self.menu.setStyleSheet(Style.MENU_STYLE)
+        self.menu.aboutToShow.connect(self.refreshStats)
+        self.menu.aboutToHide.connect(self._onHide)
+
+    def addProviderAction(self, action: QAction, text: str, url: str):
+        self._providerActions.append((action, text, url))
+        self._setText(action, text, url)
+
+    def refreshStats(self):
+        stats = sharedStats()
+        if stats.version == self._statsVersion:
+            return
+        self._statsVersion = stats.version
+        for action, text, url in self._providerActions:
+            self._setText(action, text, url)
+
+    @staticmethod
+    def _setText(action: QAction, text: str, url: str):
+        label = sharedStats().label(url)
+        action.setText(text + ('\t' + label if label else ''))
+
+    def choose(self, provider):
+        """ provider is an URL, or a ConfigHolder.ProviderGroup """
+
+        if self.menuFn:
+            self.menuFn(provider)
+
+    def _onHide(self):
+        onClose, self.onClose = self.onClose, None
+        if onClose:
+            QTimer.singleShot(0, onClose)
 
 
 # -----------------------------------------------------------------------------
\ No newline at end of file
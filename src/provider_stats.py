@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Load time, success rate and page size of each provider, measured on the lookups.
+# Kept on a file, so they survive restarts
+# --------------------------------------------------
+
+import os
+
+from .core import CWD
+from .json_store import loadJson, saveJson, DelayedSave
+
+STATS_FILE = os.path.join(CWD, 'user_files', 'provider_stats.json')
+
+# Bytes of the page and its resources, as reported by the Resource Timing API
+PAGE_BYTES_JS = """
+(function () {
+    var total = 0;
+    performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+        .forEach(function (entry) { total += entry.transferSize || entry.encodedBodySize || 0; });
+    return total;
+})()
+"""
+
+
+# noinspection PyPep8Naming
+class ProviderStats:
+    """
+        Per provider URL template: loads, failures, and moving averages of the load time (ms)
+        and page size (bytes) of the successful loads, where the recent ones weigh more
+    """
+
+    SMOOTHING = 0.2
+
+    def __init__(self, path: str = STATS_FILE):
+        self.path = path
+        self._entries = {}      # url: {'loads', 'failures', 'ms', 'bytes'}
+        self.version = 0
+        self._delayedSave = DelayedSave(self.save)
+        self._load()
+
+    def _load(self):
+        entries = loadJson(self.path, 'Provider stats',
+                           lambda content: {url: dict(entry) for url, entry in content.items()})
+        if entries is not None:
+            self._entries = entries
+
+    def save(self):
+        saveJson(self.path, self._entries, 'Provider stats')
+
+    def flush(self):
+        """ Saves the loads recorded and not saved yet """
+
+        self._delayedSave.flush()
+
+    def _average(self, entry: dict, key: str, value: float):
+        previous = entry.get(key)
+        entry[key] = value if previous is None else previous + self.SMOOTHING * (value - previous)
+
+    def record(self, url: str, milliseconds: float, ok: bool):
+        """ A load of url finished. Failed loads only count for the success rate """
+
+        entry = self._entries.setdefault(url, {'loads': 0, 'failures': 0, 'ms': None, 'bytes': None})
+        entry['loads'] += 1
+        if ok:
+            self._average(entry, 'ms', milliseconds)
+        else:
+            entry['failures'] += 1
+        self.version += 1
+        self._delayedSave.changed()
+
+    def recordBytes(self, url: str, size: int):
+        """ Size of a page loaded """
+
+        entry = self._entries.get(url)
+        if entry and size > 0:
+            self._average(entry, 'bytes', size)
+            self.version += 1
+            self._delayedSave.changed()
+
+    def get(self, url: str) -> dict:
+        return self._entries.get(url)
+
+    def successRate(self, url: str) -> float:
+        entry = self._entries.get(url)
+        if not entry or not entry['loads']:
+            return 1.0
+        return 1 - entry['failures'] / entry['loads']
+
+    def weight(self, url: str) -> float:
+        """ From 0 to 1: lower for slow or failing providers. 1 for the ones without loads yet """
+
+        entry = self._entries.get(url)
+        if not entry:
+            return 1.0
+        seconds = (entry['ms'] or 0) / 1000
+        return self.successRate(url) / (1 + seconds)
+
+    def label(self, url: str) -> str:
+        """ e.g. '1.2 s, 340 KB, 95%'. Empty when there are no loads """
+
+        entry = self._entries.get(url)
+        if not entry:
+            return ''
+        parts = []
+        if entry['ms'] is not None:
+            parts.append('%.1f s' % (entry['ms'] / 1000))
+        if entry['bytes']:
+            parts.append('%d KB' % (entry['bytes'] // 1024))
+        parts.append('%d%%' % round(self.successRate(url) * 100))
+        return ', '.join(parts)
+
+
+_shared = None
+
+
+def sharedStats() -> ProviderStats:
+    """ The stats used by the add-on, read from STATS_FILE on first use """
+
+    global _shared
+    if _shared is None:
+        _shared = ProviderStats()
+    return _shared
+
+
+def flushSharedStats():
+    """ Saves the stats not saved yet, if they were used """
+
+    if _shared is not None:
+        _shared.flush()
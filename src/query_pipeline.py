@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Turns a field value or a selected text into the query sent to the providers.
+# The steps are chosen on the config and compiled once per config version
+# --------------------------------------------------
+
+import html
+import re
+import unicodedata
+
+_TAG = re.compile(r'<[^>]*>')
+_LINE_BREAK = re.compile(r'<\s*(br|/p|/div|/li)\b[^>]*>', re.IGNORECASE)
+_CLOZE = re.compile(r'{{c\d+::(.*?)(::[^}]*?)?}}', re.DOTALL)
+_SPACES = re.compile(r'\s+')
+
+
+def stripHtml(text: str) -> str:
+    return _TAG.sub('', _LINE_BREAK.sub(' ', text))
+
+
+def decodeEntities(text: str) -> str:
+    return html.unescape(text)
+
+
+def removeCloze(text: str) -> str:
+    """ {{c1::answer::hint}} becomes answer """
+
+    return _CLOZE.sub(r'\1', text)
+
+
+def normalizeUnicode(text: str) -> str:
+    """ NFKC: compatibility characters (e.g. non-breaking space, full width letters) become the plain ones """
+
+    return unicodedata.normalize('NFKC', text)
+
+
+def collapseSpaces(text: str) -> str:
+    return _SPACES.sub(' ', text).strip()
+
+
+STEPS = {
+    'stripHtml': stripHtml,
+    'decodeEntities': decodeEntities,
+    'removeCloze': removeCloze,
+    'normalizeUnicode': normalizeUnicode,
+    'filterWords': None,        # built from filteredWords
+    'collapseSpaces': collapseSpaces,
+}
+DEFAULT_STEPS = list(STEPS)
+
+
+def wordFilter(filteredWords: list):
+    """ Removes the words on filteredWords (case insensitive). A set makes each check constant time """
+
+    words = frozenset(w.lower() for w in filteredWords if w)
+    if not words:
+        return None
+
+    def filterWords(text: str) -> str:
+        return ' '.join(word for word in text.split() if word.lower() not in words)
+    return filterWords
+
+
+def limitLength(maxLength: int):
+    """ Cuts the query on maxLength characters, at the last whole word when there is one """
+
+    def capLength(text: str) -> str:
+        if len(text) <= maxLength:
+            return text
+        cut = text[:maxLength]
+        space = cut.rfind(' ')
+        return cut[:space] if space > 0 else cut
+    return capLength
+
+
+# noinspection PyPep8Naming
+class QueryPipeline:
+    """ Runs the steps in order. Unknown step names are ignored (the config validation reports them) """
+
+    def __init__(self, steps: list, filteredWords: list = (), maxLength: int = 0):
+        self.names = []
+        self._functions = []
+        for name in steps:
+            function = wordFilter(filteredWords) if name == 'filterWords' else STEPS.get(name)
+            if function:
+                self.names.append(name)
+                self._functions.append(function)
+        if maxLength > 0:
+            self.names.append('maxLength')
+            self._functions.append(limitLength(maxLength))
+
+    def __call__(self, text: str) -> str:
+        if not text:
+            return ''
+        for function in self._functions:
+            text = function(text)
+        return text
+
+    @classmethod
+    def fromConfig(cls, config) -> 'QueryPipeline':
+        return cls(config.queryPipeline, config.filteredWords, config.queryMaxLength)
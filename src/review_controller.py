@@ -5,6 +5,8 @@
 # @author ricardo saturnino
 # ------------------------------------------------
 
+import time
+
 from anki.hooks import addHook
 from aqt import mw
 from aqt.qt import QAction
@@ -12,16 +14,21 @@ from aqt.reviewer import Reviewer
 from aqt.utils import tooltip, showWarning, openLink
 
 from .base_controller import BaseController
-from .browser import AwBrowser
+from .batch_controller import BatchLookupController
 from .config import service as cfg
-from .core import Feedback
+from .core import Feedback, NoSelectionResult
 from .editor_controller import EditorController
 from .exception_handler import exceptionHandler
-from .no_selection import NoSelectionResult
+from .provider_selection import ProviderSelectionController
+from .provider_stats import flushSharedStats
+from .startup_report import StartupReport
 
 # Holds references so GC doesnt kill them
 controllerInstance = None
 editorCtrl = None
+batchCtrl = None
+
+IDLE_BUILD_DELAY_MS = 5000
 
 @staticmethod
 def _ankiShowInfo(*args):
@@ -31,8 +38,10 @@ def _ankiShowInfo(*args):
 def _ankiShowError(*args):
     showWarning(str(args))
 
-def run():
-    global controllerInstance, editorCtrl
+def run(importStartedAt=None):
+    """ Sets up the add-on. importStartedAt (perf_counter) is when the package started being imported """
+
+    global controllerInstance, editorCtrl, batchCtrl
     
     Feedback.log('Setting anki-web-browser controller')
     Feedback.showInfo = _ankiShowInfo
@@ -40,14 +49,28 @@ def run():
     Feedback.showWarn = lambda args: tooltip('<b>Warning</b><br />' + args, 7500)
     BaseController.openExternalLink = openLink
 
-    cfg.getConfig()  # Load config
-    controllerInstance = ReviewController(mw)
-    controllerInstance.setupBindings()
+    report = StartupReport()
+    BaseController.startupReport = report
+    if importStartedAt is not None:
+        report.add('imports', (time.perf_counter() - importStartedAt) * 1000)
+
+    with report.step('config'):
+        cfg.getConfig()  # Load config
+        cfg.watchFile()
+    with report.step('controllers'):
+        controllerInstance = ReviewController(mw)
+        controllerInstance.setupBindings()
 
-    editorCtrl = EditorController(mw)
+        editorCtrl = EditorController(mw)
+        batchCtrl = BatchLookupController(mw)
+        batchCtrl.setupBindings()
 
     if cfg.firstTime:
-        controllerInstance.browser.welcome()
+        with report.step('welcome page'):
+            controllerInstance.browser.welcome()
+    elif cfg.getConfig().buildBrowserWhenIdle:
+        controllerInstance.browser.buildWhenIdle(IDLE_BUILD_DELAY_MS)
+    report.save()
 
 # ----------------------------------------------------------------------------------
 
@@ -61,11 +84,10 @@ class ReviewController(BaseController):
 
     def __init__(self, ankiMw):
         super(ReviewController, self).__init__(ankiMw)
-        self.browser = AwBrowser.singleton(ankiMw.web, cfg.getInitialWindowSize())
-        self.browser.setSelectionHandler(None)
 
     def setupBindings(self):
         addHook('AnkiWebView.contextMenuEvent', self.onReviewerHandle)
+        addHook('unloadProfile', self.onUnloadProfile)
 
         Reviewer.nextCard = self.wrapOnCardShift(Reviewer.nextCard)
         Reviewer._shortcutKeys = self.wrap_shortcutKeys(Reviewer._shortcutKeys)
@@ -75,11 +97,25 @@ class ReviewController(BaseController):
         action.triggered.connect(self.openConfig)
         self._ankiMw.form.menuTools.addAction(action)
 
+        action = QAction("Anki-Web-Browser Lookup Timings", self._ankiMw)
+        action.triggered.connect(self.openTimings)
+        self._ankiMw.form.menuTools.addAction(action)
+
     def openConfig(self):
-        from .config import ConfigController
+        from .config_dialog import ConfigController
         cc = ConfigController(self._ankiMw)
         cc.open()
 
+    def openTimings(self):
+        from .trace_dialog import TraceDialog
+        TraceDialog(self._ankiMw).exec_()
+
+    def onUnloadProfile(self):
+        """ Data saved with a delay (provider stats and usage) is written before the profile is gone """
+
+        flushSharedStats()
+        ProviderSelectionController.flushRanking()
+
     def wrapOnCardShift(self, originalFunction):
         """
         Listens when the current showed card is changed, in Reviewer.
@@ -96,16 +132,19 @@ class ReviewController(BaseController):
             else:
                 originalResult = originalFunction(self)
 
-            if not ref.browser:
-                return
-            
-            ref.browser.clearContext()
+            note = None
+            if ref._ankiMw.reviewer and ref._ankiMw.reviewer.card:
+                note = ref._ankiMw.reviewer.card.note()
+            if note:
+                ref._setCurrentNote(note)
+
+            if not ref.browser:     # not built yet; it will start on the current note
+                return originalResult
+
+            ref.browser.switchContext(ref._noteKey(note))
             if not cfg.getConfig().keepBrowserOpened:
                 ref.browser.close()
 
-            if ref._ankiMw.reviewer and ref._ankiMw.reviewer.card:
-                ref._currentNote = ref._ankiMw.reviewer.card.note()
-
             return originalResult
 
         return wrapped
@@ -139,6 +178,7 @@ class ReviewController(BaseController):
         Feedback.log('Handle provider selection')
         webview = self._ankiMw.web
         query = self._getQueryValue(webview)
+        self._registerProviderChoice(result, self._currentNote)
         self._lastProvider = result
         if not query:
             return
@@ -150,7 +190,8 @@ class ReviewController(BaseController):
     def createReviewerMenu(self, webView, menu):
         """Handles context menu event on Reviewer"""
 
-        self._providerSelection.showCustomMenu(menu, self.handleProviderSelection)
+        self._preloadPrediction(self._ankiMw.web, self._currentNote)
+        self._providerSelection.showCustomMenu(menu, self.handleProviderSelection, self._onProviderMenuClosed)
 
     # TODO: move parts to superclass / adapt
     def _getQueryValue(self, webview):
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Measures how long the add-on takes while Anki starts,
+# and the objects built later, on first use
+# --------------------------------------------------
+
+import os
+import time
+from contextlib import contextmanager
+
+from .core import Feedback, CWD
+
+REPORT_FILE = os.path.join(CWD, 'user_files', 'startup_report.txt')
+
+
+# noinspection PyPep8Naming
+class StartupReport:
+    """
+        Steps timed during the add-on setup (their total is what it adds to Anki launch)
+        and the deferred builds. Written to REPORT_FILE, replaced on every launch
+    """
+
+    def __init__(self, path: str = REPORT_FILE, clock=time.perf_counter):
+        self.path = path
+        self._clock = clock
+        self.steps = []
+        self.deferred = []
+
+    def add(self, name: str, milliseconds: float):
+        self.steps.append((name, milliseconds))
+
+    @contextmanager
+    def step(self, name: str):
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add(name, (self._clock() - start) * 1000)
+
+    def addDeferred(self, name: str, milliseconds: float):
+        """ Something built after the startup (on first use or idle time). Not part of the total """
+
+        self.deferred.append((name, milliseconds))
+        self.save()
+
+    def total(self) -> float:
+        return sum(ms for _, ms in self.steps)
+
+    def format(self) -> str:
+        lines = ['Added to Anki startup: {:.1f} ms'.format(self.total())]
+        lines += ['  {:<30} {:>8.1f} ms'.format(name, ms) for name, ms in self.steps]
+        if self.deferred:
+            lines.append('Built later:')
+            lines += ['  {:<30} {:>8.1f} ms'.format(name, ms) for name, ms in self.deferred]
+        return '\n'.join(lines)
+
+    def save(self):
+        text = self.format()
+        Feedback.log(text)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                f.write(text + '\n')
+        except OSError as e:
+            Feedback.log('Startup report not saved: {}'.format(e))
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Keeps the tabs of recently seen notes,
+# so going back to a note shows its pages without loading them again
+# --------------------------------------------------
+
+from collections import OrderedDict
+
+from .core import Feedback
+
+
+class TabSet:
+    """ Tabs parked for a note: list of (widget, label), the selected index and the query (context) """
+
+    def __init__(self, tabs: list, currentIndex: int = 0, context: str = None):
+        self.tabs = tabs
+        self.currentIndex = currentIndex
+        self.context = context
+
+    def __len__(self):
+        return len(self.tabs)
+
+
+# noinspection PyPep8Naming
+class TabSetCache:
+    """
+        LRU of tab sets, keyed by note. Bounded by the total of tabs (there is no API to get the memory used by a page).
+        Evicted sets are given to dispose, which must release their widgets
+    """
+
+    def __init__(self, maxTabs: int, dispose=None):
+        self.maxTabs = maxTabs
+        self._dispose = dispose
+        self._entries = OrderedDict()
+
+    def put(self, key, tabSet: TabSet):
+        old = self._entries.pop(key, None)
+        if old:
+            self._release(old)
+        if not len(tabSet):
+            return
+
+        self._entries[key] = tabSet
+        while self._entries and self.tabCount() > self.maxTabs:
+            evictedKey, evicted = self._entries.popitem(last=False)
+            Feedback.log('TabSetCache evicting note {} ({} tabs)'.format(evictedKey, len(evicted)))
+            self._release(evicted)
+
+    def take(self, key) -> TabSet:
+        """ Removes and returns the tabs of key, or None if they are not cached (anymore) """
+
+        return self._entries.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def tabCount(self) -> int:
+        return sum(len(t) for t in self._entries.values())
+
+    def clear(self):
+        while self._entries:
+            self._release(self._entries.popitem()[1])
+
+    def _release(self, tabSet: TabSet):
+        if self._dispose:
+            self._dispose(tabSet)
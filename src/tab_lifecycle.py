@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Decides which background tabs are frozen or discarded,
+# based on how long they have been inactive and on how many are loaded
+# --------------------------------------------------
+
+import time
+
+
+# noinspection PyPep8Naming
+class TabLifecycleManager:
+    """
+        Keeps the last activation time of each tab and plans what to do with the inactive ones:
+        tabs not seen for freezeAfter seconds are frozen (they keep their memory, but stop running);
+        when the live tabs (placeholders don't count) exceed maxLiveTabs, the least recently seen are discarded.
+        There is no API to get the memory used by a page, so the tab count stands for it.
+        The current tab and tabs still loading are never touched. 0 disables a limit
+    """
+
+    def __init__(self, freezeAfter: int, maxLiveTabs: int, clock=time.monotonic):
+        self.freezeAfter = freezeAfter
+        self.maxLiveTabs = maxLiveTabs
+        self._clock = clock
+        self._lastActive = {}
+        self._frozen = set()
+        self.freezeCount = 0
+        self.discardCount = 0
+
+    def touch(self, tab):
+        """ The tab was activated """
+
+        self._lastActive[tab] = self._clock()
+        self._frozen.discard(tab)
+
+    def isFrozen(self, tab) -> bool:
+        return tab in self._frozen
+
+    def plan(self, tabs: list, current) -> tuple:
+        """ Returns (tabs to freeze, tabs to discard). Tabs not in tabs anymore are forgotten """
+
+        now = self._clock()
+        live = [t for t in tabs if not getattr(t, 'isPlaceholder', False)]
+        self._lastActive = {t: self._lastActive.get(t, now) for t in live}
+        self._frozen.intersection_update(live)
+
+        candidates = sorted((t for t in live if t is not current and not getattr(t, 'isLoading', False)),
+                            key=lambda t: self._lastActive[t])
+
+        toDiscard = []
+        if self.maxLiveTabs:
+            toDiscard = candidates[:max(0, len(live) - self.maxLiveTabs)]
+
+        toFreeze = []
+        if self.freezeAfter:
+            toFreeze = [t for t in candidates if t not in toDiscard and t not in self._frozen
+                        and now - self._lastActive[t] >= self.freezeAfter]
+        return toFreeze, toDiscard
+
+    def frozen(self, tab):
+        self._frozen.add(tab)
+        self.freezeCount += 1
+
+    def discarded(self, tab):
+        self._lastActive.pop(tab, None)
+        self._frozen.discard(tab)
+        self.discardCount += 1
+
+    def stats(self) -> dict:
+        return {
+            'frozen': len(self._frozen),
+            'freezeCount': self.freezeCount,
+            'discardCount': self.discardCount
+        }
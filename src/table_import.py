@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Imports the selected part of a page table into note fields, reading the table from the DOM
+# --------------------------------------------------
+
+import re
+
+# Rows of the table holding the selection: {headers: [...], rows: [[...], ...]} with the text of each cell,
+# only the rows touched by the selection. Cells spanning columns are repeated.
+# null when not in a table, or when the selection is inside a single cell (it's imported as text)
+TABLE_JS = """
+(function () {
+    var selection = window.getSelection();
+    if (!selection.rangeCount) {
+        return null;
+    }
+    var node = selection.getRangeAt(0).commonAncestorContainer;
+    var element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+    var table = element && element.closest('table');
+    if (!table) {
+        var tables = element ? element.querySelectorAll('table') : [];
+        for (var t = 0; t < tables.length && !table; t++) {
+            if (selection.containsNode(tables[t], true)) {
+                table = tables[t];
+            }
+        }
+    }
+    if (!table) {
+        return null;
+    }
+    var cell = element.closest('td, th');
+    if (cell && cell.closest('table') === table) {
+        return null;
+    }
+
+    function cells(row) {
+        var values = [];
+        for (var c = 0; c < row.cells.length; c++) {
+            var text = row.cells[c].innerText.replace(/\\s+/g, ' ').trim();
+            for (var span = row.cells[c].colSpan || 1; span > 0; span--) {
+                values.push(text);
+            }
+        }
+        return values;
+    }
+
+    var headers = [], rows = [];
+    var head = table.tHead && table.tHead.rows.length ? table.tHead.rows[table.tHead.rows.length - 1] : null;
+    if (head) {
+        headers = cells(head);
+    }
+    for (var r = 0; r < table.rows.length; r++) {
+        var row = table.rows[r];
+        if (head && row.parentNode === table.tHead) {
+            continue;
+        }
+        if (!head && r === 0 && row.querySelector('th') && !row.querySelector('td')) {
+            headers = cells(row);
+            continue;
+        }
+        if (selection.containsNode(row, true)) {
+            rows.push(cells(row));
+        }
+    }
+    return {headers: headers, rows: rows};
+})()
+"""
+
+# Browser compatibility tables: support given as Yes / No / a version number
+_SUPPORT = re.compile(r'\b(Yes|No)\b|(\d+\.?\d?)')
+# The same, on text copied from such a table: one value per cell, cells separated by tabs
+_SUPPORT_TEXT = re.compile(r"(Yes).*?\t|(Yes).*?$|(No).*?\t|(No).*?$|(\d+\.?\d?).*?\t|(\d+\.?\d?).*?$")
+
+
+def supportValue(text: str):
+    """
+        'Yes' or the version on a browser compatibility cell; '' for 'No' (nothing to write).
+        None for cells without support info, e.g. the feature names
+    """
+
+    match = _SUPPORT.search(text)
+    if not match:
+        return None
+    if match.group(1):
+        return '' if match.group(1).lower() == 'no' else match.group(1)
+    return match.group(2)
+
+
+def mapTable(table: dict, startField: int, fieldNames: dict, mapping: dict, valueOf=supportValue) -> dict:
+    """
+        {field index: [values]} for the cells of table (as returned by TABLE_JS).
+        With mapping ({column header: field name}) each column goes to its field, with the text of its cells;
+        columns not mapped and empty cells are skipped.
+        Without it, the cells go to consecutive fields from startField, row after row, as the clipboard
+        import did: cells whose valueOf is None take no field, and the empty ones ('No') keep their field unchanged
+    """
+
+    fieldByName = {name: index for index, name in fieldNames.items()}
+    headers = table.get('headers') or []
+    result = {}
+    position = startField
+    for row in table.get('rows') or []:
+        for column, text in enumerate(row):
+            if mapping:
+                header = headers[column] if column < len(headers) else None
+                field = fieldByName.get(mapping.get(header))
+                value = text.strip()
+            else:
+                value = valueOf(text)
+                if value is None:
+                    continue
+                field = position
+                position += 1
+            if value and field in fieldNames:
+                result.setdefault(field, []).append(value)
+    return result
+
+
+def mapText(text: str, startField: int, fieldNames: dict) -> dict:
+    """
+        {field index: [value]} for the support values on text selected on a browser compatibility table:
+        each value goes to the next field from startField; 'No' keeps its field unchanged
+    """
+
+    result = {}
+    for field, groups in enumerate(_SUPPORT_TEXT.findall(text), startField):
+        value = next((match for match in groups if match), '')
+        if value and value.lower() != 'no' and field in fieldNames:
+            result[field] = [value]
+    return result
+
+
+def fieldChanges(values: dict, fields: list, replace: bool) -> dict:
+    """ {field index: new content} for values as returned by mapTable: joined, replacing or after each field's content """
+
+    changes = {}
+    for index, fieldValues in values.items():
+        value = ' '.join(fieldValues)
+        if not replace:
+            value = fields[index] + ' ' + value
+        changes[index] = value.strip()
+    return changes
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Debug dialog with the lookup timings of each provider, from the traces on memory
+# --------------------------------------------------
+
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, \
+    QFileDialog, QHeaderView
+
+from .tracing import tracer, Tracer
+
+
+# noinspection PyPep8Naming
+class TraceDialog(QDialog):
+    """
+        One row per provider: lookups, p50 and p95 from the menu click to the page loaded,
+        and the median time (since the click) each step was reached. Times in ms
+    """
+
+    COLUMNS = ['Provider', 'Lookups', 'p50', 'p95'] + list(Tracer.STEPS)
+
+    def __init__(self, parent=None, source: Tracer = tracer):
+        super().__init__(parent)
+        self._tracer = source
+        self.setWindowTitle('Anki-Web-Browser - Lookup timings (ms)')
+        self.resize(900, 300)
+
+        layout = QVBoxLayout(self)
+        self._table = QTableWidget(0, len(self.COLUMNS), self)
+        self._table.setHorizontalHeaderLabels(self.COLUMNS)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self._table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self._table)
+
+        buttons = QHBoxLayout()
+        for label, handler in (('Refresh', self.refresh), ('Export trace...', self._export), ('Clear', self._clear)):
+            button = QPushButton(label, self)
+            button.clicked.connect(handler)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def refresh(self):
+        stats = self._tracer.stats()
+        self._table.setRowCount(len(stats))
+        for row, (provider, values) in enumerate(sorted(stats.items(), key=lambda item: -item[1]['p95_ms'])):
+            cells = [provider, values['lookups'], values['p50_ms'], values['p95_ms']]
+            cells += [values['steps'].get(step, '') for step in Tracer.STEPS]
+            for column, value in enumerate(cells):
+                self._table.setItem(row, column, QTableWidgetItem(str(value)))
+
+    def _export(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export trace', 'anki-web-browser-trace.json', 'JSON (*.json)')
+        if path:
+            self._tracer.export(path)
+
+    def _clear(self):
+        self._tracer.clear()
+        self.refresh()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------
+# Timing of each lookup, from the provider chosen on the menu to the page loaded.
+# Events are kept in memory, on a bounded buffer
+# --------------------------------------------------
+
+import json
+import statistics
+import time
+from collections import deque, OrderedDict
+
+from .core import Feedback
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+# noinspection PyPep8Naming
+class Tracer:
+    """
+        A lookup (trace) starts with begin(provider) and ends with end(). Steps in between are marked
+        with mark(); only the first mark of each step counts. Page load progress is marked on milestones.
+        Events go to a ring buffer of maxEvents; lookups never ended are dropped after MAX_OPEN newer ones
+    """
+
+    MAX_EVENTS = 5000
+    MAX_OPEN = 20
+    PROGRESS_MILESTONES = (10, 50, 100)
+    STEPS = ('openInBrowser', 'open', 'add_new_tab', 'loadStarted', 'progress 10', 'progress 50',
+             'progress 100', 'loadFinished', 'postLoad')
+
+    def __init__(self, maxEvents: int = MAX_EVENTS, clock=time.perf_counter):
+        self._clock = clock
+        self._origin = clock()
+        self._events = deque(maxlen=maxEvents)
+        self._open = OrderedDict()      # trace id: (provider, marks done)
+        self._nextId = 1
+        self.current = None
+
+    def _now(self) -> float:
+        return (self._clock() - self._origin) * 1000
+
+    def _record(self, traceId: int, provider: str, name: str, **args):
+        self._events.append({'trace': traceId, 'provider': provider, 'name': name, 'ms': self._now(), 'args': args})
+
+    def begin(self, provider: str) -> int:
+        traceId = self._nextId
+        self._nextId += 1
+        self._open[traceId] = (provider, set())
+        while len(self._open) > self.MAX_OPEN:
+            self._open.popitem(last=False)
+        self.current = traceId
+        self._record(traceId, provider, 'select')
+        return traceId
+
+    def mark(self, traceId: int, name: str, **args):
+        if traceId not in self._open:
+            return
+        provider, marks = self._open[traceId]
+        if name in marks:
+            return
+        marks.add(name)
+        self._record(traceId, provider, name, **args)
+
+    def progress(self, traceId: int, value: int):
+        for milestone in self.PROGRESS_MILESTONES:
+            if value >= milestone:
+                self.mark(traceId, 'progress %d' % milestone)
+
+    def end(self, traceId: int, ok: bool = True):
+        if traceId not in self._open:
+            return
+        provider, _ = self._open.pop(traceId)
+        if self.current == traceId:
+            self.current = None
+        self._record(traceId, provider, 'end', ok=ok)
+
+    def isOpen(self, traceId: int) -> bool:
+        return traceId in self._open
+
+    def events(self) -> list:
+        return list(self._events)
+
+    def clear(self):
+        self._events.clear()
+        self._open.clear()
+        self.current = None
+
+    def stats(self) -> dict:
+        """
+            {provider: {'lookups', 'p50_ms', 'p95_ms', 'steps': {step: median ms since select}}}
+            for the lookups ended and still on the buffer
+        """
+
+        starts, steps, totals = {}, {}, {}
+        for event in self._events:
+            traceId, provider = event['trace'], event['provider']
+            if event['name'] == 'select':
+                starts[traceId] = event['ms']
+            elif traceId not in starts:
+                continue    # its beginning is no longer on the buffer
+            elif event['name'] == 'end':
+                totals.setdefault(provider, []).append(event['ms'] - starts[traceId])
+            else:
+                steps.setdefault(provider, {}).setdefault(event['name'], []).append(event['ms'] - starts[traceId])
+
+        result = {}
+        for provider, durations in totals.items():
+            result[provider] = {
+                'lookups': len(durations),
+                'p50_ms': round(statistics.median(durations), 1),
+                'p95_ms': round(percentile(durations, 0.95), 1),
+                'steps': {name: round(statistics.median(values), 1)
+                          for name, values in steps.get(provider, {}).items()}
+            }
+        return result
+
+    def export(self, path: str):
+        """ Writes the events in the Trace Event format (chrome://tracing, Perfetto) """
+
+        events = []
+        for event in self._events:
+            events.append({'name': event['name'], 'cat': 'lookup', 'ph': 'i', 's': 't',
+                           'ts': int(event['ms'] * 1000), 'pid': 1, 'tid': event['trace'],
+                           'args': dict(event['args'], provider=event['provider'])})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms', 'stats': self.stats()}, f, indent=1)
+        Feedback.log('Trace exported to {} ({} events)'.format(path, len(events)))
+
+
+tracer = Tracer()
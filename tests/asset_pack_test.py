@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Test code for asset_pack and icons modules
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from PyQt5.QtWidgets import QApplication
+from src.asset_pack import writePack, readPack
+from src.icons import IconRegistry
+
+ASSETS = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'src', 'assets')
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class AssetPackTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.packFile = os.path.join(self.folder, 'assets.pack')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def test_roundTrip(self):
+        files = {name: os.path.join(ASSETS, name + '.png') for name in ('stop', 'reload', 'zoom-in')}
+        size = writePack(files, self.packFile)
+
+        content = readPack(self.packFile)
+        self.assertEqual(set(files), set(content))
+        for name, path in files.items():
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), content[name])
+        self.assertEqual(size, sum(len(data) for data in content.values()))
+
+    def test_emptyPack(self):
+        writePack({}, self.packFile)
+        self.assertEqual({}, readPack(self.packFile))
+
+    def test_registryReadsThePack(self):
+        writePack({'stop': os.path.join(ASSETS, 'stop.png')}, self.packFile)
+        registry = IconRegistry(self.packFile, os.path.join(self.folder, 'missing'))
+
+        self.assertFalse(registry.pixmap('stop').isNull())
+        with self.assertRaises(OSError):
+            registry.pixmap('reload')
+
+    def test_registryFallsBackToFolder(self):
+        registry = IconRegistry(self.packFile, ASSETS)
+
+        self.assertFalse(registry.pixmap('reload').isNull())
+        self.assertIs(registry.icon('reload'), registry.icon('reload'))
+        self.assertIs(registry.toggleIcon('toggle-css-off', 'toggle-css'),
+                      registry.toggleIcon('toggle-css-off', 'toggle-css'))
+        self.assertEqual(os.path.join(ASSETS, 'www.png'), registry.path('www'))
+
+
+if __name__ == '__main__':
+    unittest.main()
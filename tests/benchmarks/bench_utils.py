@@ -0,0 +1,162 @@
+# Shared helpers for the benchmark scripts
+# Benchmarks are not collected by the test runner. Run them directly, e.g.:
+#   python tests/benchmarks/interceptor_bench.py
+
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.realpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..'))
+TESTS = os.path.join(ROOT, 'tests')
+
+for path in (ROOT, TESTS):
+    if path not in sys.path:
+        sys.path.append(path)
+
+_app = None
+
+
+def qtApp():
+    """ Returns the QApplication, created on the offscreen platform unless told otherwise """
+
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import Qt, QCoreApplication
+    from PyQt5.QtWidgets import QApplication
+
+    if not _app:
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+        _app = QApplication.instance() or QApplication(sys.argv[:1])
+    return _app
+
+
+def waitForLoad(view, url, timeoutMs=30000) -> float:
+    """ Loads url on view and blocks until loadFinished. Returns the elapsed time in ms """
+
+    from PyQt5.QtCore import QEventLoop, QTimer, QUrl
+
+    loop = QEventLoop()
+    view.loadFinished.connect(loop.quit)
+    QTimer.singleShot(timeoutMs, loop.quit)
+    start = time.perf_counter()
+    view.load(url if isinstance(url, QUrl) else QUrl(url))
+    loop.exec_()
+    elapsed = (time.perf_counter() - start) * 1000
+    view.loadFinished.disconnect(loop.quit)
+    return elapsed
+
+
+def timeIt(fn, repeat=20, warmup=2) -> list:
+    """ Runs fn repeatedly, returning each run time in ms """
+
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summary(times: list) -> dict:
+    ordered = sorted(times)
+    return {
+        'runs': len(ordered),
+        'min_ms': round(ordered[0], 4),
+        'median_ms': round(statistics.median(ordered), 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+    }
+
+
+def allocations(fn, repeat=5) -> dict:
+    """
+        Memory allocated by fn, with tracemalloc (median of repeat runs, after a warm up run):
+        peak_kb is the most allocated at once during a call, retained_blocks what is still allocated after it
+    """
+
+    fn()
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            base = tracemalloc.get_traced_memory()[0]
+            fn()
+            peaks.append((tracemalloc.get_traced_memory()[1] - base) / 1024)
+            after = tracemalloc.take_snapshot()
+            retained.append(sum(stat.count_diff for stat in after.compare_to(before, 'filename')))
+    finally:
+        tracemalloc.stop()
+    return {'peak_kb': round(statistics.median(peaks), 2), 'retained_blocks': int(statistics.median(retained))}
+
+
+def compareWithBaseline(results: dict, baseline: dict, tolerance=0.25, minDeltaMs=0.05) -> list:
+    """
+        Cases slower (median time) or allocating more (peak) than baseline by over tolerance.
+        Differences under minDeltaMs are taken as noise. Returns descriptions of the regressions
+    """
+
+    regressions = []
+    for name, values in results.items():
+        old = baseline.get(name)
+        if not old or 'median_ms' not in values or 'median_ms' not in old:
+            continue
+        if values['median_ms'] > old['median_ms'] * (1 + tolerance) and \
+                values['median_ms'] - old['median_ms'] > minDeltaMs:
+            regressions.append('{}: {} ms (baseline {} ms)'.format(name, values['median_ms'], old['median_ms']))
+        if 'peak_kb' in old and values.get('peak_kb', 0) > old['peak_kb'] * (1 + tolerance) and \
+                values['peak_kb'] - old['peak_kb'] > 1:
+            regressions.append('{}: {} KB allocated (baseline {} KB)'.format(name, values['peak_kb'], old['peak_kb']))
+    return regressions
+
+
+def notCompared(results: dict, baseline: dict) -> tuple:
+    """
+        Cases without a time on both results and baseline, as (skipped, warnings):
+        skipped are the cases this run could not measure; warnings the ones new since the baseline was taken,
+        or no longer run
+    """
+
+    skipped, warnings = [], []
+    for name in sorted(set(results) | set(baseline)):
+        values, old = results.get(name), baseline.get(name)
+        if values is None:
+            warnings.append('{}: not run'.format(name))
+        elif 'median_ms' not in values:
+            skipped.append('{}: {}'.format(name, values.get('status', 'no result')))
+        elif not old or 'median_ms' not in old:
+            warnings.append('{}: not on the baseline'.format(name))
+    return skipped, warnings
+
+
+def report(title: str, results: dict, outFile=None):
+    print('=' * 10, title, '=' * 10)
+    for name, values in results.items():
+        print('{:<40} {}'.format(name, values))
+    if outFile:
+        with open(outFile, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('Saved on', outFile)
+
+
+def runJs(page, code: str, timeoutMs=10000):
+    """ Runs code on page and blocks until its result is back """
+
+    from PyQt5.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    result = []
+
+    def callback(value):
+        result.append(value)
+        loop.quit()
+
+    QTimer.singleShot(timeoutMs, loop.quit)
+    page.runJavaScript(code, callback)
+    loop.exec_()
+    return result[0] if result else None
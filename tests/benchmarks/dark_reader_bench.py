@@ -0,0 +1,85 @@
+# Compares DarkReader injection strategies on local fixture pages:
+#   - per load: the script is sent through runJavaScript after every loadFinished (previous behaviour)
+#   - profile: the script is registered once as a profile QWebEngineScript (current behaviour)
+# Measures the time from load() until the page is dark
+#
+# Usage: python tests/benchmarks/dark_reader_bench.py [repeat] [-o result.json]
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import bench_utils
+from bench_utils import qtApp, waitForLoad, runJs, summary, report
+
+IS_DARK = "!!document.querySelector('style.darkreader')"
+
+
+def buildFixtures(folder: str) -> list:
+    pages = [os.path.join(bench_utils.TESTS, 'simple-test.html')]
+    for size in (50, 500):
+        path = os.path.join(folder, 'page-%d.html' % size)
+        rows = ''.join('<tr><td>Row %d</td><td style="background: #fff; color: #333">Value %d</td></tr>' % (i, i)
+                       for i in range(size))
+        with open(path, 'w') as f:
+            f.write('<html><head><style>body { background: white; }</style></head>'
+                    '<body><table>%s</table></body></html>' % rows)
+        pages.append(path)
+    return pages
+
+
+def perLoadInjection(view, url, source) -> float:
+    from src.browser_engine import DARK_READER_SETUP
+
+    start = time.perf_counter()
+    waitForLoad(view, url)
+    runJs(view.page(), source)
+    runJs(view.page(), DARK_READER_SETUP)
+    runJs(view.page(), IS_DARK)
+    return (time.perf_counter() - start) * 1000
+
+
+def profileInjection(view, url) -> float:
+    start = time.perf_counter()
+    waitForLoad(view, url)
+    runJs(view.page(), IS_DARK)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 10
+    outFile = sys.argv[sys.argv.index('-o') + 1] if '-o' in sys.argv else None
+
+    qtApp()
+    from PyQt5.QtCore import QUrl
+    from src.browser_engine import AwWebEngine
+
+    with open(os.path.join(bench_utils.ROOT, 'src', 'resources', 'darkreader.js')) as f:
+        source = f.read()
+
+    folder = tempfile.mkdtemp(prefix='awb-bench-')
+    results = {}
+    try:
+        urls = [QUrl.fromLocalFile(p) for p in buildFixtures(folder)]
+        view = AwWebEngine()
+
+        for url in urls:
+            name = os.path.basename(url.toLocalFile())
+            waitForLoad(view, url)
+            results['per load / ' + name] = summary([perLoadInjection(view, url, source) for _ in range(repeat)])
+
+        AwWebEngine.enableDarkReader()
+        for url in urls:
+            name = os.path.basename(url.toLocalFile())
+            waitForLoad(view, url)
+            results['profile / ' + name] = summary([profileInjection(view, url) for _ in range(repeat)])
+
+        report('DarkReader: load until dark', results, outFile)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+# Compares ways of showing field changes on the editor, for a note type with 30 fields
+# (each one with ~2 KB of HTML) and a browser-compatibility paste filling 5 of them:
+#   - setNote per match: the whole note reloaded after each field changed (previous behaviour)
+#   - setNote once: the whole note reloaded once
+#   - FieldUpdater: only the changed fields, with one script (current behaviour)
+# The editor is a local page built like Anki's legacy editor: setFields() renders every field again.
+# Measures the time until the page is updated, plus the scripts sent (calls and size).
+# Without QtWebEngine only the scripts are reported.
+#
+# Usage: python tests/benchmarks/field_update_bench.py [repeat] [-o result.json]
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import bench_utils  # noqa: F401 (sets the path)
+from bench_utils import qtApp, waitForLoad, runJs, summary, report
+
+from src.field_updater import FieldUpdater
+
+FIELDS = 30
+CHANGED = 5
+
+EDITOR_PAGE = """
+<html><body><div id="fields"></div>
+<script>
+function setFields(fields) {
+    var html = '';
+    for (var i = 0; i < fields.length; i++) {
+        html += '<div class="fname">' + fields[i][0] + '</div>' +
+                '<div id="f' + i + '" contenteditable="true" class="field">' + fields[i][1] + '</div>';
+    }
+    document.getElementById('fields').innerHTML = html;
+}
+</script></body></html>
+"""
+
+
+def fieldHtml(index: int) -> str:
+    return ''.join('<div><b>Field {}</b> line {} with <i>some</i> text &amp; more</div>'.format(index, line)
+                   for line in range(30))
+
+
+class RecordingEditor:
+    """ Collects the scripts an editor would receive. setNote sends every field, as Anki's loadNote does """
+
+    def __init__(self):
+        self.note = type('Note', (), {'fields': [fieldHtml(i) for i in range(FIELDS)]})()
+        self.web = self
+        self.scripts = []
+
+    def evalWithCallback(self, script, callback):
+        self.scripts.append(script)
+        callback(True)
+
+    def setNote(self, note):
+        self.scripts.append('setFields(%s);' % json.dumps([['Field %d' % i, value]
+                                                           for i, value in enumerate(note.fields)]))
+
+
+def changes() -> list:
+    return [(i, 'Yes %d' % i) for i in range(CHANGED)]
+
+
+def setNotePerMatch(editor):
+    for index, value in changes():
+        editor.note.fields[index] = value
+        editor.setNote(editor.note)
+
+
+def setNoteOnce(editor):
+    for index, value in changes():
+        editor.note.fields[index] = value
+    editor.setNote(editor.note)
+
+
+def fieldUpdater(editor):
+    fields = FieldUpdater(editor)
+    for index, value in changes():
+        fields.set(index, value)
+    fields.commit()
+
+
+CASES = [('setNote per match', setNotePerMatch), ('setNote once', setNoteOnce), ('FieldUpdater', fieldUpdater)]
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 20
+    outFile = sys.argv[sys.argv.index('-o') + 1] if '-o' in sys.argv else None
+
+    scripts = {}
+    results = {}
+    for name, case in CASES:
+        editor = RecordingEditor()
+        case(editor)
+        scripts[name] = editor.scripts
+        results[name] = {'js_calls': len(editor.scripts), 'js_kb': round(sum(map(len, editor.scripts)) / 1024, 1)}
+
+    try:
+        qtApp()
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
+    except ImportError as e:
+        report('Field updates, {} fields (scripts only: {})'.format(FIELDS, e), results, outFile)
+        return
+
+    from PyQt5.QtCore import QUrl
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'editor.html')
+    with open(path, 'w') as f:
+        f.write(EDITOR_PAGE)
+    view = QWebEngineView()
+    waitForLoad(view, QUrl.fromLocalFile(path))
+    page = view.page()
+    initial = RecordingEditor()
+    initial.setNote(initial.note)
+
+    for name, _ in CASES:
+        times = []
+        for _ in range(repeat):
+            runJs(page, initial.scripts[0] + 'true')     # back to the note as loaded
+            start = time.perf_counter()
+            for script in scripts[name]:
+                runJs(page, script)
+            times.append((time.perf_counter() - start) * 1000)
+        results[name].update(summary(times))
+
+    os.remove(path)
+    os.rmdir(folder)
+    report('Field updates, {} fields, {} changed'.format(FIELDS, CHANGED), results, outFile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+# Micro benchmarks for the add-on's hot paths, on Qt's offscreen platform with the anki_mocks_test stubs:
+#   - config.load / config.save: ConfigService reading and writing config.json (50 providers)
+#   - query.filter: BaseController._filterQueryValue on a field with HTML, cloze and filtered words
+#   - menu.providers.cold / .warm: ProviderSelectionController.showCustomMenu, rebuilt or cached
+#   - menu.context: AwBrowserMenu.createCtxMenu (not shown)
+#   - browser.construct / browser.addTab: AwBrowser construction and add_new_tab
+# Reports time per call and allocations (tracemalloc), and compares them with a stored baseline.
+# Cases needing QtWebEngine are reported as skipped when it can't be loaded.
+# Timings depend on the machine, so the baseline is not kept on the repository: take it on the machine used
+# for comparing, before the change reviewed. It needs every case, so QtWebEngine must be available.
+#
+# Usage: python tests/benchmarks/hot_paths_bench.py [repeat] [-o result.json] [--baseline file]
+#                                                   [--update-baseline] [--check]
+#   --update-baseline  stores this run as the baseline (default tests/benchmarks/baseline.json).
+#                      Refused when a case was skipped
+#   --check            exits with 1 when a case is slower or allocates more than the baseline by over 25%,
+#                      or when a case was skipped. Cases missing from the baseline are only warned about
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import bench_utils
+from bench_utils import qtApp, timeIt, summary, allocations, compareWithBaseline, notCompared, report
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'baseline.json')
+FIELD = '<div>The&nbsp;<b>{{c1::quick::adj}}</b> brown fox</div><br>jumps over the lazy dog &amp; a cat'
+
+
+def providers(count=50) -> list:
+    return [{'name': 'Provider %d' % i, 'url': 'https://site%d.com/search?q={}' % i} for i in range(count)]
+
+
+# ---------------------------------- Cases ----------------------------------
+# Each one prepares what it needs and returns the function measured
+
+def configLoad(folder):
+    import src.config as config
+    config.currentLocation = folder
+    service = config.ConfigService()
+    service.save(config.ConfigHolder(providers=providers()))
+    return service.load
+
+
+def configSave(folder):
+    import src.config as config
+    config.currentLocation = folder
+    service = config.ConfigService()
+    holder = config.ConfigHolder(providers=providers())
+    return lambda: service.save(holder)
+
+
+def queryFilter(folder):
+    import src.config as config
+    from src.base_controller import BaseController
+    config.service._config = config.ConfigHolder(providers=providers(), filteredWords=['the', 'a'])
+    controller = BaseController(None)
+    return lambda: controller._filterQueryValue(FIELD)
+
+
+def providersMenu(cached: bool):
+    def case(folder):
+        import src.config as config
+        from PyQt5.QtCore import QCoreApplication, QEvent
+        from PyQt5.QtWidgets import QMenu
+        from src.provider_selection import ProviderSelectionController
+        config.service._config = config.ConfigHolder(providers=providers())
+        controller = ProviderSelectionController()
+        controller._providerList = config.service._config.providers
+
+        def show():
+            if not cached:
+                config.service.version += 1
+            parent = QMenu()
+            controller.showCustomMenu(parent, lambda url: None)
+            parent.deleteLater()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        return show
+    return case
+
+
+def contextMenu(folder):
+    from PyQt5.QtCore import QPoint
+    from anki_mocks_test import MockWebEngine
+    import src.browser_context_menu as ctxMenu
+
+    class NotShownMenu(ctxMenu.QMenu):
+        def exec_(self, *args):
+            self.deleteLater()
+
+    class Event:
+        def pos(self):
+            return QPoint(10, 10)
+
+    ctxMenu.QMenu = NotShownMenu
+    menu = ctxMenu.AwBrowserMenu([ctxMenu.StandardMenuOption('Open in new tab', lambda value: None)])
+    menu._web = MockWebEngine()
+    menu._fields = {i: 'Field %d' % i for i in range(8)}
+    return lambda: menu.createCtxMenu('selected text', True, Event())
+
+
+def browserConstruct(folder):
+    import src.config as config
+    from src.browser import AwBrowser
+    config.service._config = config.ConfigHolder(providers=providers(), cachePath=folder)
+
+    def construct():
+        browser = AwBrowser(None, (850, 500))
+        browser._lifecycleTimer.stop()
+        browser.deleteLater()
+    return construct
+
+
+def browserAddTab(folder):
+    import src.config as config
+    from PyQt5.QtCore import QUrl
+    from src.browser import AwBrowser
+    config.service._config = config.ConfigHolder(providers=providers(), cachePath=folder)
+    browser = AwBrowser(None, (850, 500))
+    browser.add_new_tab(QUrl('about:blank'))
+
+    def addTab():
+        browser.add_new_tab(QUrl('about:blank'))
+        browser.close_current_tab(browser._tabs.count() - 1)
+    return addTab
+
+
+CASES = [
+    ('config.load', configLoad),
+    ('config.save', configSave),
+    ('query.filter', queryFilter),
+    ('menu.providers.cold', providersMenu(False)),
+    ('menu.providers.warm', providersMenu(True)),
+    ('menu.context', contextMenu),
+    ('browser.construct', browserConstruct),
+    ('browser.addTab', browserAddTab),
+]
+
+
+def run(repeat: int) -> dict:
+    qtApp()
+    results = {}
+    for name, case in CASES:
+        folder = tempfile.mkdtemp()
+        try:
+            fn = case(folder)
+        except ImportError as e:
+            results[name] = {'status': 'skipped ({})'.format(e)}
+            shutil.rmtree(folder, ignore_errors=True)
+            continue
+
+        values = summary(timeIt(fn, repeat))
+        values.update(allocations(fn))
+        values['status'] = 'ok'
+        results[name] = values
+        shutil.rmtree(folder, ignore_errors=True)
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    outFile = args[args.index('-o') + 1] if '-o' in args else None
+    baselineFile = args[args.index('--baseline') + 1] if '--baseline' in args else DEFAULT_BASELINE
+    repeat = int(args[0]) if args and args[0].isdigit() else 50
+
+    results = run(repeat)
+    report('Hot paths ({} runs)'.format(repeat), results, outFile)
+
+    if '--update-baseline' in args:
+        skipped = ['{} ({})'.format(name, values['status']) for name, values in results.items()
+                   if values['status'] != 'ok']
+        if skipped:
+            print('Baseline not saved, cases skipped: {}'.format(', '.join(skipped)))
+            sys.exit(1)
+        with open(baselineFile, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('Baseline saved on', baselineFile)
+        return
+
+    if not os.path.isfile(baselineFile):
+        print('No baseline on {} (use --update-baseline)'.format(baselineFile))
+        return
+    with open(baselineFile) as f:
+        baseline = json.load(f)
+    regressions = compareWithBaseline(results, baseline)
+    skipped, warnings = notCompared(results, baseline)
+    print('Compared with', baselineFile)
+    for line in regressions or ['No regressions']:
+        print('  ' + line)
+    for title, lines in (('Not compared, skipped:', skipped), ('Warning, not compared:', warnings)):
+        if lines:
+            print(title)
+            for line in lines:
+                print('  ' + line)
+    if (regressions or skipped) and '--check' in args:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
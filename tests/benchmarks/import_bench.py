@@ -0,0 +1,75 @@
+# Measures how long the add-on modules take to import, using python -X importtime
+# Each module is imported on a fresh interpreter, with the Qt modules Anki has already loaded imported first.
+# For each module reports the cumulative import time, the time spent on the add-on's own modules and
+# which heavy modules (QtWebEngine, browser, dialogs) it pulled in. Those should only load on first use
+#
+# Usage: python tests/benchmarks/import_bench.py [repeat] [-o result.json] [module ...]
+# Modules needing Anki (e.g. src.review_controller) are reported as skipped when it's not installed
+
+import os
+import statistics
+import subprocess
+import sys
+
+import bench_utils
+from bench_utils import report
+
+DEFAULT_MODULES = ['src.review_controller', 'src.base_controller', 'src.config', 'src.browser']
+ALREADY_LOADED = 'import PyQt5.QtCore, PyQt5.QtGui, PyQt5.QtWidgets'
+HEAVY_MODULES = ('PyQt5.QtWebEngineWidgets', 'PyQt5.QtWebEngineCore', 'src.browser', 'src.browser_engine',
+                 'src.config_view', 'src.config_dialog', 'src.no_selection_view', 'src.batch_lookup')
+
+
+def parseImportTime(stderr: str) -> dict:
+    """ Returns {module: (self us, cumulative us)} from the -X importtime output """
+
+    result = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        selfUs, cumulativeUs, name = line[len('import time:'):].split('|')
+        result[name.strip()] = (int(selfUs), int(cumulativeUs))
+    return result
+
+
+def measure(module: str):
+    # The package __init__ sets the add-on up, which needs Anki; the modules are measured on their own
+    code = '{}; import sys, types; sys.modules["src"] = types.ModuleType("src"); ' \
+           'sys.modules["src"].__path__ = ["src"]; import {}'.format(ALREADY_LOADED, module)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=bench_utils.ROOT,
+                          stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, universal_newlines=True)
+    if proc.returncode != 0:
+        return None
+    return parseImportTime(proc.stderr)
+
+
+def main():
+    args = sys.argv[1:]
+    outFile = None
+    if '-o' in args:
+        outFile = args[args.index('-o') + 1]
+        del args[args.index('-o'):args.index('-o') + 2]
+    repeat = int(args.pop(0)) if args and args[0].isdigit() else 5
+    modules = args or DEFAULT_MODULES
+
+    results = {}
+    for module in modules:
+        runs = [measure(module) for _ in range(repeat)]
+        if any(r is None for r in runs):
+            results[module] = {'status': 'skipped (import failed, missing dependency?)'}
+            continue
+
+        results[module] = {
+            'status': 'ok',
+            'cumulative_ms': round(statistics.median(r[module][1] for r in runs) / 1000, 2),
+            'own_modules_ms': round(statistics.median(
+                sum(s for name, (s, _) in r.items() if name.startswith('src.')) for r in runs) / 1000, 2),
+            'own_modules': len([name for name in runs[0] if name.startswith('src.')]),
+            'heavy_loaded': sorted(name for name in runs[0] if name in HEAVY_MODULES and name != module),
+        }
+
+    report('Import time ({} runs, median)'.format(repeat), results, outFile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# Measures the cost of the request interceptor for each sub resource
+# Loads a local page with many images, with and without a (no-op) interception rule
+#
+# Usage: python tests/benchmarks/interceptor_bench.py [images] [repeat] [-o result.json]
+
+import os
+import shutil
+import sys
+import tempfile
+
+import bench_utils
+from bench_utils import qtApp, waitForLoad, summary, report
+
+
+def buildFixture(folder: str, images: int) -> str:
+    source = os.path.join(bench_utils.ROOT, 'src', 'assets', 'select-all.png')
+    tags = []
+    for i in range(images):
+        shutil.copyfile(source, os.path.join(folder, 'img%d.png' % i))
+        tags.append('<img src="img%d.png" />' % i)
+
+    page = os.path.join(folder, 'index.html')
+    with open(page, 'w') as f:
+        f.write('<html><body>%s</body></html>' % '\n'.join(tags))
+    return page
+
+
+def main():
+    images = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 500
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 10
+    outFile = sys.argv[sys.argv.index('-o') + 1] if '-o' in sys.argv else None
+
+    qtApp()
+    from PyQt5.QtCore import QUrl
+    from src.browser_engine import AwWebEngine
+
+    calls = []
+
+    def noopRule(info):
+        calls.append(1)
+
+    folder = tempfile.mkdtemp(prefix='awb-bench-')
+    try:
+        url = QUrl.fromLocalFile(buildFixture(folder, images))
+        view = AwWebEngine()
+        waitForLoad(view, url)      # warm up
+
+        noRule = [waitForLoad(view, url) for _ in range(repeat)]
+
+        AwWebEngine.interceptor().addRule(noopRule)
+        withRule = [waitForLoad(view, url) for _ in range(repeat)]
+        AwWebEngine.interceptor().removeRule(noopRule)
+
+        requests = max(1, len(calls) // repeat)
+        noRuleSummary = summary(noRule)
+        withRuleSummary = summary(withRule)
+        perRequest = (withRuleSummary['median_ms'] - noRuleSummary['median_ms']) * 1000 / requests
+
+        report('Request interception (%d images)' % images, {
+            'no interceptor installed': noRuleSummary,
+            'interceptor with no-op rule': withRuleSummary,
+            'intercepted requests per load': requests,
+            'overhead per request (us)': round(perRequest, 2),
+        }, outFile)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
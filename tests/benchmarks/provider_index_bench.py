@@ -0,0 +1,74 @@
+# Measures the provider search used by the launcher: building the index, and each keystroke
+# while typing a few queries (the time the list takes to filter), with thousands of providers
+# and a usage ranking with some history. The target is under 1 ms per keystroke
+#
+# Usage: python tests/benchmarks/provider_index_bench.py [providers] [-o result.json]
+
+import random
+import sys
+import time
+
+import bench_utils  # noqa: F401 (sets the path)
+from bench_utils import summary, report
+
+from src.config import ConfigHolder
+from src.provider_index import ProviderIndex, FrecencyRanking
+
+WORDS = ['google', 'images', 'forvo', 'dictionary', 'cambridge', 'translate', 'wiki', 'oxford', 'reverso',
+         'context', 'jisho', 'naver', 'linguee', 'collins', 'merriam', 'webster', 'thesaurus', 'urban',
+         'pinterest', 'youtube', 'sentence', 'examples', 'kanji', 'pronunciation', 'etymology', 'synonyms']
+QUERIES = ['cambridge dictionary', 'goo ima', 'pronunciation', 'wiki', 'ja']
+
+
+def buildProviders(count: int) -> list:
+    rnd = random.Random(7)
+    providers = []
+    for i in range(count):
+        words = rnd.sample(WORDS, 3)
+        name = ' '.join(w.capitalize() for w in words[:2]) + ' %d' % i
+        url = 'https://www.{}.com/{}/search?q={{}}&id={}'.format(words[0], words[2], i)
+        providers.append(ConfigHolder.Provider(name, url))
+    return providers
+
+
+def typing(index: ProviderIndex, query: str) -> list:
+    """ Searches every prefix of query, as typed. Returns each keystroke time in ms """
+
+    times = []
+    for end in range(len(query) + 1):
+        start = time.perf_counter()
+        index.search(query[:end], 15)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    args = sys.argv[1:]
+    outFile = None
+    if '-o' in args:
+        outFile = args[args.index('-o') + 1]
+        del args[args.index('-o'):args.index('-o') + 2]
+    counts = [int(args[0])] if args else [50, 1000, 5000]
+
+    results = {}
+    for count in counts:
+        providers = buildProviders(count)
+        ranking = FrecencyRanking(None)
+        for provider in random.Random(3).sample(providers, min(count, 200)):
+            ranking.record(provider.url)
+
+        start = time.perf_counter()
+        index = ProviderIndex(providers, ranking)
+        buildMs = (time.perf_counter() - start) * 1000
+
+        keystrokes = []
+        for _ in range(5):
+            for query in QUERIES:
+                keystrokes += typing(index, query)
+        results['%d providers' % count] = dict(summary(keystrokes), build_ms=round(buildMs, 2))
+
+    report('Provider search per keystroke', results, outFile)
+
+
+if __name__ == '__main__':
+    main()
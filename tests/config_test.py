@@ -8,6 +8,10 @@
 
 import sys
 import os
+import json
+import shutil
+import tempfile
+import time
 sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
 
 import unittest
@@ -74,6 +78,36 @@ class ConfigServiceTester(unittest.TestCase):
         except:
             pass
 
+    def test_providerGroups(self):
+        ch = cc.ConfigHolder(providers=[{'name': 'Forvo', 'url': 'https://forvo.com/search/{}/'},
+                                        {'name': 'Wiki', 'url': 'https://en.wiktionary.org/wiki/{}'}],
+                             providerGroups=[{'name': 'Words', 'providers': ['Wiki', 'Removed', 'Forvo']}])
+        self._tested.validate(ch)
+        self.assertEqual(ch.toDict()['providerGroups'], [{'name': 'Words', 'providers': ['Wiki', 'Removed', 'Forvo']}])
+
+        self._tested._config = ch
+        self.assertEqual(['https://en.wiktionary.org/wiki/{}', 'https://forvo.com/search/{}/'],
+                         self._tested.getGroupWebsites(ch.providerGroups[0]))
+
+        ch.providerGroups.append(cc.ConfigHolder.ProviderGroup('Empty', []))
+        with self.assertRaises(ValueError):
+            self._tested.validate(ch)
+
+    def test_queryPipelineSteps(self):
+        self._tested.validate(cc.ConfigHolder(queryPipeline=['stripHtml', 'filterWords']))
+        with self.assertRaises(ValueError):
+            self._tested.validate(cc.ConfigHolder(queryPipeline=['stripHtml', 'translate']))
+
+    def test_tableColumnMapping(self):
+        self._tested.validate(cc.ConfigHolder(tableColumnMapping={'Chrome': 'Chrome version'}))
+        with self.assertRaises(ValueError):
+            self._tested.validate(cc.ConfigHolder(tableColumnMapping={'Chrome': 3}))
+
+    def test_imageJpegQuality(self):
+        self._tested.validate(cc.ConfigHolder(imageJpegQuality=100))
+        with self.assertRaises(ValueError):
+            self._tested.validate(cc.ConfigHolder(imageJpegQuality=0))
+
     def test_valid_urls(self):
         ch = cc.ConfigHolder()
         ch.providers.append(cc.ConfigHolder.Provider('Google', 'https://www.google.com/search?tbm=isch&q={}'))
@@ -129,6 +163,92 @@ class ConfigServiceTester(unittest.TestCase):
         self.assertEqual(850, result[0])
         self.assertEqual(500, result[1])
 
+class ConfigFileTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._location = cc.currentLocation
+        cc.currentLocation = tempfile.mkdtemp()
+        self._tested = cc.ConfigService()
+        self._tested.load()
+        self.received = []
+
+    def tearDown(self) -> None:
+        shutil.rmtree(cc.currentLocation)
+        cc.currentLocation = self._location
+
+    def onChange(self, config):
+        self.received.append(config)
+
+    def writeExternally(self, **changes):
+        with open(cc.currentLocation + '/' + cc.CONFIG_FILE) as f:
+            values = json.load(f)
+        values.update(changes)
+        with open(cc.currentLocation + '/' + cc.CONFIG_FILE, 'w') as f:
+            json.dump(values, f)
+        later = time.time() + 5     # a different modification time, even on coarse file systems
+        os.utime(cc.currentLocation + '/' + cc.CONFIG_FILE, (later, later))
+
+    def test_saveReplacesFile(self):
+        config = self._tested.getConfig()
+        config.enginePoolSize = 4
+        self._tested.subscribe(self.onChange)
+
+        self.assertTrue(self._tested.save(config))
+        self.assertEqual([cc.CONFIG_FILE], os.listdir(cc.currentLocation))
+        self.assertEqual(4, cc.ConfigService().load(False).enginePoolSize)
+        self.assertEqual([config], self.received)
+        self.assertEqual(1, self._tested.version)
+
+    @unittest.skipIf(os.name == 'nt', 'no POSIX permissions')
+    def test_saveKeepsFileMode(self):
+        path = os.path.join(cc.currentLocation, cc.CONFIG_FILE)
+        os.chmod(path, 0o644)
+        self.assertTrue(self._tested.save(self._tested.getConfig()))
+        self.assertEqual(0o644, os.stat(path).st_mode & 0o777)
+
+    def test_ownWriteIsNotReloaded(self):
+        self._tested.subscribe(self.onChange)
+        self.assertFalse(self._tested.reloadIfChanged())
+        self.assertEqual([], self.received)
+
+    def test_externalChangeReloaded(self):
+        self._tested.subscribe(self.onChange)
+        self.writeExternally(filteredWords=['the'])
+
+        self.assertTrue(self._tested.reloadIfChanged())
+        self.assertEqual(['the'], self._tested.getConfig().filteredWords)
+        self.assertEqual(1, len(self.received))
+        self.assertFalse(self._tested.reloadIfChanged())
+
+    def test_sameContentNotReloaded(self):
+        self._tested.subscribe(self.onChange)
+        with open(cc.currentLocation + '/' + cc.CONFIG_FILE, 'rb') as f:
+            content = f.read()
+        with open(cc.currentLocation + '/' + cc.CONFIG_FILE, 'wb') as f:
+            f.write(content)
+
+        self.assertFalse(self._tested.reloadIfChanged())
+        self.assertEqual([], self.received)
+
+    def test_invalidChangeIgnored(self):
+        config = self._tested.getConfig()
+        with open(cc.currentLocation + '/' + cc.CONFIG_FILE, 'w') as f:
+            f.write('{"providers": [')
+
+        self.assertFalse(self._tested.reloadIfChanged())
+        self.assertIs(config, self._tested.getConfig())
+
+    def test_subscriberCanBeCollected(self):
+        tester = ConfigFileTester('onChange')
+        tester.received = []
+        self._tested.subscribe(tester.onChange)
+        del tester
+
+        self.writeExternally(enginePoolSize=3)
+        self.assertTrue(self._tested.reloadIfChanged())
+        self.assertEqual([], self._tested._subscribers)
+
+
 class ConfigControllerTester(unittest.TestCase):
 
     cc.currentLocation = os.path.dirname(os.path.realpath(__file__))
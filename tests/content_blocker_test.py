@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Test code for content_blocker module
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+import src.content_blocker as cb
+
+
+class FakeUrl:
+
+    def __init__(self, value):
+        self.value = value
+
+    def host(self):
+        return self.value.split('/')[2] if '//' in self.value else self.value
+
+    def toString(self):
+        return self.value
+
+
+class FakeRequestInfo:
+    blocked = False
+
+    def __init__(self, url, page, resourceType=4):
+        self._url = FakeUrl(url)
+        self._page = FakeUrl(page)
+        self._type = resourceType
+
+    def requestUrl(self):
+        return self._url
+
+    def firstPartyUrl(self):
+        return self._page
+
+    def resourceType(self):
+        return self._type
+
+    def block(self, value):
+        self.blocked = value
+
+
+class ParseTester(unittest.TestCase):
+
+    def test_hostsFormat(self):
+        domains = cb.parseRules([
+            '# comment',
+            '127.0.0.1 localhost',
+            '0.0.0.0 ads.example.com',
+            '0.0.0.0 tracker.net # inline comment',
+            'plain-domain.org'
+        ])
+        self.assertEqual({'ads.example.com', 'tracker.net', 'plain-domain.org'}, domains)
+
+    def test_easyListFormat(self):
+        domains = cb.parseRules([
+            '[Adblock Plus 2.0]',
+            '! comment',
+            '||doubleclick.net^',
+            '||adserver.com^$third-party',
+            '||images.com/path/ads^',
+            '||scripts.com^$script',
+            '@@||allowed.com^',
+            'example.com##.banner'
+        ])
+        self.assertEqual({'doubleclick.net', 'adserver.com'}, domains)
+
+
+class MatcherTester(unittest.TestCase):
+
+    _tested = cb.DomainMatcher({'ads.com', 'track.example.org'})
+
+    def test_matchesDomainAndSubdomains(self):
+        self.assertTrue(self._tested.matches('ads.com'))
+        self.assertTrue(self._tested.matches('static.ads.com'))
+        self.assertTrue(self._tested.matches('a.track.example.org'))
+
+    def test_doesNotMatchOthers(self):
+        self.assertFalse(self._tested.matches('notads.com'))
+        self.assertFalse(self._tested.matches('example.org'))
+        self.assertFalse(self._tested.matches('com'))
+        self.assertFalse(self._tested.matches(''))
+
+
+class CompileTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.lists = os.path.join(self.folder, 'lists')
+        self.cacheFile = os.path.join(self.folder, 'cache.json')
+        os.mkdir(self.lists)
+        with open(os.path.join(self.lists, 'hosts.txt'), 'w') as f:
+            f.write('0.0.0.0 ads.com\n')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def test_compileAndCache(self):
+        matcher = cb.compileFolder(self.lists, self.cacheFile)
+        self.assertTrue(matcher.matches('x.ads.com'))
+        self.assertTrue(os.path.exists(self.cacheFile))
+
+        with open(os.path.join(self.lists, 'easy.txt'), 'w') as f:
+            f.write('||tracker.net^\n')
+        matcher = cb.compileFolder(self.lists, self.cacheFile)
+        self.assertEqual({'ads.com', 'tracker.net'}, matcher.domains())
+
+    def test_missingFolder(self):
+        matcher = cb.compileFolder(os.path.join(self.folder, 'none'), self.cacheFile)
+        self.assertEqual(0, len(matcher))
+
+
+class BlockerTester(unittest.TestCase):
+
+    def test_blocksAndCounts(self):
+        blocker = cb.ContentBlocker(cb.DomainMatcher({'ads.com'}))
+        page = 'https://site.com/page'
+
+        info = FakeRequestInfo('https://cdn.ads.com/x.js', page, 3)
+        blocker(info)
+        self.assertTrue(info.blocked)
+
+        allowed = FakeRequestInfo('https://site.com/img.png', page)
+        blocker(allowed)
+        self.assertFalse(allowed.blocked)
+
+        self.assertEqual((1, cb.ContentBlocker.ESTIMATED_BYTES[3]), blocker.statsFor(page))
+        self.assertEqual((0, 0), blocker.statsFor('https://other.com'))
+
+    def test_neverBlocksMainFrame(self):
+        blocker = cb.ContentBlocker(cb.DomainMatcher({'ads.com'}))
+        info = FakeRequestInfo('https://ads.com/', 'https://ads.com/', cb.ContentBlocker.MAIN_FRAME)
+        blocker(info)
+        self.assertFalse(info.blocked)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# Testing code for engine_pool module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.engine_pool import AwWebEnginePool
+
+from PyQt5.QtWidgets import QApplication
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class FakeEngine:
+    deleted = False
+
+    def deleteLater(self):
+        self.deleted = True
+
+
+class Tester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.built = []
+
+    def factory(self):
+        engine = FakeEngine()
+        self.built.append(engine)
+        return engine
+
+    def test_missWhenEmpty(self):
+        pool = AwWebEnginePool(self.factory, 2)
+        view = pool.acquire()
+        self.assertIsInstance(view, FakeEngine)
+        self.assertEqual(0, pool.hits)
+        self.assertEqual(1, pool.misses)
+
+    def test_refillAndHit(self):
+        pool = AwWebEnginePool(self.factory, 2)
+        pool._refillOne()
+        pool._refillOne()
+        self.assertEqual(2, pool.available())
+
+        view = pool.acquire()
+        self.assertIn(view, self.built)
+        self.assertEqual(1, pool.hits)
+        self.assertEqual(1, pool.available())
+
+    def test_neverAboveSize(self):
+        pool = AwWebEnginePool(self.factory, 1)
+        pool._refillOne()
+        pool._refillOne()
+        self.assertEqual(1, pool.available())
+        self.assertEqual(1, len(self.built))
+
+    def test_resizeDropsExtraViews(self):
+        pool = AwWebEnginePool(self.factory, 3)
+        for _ in range(3):
+            pool._refillOne()
+        pool.resize(1)
+        self.assertEqual(1, pool.available())
+        self.assertEqual(2, len([e for e in self.built if e.deleted]))
+
+    def test_sizeLimits(self):
+        self.assertEqual(AwWebEnginePool.MAX_SIZE, AwWebEnginePool(self.factory, 100).size)
+        self.assertEqual(0, AwWebEnginePool(self.factory, -1).size)
+
+
+if __name__ == '__main__':
+    unittest.main()
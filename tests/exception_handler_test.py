@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Test code for exception_handler module
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from src import exception_handler
+from src.exception_handler import ExceptionLogWriter, mapParameters, tracebackKey, MAX_LOCAL_LENGTH
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ExceptionLogWriterTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'awb-exception.log')
+        self.clock = Clock()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def read(self, path=None):
+        with open(path or self.path) as f:
+            return f.read()
+
+    def test_writtenInBackground(self):
+        writer = ExceptionLogWriter(self.path, clock=self.clock)
+        self.assertTrue(writer.submit('first\n', 'a'))
+        self.assertTrue(writer.submit('second\n', 'b'))
+        writer.flush()
+        self.assertEqual('first\nsecond\n', self.read())
+
+    def test_repeatedOnlyOncePerInterval(self):
+        writer = ExceptionLogWriter(self.path, repeatInterval=60, clock=self.clock)
+        writer.submit('error\n', 'a')
+        self.assertFalse(writer.submit('error\n', 'a'))
+        self.assertFalse(writer.submit('error\n', 'a'))
+
+        self.clock.now += 61
+        self.assertTrue(writer.submit('error\n', 'a'))
+        writer.flush()
+        self.assertEqual('error\n(Same error 2 more times in the last 61s)\nerror\n', self.read())
+
+    def test_rotated(self):
+        writer = ExceptionLogWriter(self.path, maxBytes=10, backups=2, clock=self.clock)
+        for index in range(4):
+            writer.submit('report %d\n' % index, index)
+        writer.flush()
+
+        self.assertEqual('report 3\n', self.read())
+        self.assertEqual('report 2\n', self.read(self.path + '.1'))
+        self.assertEqual('report 1\n', self.read(self.path + '.2'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+
+    def test_boundedQueue(self):
+        writer = ExceptionLogWriter(self.path, queueSize=2, clock=self.clock)
+        writer._ensureThread = lambda: None     # nothing is written, the queue fills up
+        self.assertTrue(writer.submit('1', 1))
+        self.assertTrue(writer.submit('2', 2))
+        self.assertFalse(writer.submit('3', 3))
+        self.assertEqual(1, writer.dropped)
+
+
+class ReportTester(unittest.TestCase):
+
+    def test_localsTruncated(self):
+        self.assertEqual('short', mapParameters(('field', 'short')))
+        value = mapParameters(('field', 'x' * 10000))
+        self.assertTrue(value.endswith('...(10000 chars)'))
+        self.assertLess(len(value), MAX_LOCAL_LENGTH + 20)
+        self.assertLess(len(mapParameters(('items', list(range(10000))))), MAX_LOCAL_LENGTH)
+
+    def test_sameKeyForSameFailure(self):
+        def fail(value):
+            raise ValueError(value)
+
+        keys = []
+        for value in ('a', 'b'):
+            try:
+                fail(value)
+            except ValueError:
+                keys.append(tracebackKey(*sys.exc_info()[::2]))
+        self.assertEqual(keys[0], keys[1])
+
+    def test_handlerQueuesReport(self):
+        reports = []
+
+        class Writer:
+            path = 'log'
+
+            def submit(self, report, key):
+                reports.append(report)
+
+        original = exception_handler.logWriter
+        exception_handler.logWriter = Writer()
+        try:
+            exception_handler.exceptionHandler(lambda: 1 / 0)()
+        finally:
+            exception_handler.logWriter = original
+        self.assertEqual(1, len(reports))
+        self.assertIn('ZeroDivisionError', reports[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
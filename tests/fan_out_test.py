@@ -0,0 +1,80 @@
+# Testing code for fan_out module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.fan_out import FanOut
+
+
+class Tab:
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Tester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.started = []
+        self.tabs = [Tab(name) for name in 'abcd']
+
+    def fanOut(self, maxConcurrent=2) -> FanOut:
+        fanOut = FanOut(self.tabs, self.started.append, maxConcurrent, defer=lambda delay, fn: None)
+        fanOut.begin()
+        return fanOut
+
+    def test_concurrencyIsBounded(self):
+        fanOut = self.fanOut(maxConcurrent=2)
+        self.assertEqual(self.tabs[:2], self.started)
+
+        fanOut.finished(self.tabs[1], True)
+        self.assertEqual(self.tabs[:3], self.started)
+
+    def test_firstLoadedOnly(self):
+        fanOut = self.fanOut()
+        self.assertFalse(fanOut.finished(self.tabs[0], False))     # failed
+        self.assertTrue(fanOut.finished(self.tabs[1], True))
+        self.assertFalse(fanOut.finished(self.tabs[2], True))
+        self.assertIs(self.tabs[1], fanOut.first)
+        self.assertFalse(fanOut.finished(self.tabs[1], True))      # reported twice
+
+    def test_combinedProgress(self):
+        fanOut = self.fanOut()
+        self.assertEqual(0, fanOut.combinedProgress())
+        fanOut.progress(self.tabs[0], 50)
+        fanOut.progress(self.tabs[1], 30)
+        self.assertEqual(20, fanOut.combinedProgress())
+
+        fanOut.finished(self.tabs[0], True)
+        fanOut.progress(self.tabs[0], 10)      # late signal, ignored
+        self.assertEqual(32, fanOut.combinedProgress())
+
+        for tab in self.tabs[1:]:
+            self.assertFalse(fanOut.isDone())
+            fanOut.finished(tab, True)
+        self.assertTrue(fanOut.isDone())
+        self.assertEqual(100, fanOut.combinedProgress())
+
+    def test_removedTabs(self):
+        fanOut = self.fanOut()
+        fanOut.remove(self.tabs[3])     # waiting: never started
+        fanOut.remove(self.tabs[0])     # loading: its place goes to the next one
+        self.assertEqual(self.tabs[:3], self.started)
+        self.assertNotIn(self.tabs[0], fanOut)
+
+        fanOut.finished(self.tabs[1], True)
+        fanOut.finished(self.tabs[2], True)
+        self.assertTrue(fanOut.isDone())
+
+    def test_cancel(self):
+        fanOut = self.fanOut()
+        self.assertEqual(self.tabs[:2], fanOut.cancel())
+        fanOut.finished(self.tabs[0], True)
+        self.assertEqual(self.tabs[:2], self.started)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Test code for field_updater module
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from src.field_updater import FieldUpdater
+
+
+class FakeNote:
+
+    def __init__(self, count):
+        self.fields = ['field %d' % i for i in range(count)]
+
+
+class FakeWeb:
+
+    def __init__(self, updated=True):
+        self.scripts = []
+        self.updated = updated
+
+    def evalWithCallback(self, script, callback):
+        self.scripts.append(script)
+        callback(self.updated)
+
+
+class FakeEditor:
+
+    def __init__(self, updated=True):
+        self.note = FakeNote(30)
+        self.web = FakeWeb(updated)
+        self.notesSet = 0
+
+    def setNote(self, note):
+        self.notesSet += 1
+
+
+class FieldUpdaterTester(unittest.TestCase):
+
+    def test_changesSentTogether(self):
+        editor = FakeEditor()
+        fields = FieldUpdater(editor)
+        fields.set(2, '<b>two</b>')
+        fields.set(5, 'five')
+        fields.set(2, 'two')
+        self.assertEqual('two', editor.note.fields[2])
+        self.assertEqual([], editor.web.scripts)
+
+        done = []
+        fields.commit(lambda: done.append(True))
+        self.assertEqual(1, len(editor.web.scripts))
+        self.assertIn(json.dumps({'2': 'two', '5': 'five'}), editor.web.scripts[0])
+        self.assertEqual([True], done)
+        self.assertEqual(0, editor.notesSet)
+
+    def test_reloadsNoteWhenPageNotUpdated(self):
+        editor = FakeEditor(updated=False)
+        fields = FieldUpdater(editor)
+        fields.set(0, 'zero')
+        fields.set(1, 'one')
+        fields.commit()
+        self.assertEqual(1, editor.notesSet)
+
+    def test_nothingChanged(self):
+        editor = FakeEditor()
+        done = []
+        FieldUpdater(editor).commit(lambda: done.append(True))
+        self.assertEqual([], editor.web.scripts)
+        self.assertEqual([True], done)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# Test code for image_import module
+
+import sys
+import os
+import hashlib
+import io
+import shutil
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QCoreApplication
+from PyQt5.QtGui import QImage, QColor
+from PyQt5.QtWidgets import QApplication
+
+from src.image_import import ImageImporter, ImageJob, imageType, shrink
+
+app = QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def pngData(width, height, alpha=False) -> bytes:
+    image = QImage(width, height, QImage.Format_ARGB32 if alpha else QImage.Format_RGB32)
+    image.fill(QColor(10, 120, 200, 100 if alpha else 255))
+    array = QByteArray()
+    buffer = QBuffer(array)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(array)
+
+
+class Response(io.BytesIO):
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.headers = {'Content-Length': str(len(data))}
+
+
+class ImageImportTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.served = {}
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def importer(self, maxDimension=0):
+        importer = ImageImporter(self.folder, maxDimension, opener=lambda request: Response(self.served[request.full_url]))
+        importer.CHUNK_SIZE = 100
+        return importer
+
+    def test_imageType(self):
+        self.assertEqual('png', imageType(pngData(2, 2)))
+        self.assertEqual('jpg', imageType(b'\xff\xd8\xff\xe0rest'))
+        self.assertEqual('webp', imageType(b'RIFF\x00\x00\x00\x00WEBPVP8 '))
+        self.assertEqual('svg', imageType(b'<?xml version="1.0"?>\n<svg xmlns="..."></svg>'))
+        self.assertIsNone(imageType(b'<html><body>Not found</body></html>'))
+
+    def test_shrink(self):
+        data = pngData(3000, 1500)
+        small, ext = shrink(data, 'png', 1000, 85)
+        image = QImage.fromData(small)
+        self.assertEqual((1000, 500), (image.width(), image.height()))
+        self.assertEqual('jpg', ext)
+
+        transparent, ext = shrink(pngData(3000, 1500, alpha=True), 'png', 1000, 85)
+        self.assertEqual('png', ext)
+        self.assertEqual(1000, QImage.fromData(transparent).width())
+
+        self.assertEqual((data, 'png'), shrink(data, 'png', 0, 85))
+        self.assertEqual((data, 'png'), shrink(data, 'png', 4000, 85))
+
+    def test_namedByContentHash(self):
+        data = pngData(20, 20)
+        self.served['http://a/image.png'] = data
+        job = ImageJob('http://a/image.png')
+        name = self.importer().importImage(job)
+
+        self.assertEqual(hashlib.sha1(data).hexdigest() + '.png', name)
+        self.assertEqual(data, job.data)
+        self.assertEqual([], os.listdir(self.folder))      # written by the caller, through Anki
+
+    def test_existingMediaReused(self):
+        data = pngData(20, 20)
+        with open(os.path.join(self.folder, 'cat.png'), 'wb') as f:
+            f.write(data)
+        with open(os.path.join(self.folder, 'other.png'), 'wb') as f:
+            f.write(pngData(21, 20))
+        self.served['http://a/x.png'] = data
+
+        job = ImageJob('http://a/x.png')
+        self.assertEqual('cat.png', self.importer().importImage(job))
+        self.assertIsNone(job.data)
+
+    def test_indexSeesFilesAddedLater(self):
+        importer = self.importer()
+        self.served['http://a/x.png'] = data = pngData(20, 20)
+        self.assertIsNotNone(importer.importImage(ImageJob('http://a/x.png')))
+
+        with open(os.path.join(self.folder, 'dog.png'), 'wb') as f:
+            f.write(data)
+        folderTime = os.stat(self.folder).st_mtime + 1
+        os.utime(self.folder, (folderTime, folderTime))
+        self.assertEqual('dog.png', importer.importImage(ImageJob('http://a/x.png')))
+
+        os.remove(os.path.join(self.folder, 'dog.png'))
+        hashName = hashlib.sha1(data).hexdigest() + '.png'
+        with open(os.path.join(self.folder, hashName), 'wb') as f:
+            f.write(data)
+        job = ImageJob('http://a/x.png')
+        self.assertEqual(hashName, importer.importImage(job))
+        self.assertIsNone(job.data)
+
+    def test_notAnImage(self):
+        self.served['http://a/page'] = b'<html></html>'
+        with self.assertRaises(ValueError):
+            self.importer().importImage(ImageJob('http://a/page'))
+
+    def test_cancelled(self):
+        self.served['http://a/x.png'] = pngData(20, 20)
+        job = ImageJob('http://a/x.png')
+        job.cancel()
+        self.assertIsNone(self.importer().importImage(job))
+        self.assertEqual([], os.listdir(self.folder))
+
+    def test_signalsInBackground(self):
+        self.served['http://a/x.png'] = pngData(50, 50)
+        importer = self.importer()
+        finished, progress = [], []
+        importer.finished.connect(lambda job, name: finished.append((job.context, name)))
+        importer.progress.connect(lambda job, received, total: progress.append((received, total)))
+
+        importer.download('http://a/x.png', 'note')
+        deadline = time.time() + 5
+        while not finished and time.time() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.01)
+        importer.shutdown()
+
+        self.assertEqual('note', finished[0][0])
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# Testing code for lazy module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.lazy import LazyObject
+
+
+class Window:
+
+    def __init__(self):
+        self.title = 'window'
+
+    def open(self, value):
+        return 'opened ' + value
+
+
+class Tester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.built = []
+
+    def factory(self):
+        self.built.append(1)
+        return Window()
+
+    def test_builtOnFirstUse(self):
+        lazy = LazyObject(self.factory, 'Window')
+        self.assertFalse(lazy.isBuilt())
+        self.assertFalse(lazy)
+        self.assertEqual([], self.built)
+
+        self.assertEqual('opened page', lazy.open('page'))
+        self.assertEqual('window', lazy.title)
+        self.assertTrue(lazy)
+        self.assertEqual([1], self.built)
+
+    def test_setAttributeGoesToInstance(self):
+        lazy = LazyObject(self.factory)
+        lazy.title = 'other'
+        self.assertEqual('other', lazy.instance().title)
+        self.assertEqual(1, len(self.built))
+
+    def test_onBuild(self):
+        calls = []
+        lazy = LazyObject(self.factory, 'Window', lambda name, ms: calls.append((name, ms >= 0)))
+        lazy.instance()
+        lazy.instance()
+        self.assertEqual([('Window', True)], calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# Testing code for load_scheduler module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.load_scheduler import LoadScheduler
+
+
+class Tester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.started = []
+        self.deferred = []
+
+    def scheduler(self, maxConcurrent=2, hostInterval=1.0) -> LoadScheduler:
+        return LoadScheduler(self.started.append, maxConcurrent, hostInterval,
+                             clock=lambda: self.now, defer=lambda delay, fn: self.deferred.append((delay, fn)))
+
+    def test_concurrencyIsBounded(self):
+        scheduler = self.scheduler(maxConcurrent=2, hostInterval=0)
+        for job in 'abcd':
+            scheduler.submit(job, 'host')
+        self.assertEqual(['a', 'b'], self.started)
+
+        scheduler.finish('a')
+        self.assertEqual(['a', 'b', 'c'], self.started)
+        scheduler.finish('b', ok=False)
+        scheduler.finish('c')
+        scheduler.finish('d')
+        self.assertTrue(scheduler.isIdle())
+        self.assertEqual(3, scheduler.done)
+        self.assertEqual(1, scheduler.failed)
+
+    def test_hostIntervalDoesNotHoldOtherHosts(self):
+        scheduler = self.scheduler(maxConcurrent=3, hostInterval=1.0)
+        scheduler.submit('a1', 'a.com')
+        scheduler.submit('a2', 'a.com')
+        scheduler.submit('b1', 'b.com')
+        self.assertEqual(['a1', 'b1'], self.started)
+        self.assertEqual(1, len(self.deferred))
+        self.assertGreaterEqual(self.deferred[0][0], 1000)
+
+        self.now = 0.5
+        self.deferred.pop()[1]()
+        self.assertEqual(['a1', 'b1'], self.started)
+
+        self.now = 1.0
+        self.deferred.pop()[1]()
+        self.assertEqual(['a1', 'b1', 'a2'], self.started)
+        self.assertEqual([], self.deferred)
+
+    def test_cancel(self):
+        scheduler = self.scheduler(maxConcurrent=1, hostInterval=0)
+        scheduler.submit('a')
+        scheduler.submit('b')
+
+        self.assertEqual(['a'], scheduler.cancel())
+        scheduler.submit('c')
+        scheduler.finish('a')
+        self.assertEqual(['a'], self.started)
+        self.assertTrue(scheduler.isIdle())
+
+    def test_stats(self):
+        scheduler = self.scheduler(maxConcurrent=2, hostInterval=0)
+        scheduler.submit('a')
+        scheduler.submit('b')
+        scheduler.submit('c')
+        self.now = 30.0
+        scheduler.finish('a')
+        scheduler.finish('b')
+
+        stats = scheduler.stats()
+        self.assertEqual(0, stats['pending'])
+        self.assertEqual(1, stats['running'])
+        self.assertEqual(2, stats['done'])
+        self.assertAlmostEqual(4.0, stats['perMinute'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Testing code for note_fields module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.note_fields import fieldNames, fieldIndex, allFieldNames, fieldValues
+
+
+class Note:
+
+    def __init__(self, noteId, names, values):
+        self.id = noteId
+        self._model = {'flds': [{'name': name} for name in names]}
+        self.fields = list(values)
+
+    def model(self):
+        return self._model
+
+
+def basic(noteId, front, back):
+    return Note(noteId, ['Front', 'Back'], [front, back])
+
+
+def vocabulary(noteId, word, meaning, example):
+    return Note(noteId, ['Word', 'Meaning', 'Front'], [word, meaning, example])
+
+
+class Tester(unittest.TestCase):
+
+    def test_fieldIndexByName(self):
+        self.assertEqual(['Front', 'Back'], fieldNames(basic(1, 'a', 'b')))
+        self.assertEqual(0, fieldIndex(basic(1, 'a', 'b'), 'Front'))
+        self.assertEqual(2, fieldIndex(vocabulary(2, 'w', 'm', 'e'), 'Front'))
+        self.assertIsNone(fieldIndex(basic(1, 'a', 'b'), 'Meaning'))
+
+    def test_twoNoteTypes(self):
+        notes = [basic(1, 'dog', 'cão'), vocabulary(2, 'cat', 'gato', 'a cat sat'), basic(3, 'fox', 'raposa')]
+        self.assertEqual(['Front', 'Back', 'Word', 'Meaning'], allFieldNames(notes))
+
+        self.assertEqual([(1, 'dog'), (2, 'a cat sat'), (3, 'fox')],
+                         [(note.id, value) for note, value in fieldValues(notes, 'Front')])
+        self.assertEqual([(1, 'cão'), (3, 'raposa')],
+                         [(note.id, value) for note, value in fieldValues(notes, 'Back')])
+        self.assertEqual([(2, 'gato')], [(note.id, value) for note, value in fieldValues(notes, 'Meaning')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Test code for page_cache module
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from src.page_cache import PageSnapshotStore, folderSize
+
+
+class PageSnapshotStoreTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def test_putAndGet(self):
+        store = PageSnapshotStore(os.path.join(self.folder, 'pages'), 100000)
+        self.assertIsNone(store.get('https://forvo.com/search/word/'))
+
+        store.put('https://forvo.com/search/word/', '<html><body>word</body></html>')
+        self.assertEqual('<html><body>word</body></html>', store.get('https://forvo.com/search/word/'))
+        self.assertIsNone(store.get('https://forvo.com/search/other/'))
+
+    def test_scriptsAreRemoved(self):
+        store = PageSnapshotStore(self.folder, 100000)
+        store.put('url', '<body><SCRIPT type="text/javascript">\nalert(1);\n</script>text</body>')
+        self.assertEqual('<body>text</body>', store.get('url'))
+
+    def test_oldestRemovedOverLimit(self):
+        store = PageSnapshotStore(self.folder, 250)
+        store.put('first', 'a' * 100)
+        old = time.time() - 100
+        os.utime(store._path('first'), (old, old))
+        store.put('second', 'b' * 100)
+        store.put('third', 'c' * 100)
+
+        self.assertIsNone(store.get('first'))
+        self.assertIsNotNone(store.get('third'))
+        self.assertLessEqual(folderSize(self.folder), 250)
+
+    def test_clear(self):
+        store = PageSnapshotStore(os.path.join(self.folder, 'pages'), 100000)
+        store.put('url', 'content')
+        self.assertEqual(7, store.size())
+        store.clear()
+        self.assertEqual(0, store.size())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+# Testing code for preload module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.preload import ProviderPredictor
+
+GOOGLE = 'https://google.com/search?q={}'
+FORVO = 'https://forvo.com/search/{}/'
+
+
+class Tester(unittest.TestCase):
+
+    def test_noHistory(self):
+        self.assertIsNone(ProviderPredictor().predict(1))
+
+    def test_lastProviderWhenNoHistory(self):
+        self.assertEqual(FORVO, ProviderPredictor().predict(1, FORVO))
+
+    def test_mostUsedForNoteType(self):
+        predictor = ProviderPredictor()
+        for _ in range(3):
+            predictor.record(1, GOOGLE)
+        predictor.record(1, FORVO)
+        for _ in range(3):
+            predictor.record(2, FORVO)
+
+        self.assertEqual(GOOGLE, predictor.predict(1))
+        self.assertEqual(GOOGLE, predictor.predict(1, FORVO))
+        self.assertEqual(FORVO, predictor.predict(2, GOOGLE))
+
+    def test_hitRate(self):
+        predictor = ProviderPredictor()
+        predictor.record(1, GOOGLE, GOOGLE)
+        predictor.record(1, FORVO, GOOGLE)
+        predictor.record(1, FORVO)      # nothing predicted
+        self.assertEqual(1, predictor.hits)
+        self.assertEqual(1, predictor.misses)
+        self.assertEqual(0.5, predictor.hitRate())
+
+
+if __name__ == '__main__':
+    unittest.main()
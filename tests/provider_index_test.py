@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Test code for provider_index module
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from PyQt5.QtWidgets import QApplication
+
+from src.config import ConfigHolder
+from src.provider_index import ProviderIndex, FrecencyRanking
+
+app = QApplication.instance() or QApplication(sys.argv[:1])
+
+DAY = 24 * 3600
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def providers():
+    return [ConfigHolder.Provider(name, url) for name, url in (
+        ('Google Web', 'https://google.com/search?q={}'),
+        ('Google Images', 'https://www.google.com/search?tbm=isch&q={}'),
+        ('Forvo', 'https://forvo.com/search/{}/'),
+        ('Cambridge Dictionary', 'https://dictionary.cambridge.org/dictionary/english/{}'),
+        ('Wiktionary', 'https://en.wiktionary.org/wiki/{}'),
+    )]
+
+
+def names(result):
+    return [p.name for p in result]
+
+
+class ProviderIndexTester(unittest.TestCase):
+
+    def test_prefixOfWords(self):
+        index = ProviderIndex(providers())
+        self.assertEqual(['Google Web', 'Google Images'], names(index.search('go')))
+        self.assertEqual(['Google Images'], names(index.search('im')))
+        self.assertEqual([], names(index.search('oo')))    # short words only match the start of a word
+
+    def test_substringAndUrl(self):
+        index = ProviderIndex(providers())
+        self.assertEqual(['Cambridge Dictionary', 'Wiktionary'], names(index.search('tionary')))
+        self.assertEqual(['Google Images'], names(index.search('isch')))
+
+    def test_everyWordMatches(self):
+        index = ProviderIndex(providers())
+        self.assertEqual(['Google Images'], names(index.search('goo ima')))
+        self.assertEqual([], names(index.search('forvo images')))
+
+    def test_typingFiltersPreviousMatches(self):
+        index = ProviderIndex(providers())
+        self.assertEqual(5, len(index.search('')))
+        self.assertEqual(['Cambridge Dictionary'], names(index.search('c')))      # 'com' is not indexed
+        self.assertEqual(['Cambridge Dictionary'], names(index.search('ca')))
+        self.assertEqual(['Cambridge Dictionary'], names(index.search('cam')))
+        self.assertEqual(['Forvo'], names(index.search('f')))
+        # from a word start ('ti') to anywhere ('tio'), the previous matches are not enough
+        self.assertEqual([], names(index.search('ti')))
+        self.assertEqual(['Cambridge Dictionary', 'Wiktionary'], names(index.search('tio')))
+
+    def test_nameStartFirst(self):
+        index = ProviderIndex([ConfigHolder.Provider(name, 'https://example.com/{}') for name in (
+            'English Wiktionary', 'Example', 'Wiktionary')])
+        self.assertEqual(['Wiktionary', 'English Wiktionary'], names(index.search('wik')))
+        self.assertEqual(['Example', 'English Wiktionary', 'Wiktionary'], names(index.search('ex')))
+
+    def test_limit(self):
+        index = ProviderIndex(providers())
+        self.assertEqual(['Google Web', 'Google Images'], names(index.search('', 2)))
+
+    def test_rankedByUsage(self):
+        clock = Clock()
+        ranking = FrecencyRanking(None, clock=clock)
+        index = ProviderIndex(providers(), ranking)
+        ranking.record('https://www.google.com/search?tbm=isch&q={}')
+
+        self.assertEqual(['Google Images', 'Google Web'], names(index.search('google')))
+        self.assertEqual('Google Images', names(index.search(''))[0])
+
+
+class FrecencyRankingTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def test_decay(self):
+        clock = Clock()
+        ranking = FrecencyRanking(None, halfLifeDays=1, clock=clock)
+        ranking.record('a')
+        ranking.record('a')
+        self.assertAlmostEqual(2.0, ranking.score('a'))
+
+        clock.now += DAY
+        self.assertAlmostEqual(1.0, ranking.score('a'))
+        ranking.record('b')
+        self.assertGreater(ranking.score('b'), ranking.score('a') - 0.01)
+        self.assertEqual(0.0, ranking.score('c'))
+
+    def test_persisted(self):
+        path = os.path.join(self.folder, 'usage', 'provider_usage.json')
+        clock = Clock()
+        ranking = FrecencyRanking(path, clock=clock)
+        ranking.record('a')
+        self.assertFalse(os.path.exists(path))      # saved a while later
+        ranking.flush()
+
+        self.assertAlmostEqual(1.0, FrecencyRanking(path, clock=clock).score('a'))
+
+    def test_invalidFileIgnored(self):
+        path = os.path.join(self.folder, 'provider_usage.json')
+        with open(path, 'w') as f:
+            f.write('{not json')
+        self.assertEqual(0.0, FrecencyRanking(path).score('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,8 @@ from anki_mocks_test import *
 sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
 
 from src.provider_selection import ProviderSelectionController
+from src.config import service as cfgService, ConfigHolder
+Provider = ConfigHolder.Provider
 
 from PyQt5.QtWidgets import QMenu, QAction, QApplication
 
@@ -36,6 +38,147 @@ class Tester(unittest.TestCase):
         sc.showCustomMenu(p, FakeBrowser.open)
         self.assertTrue(p.done)
 
+    def test_menuCachedUntilConfigChanges(self):
+        sc = ProviderSelectionController()
+        added = []
+
+        class Parent(QMenu):
+            def addMenu(self, m):
+                added.append(m)
+
+        sc.showCustomMenu(Parent(), FakeBrowser.open)
+        sc.showCustomMenu(Parent(), FakeBrowser.open)
+        self.assertIs(added[0], added[1])
+
+        cfgService.version += 1
+        sc.showCustomMenu(Parent(), FakeBrowser.open)
+        self.assertIsNot(added[1], added[2])
+
+    def test_actionsCallLatestCallback(self):
+        sc = ProviderSelectionController()
+        chosen = []
+        parent = QMenu()
+        sc.showCustomMenu(parent, lambda url: chosen.append(('first', url)))
+        sc.showCustomMenu(parent, lambda url: chosen.append(('second', url)))
+
+        submenu = parent.actions()[-1].menu()
+        ProviderSelectionController.ranking().path = None      # not saved by the test
+        submenu.actions()[0].trigger()
+        self.assertEqual([('second', cfgService.getConfig().providers[0].url)], chosen)
+
+    def test_groupsOnMenu(self):
+        sc = ProviderSelectionController()
+        config = cfgService.getConfig()
+        config.providerGroups = [ConfigHolder.ProviderGroup('Both', [p.name for p in config.providers[:2]])]
+        cfgService.version += 1
+        chosen = []
+        parent = QMenu()
+        sc.showCustomMenu(parent, chosen.append)
+
+        parent.actions()[-1].menu().actions()[-1].trigger()
+        self.assertEqual([config.providerGroups[0]], chosen)
+        config.providerGroups = []
+        cfgService.version += 1
+
+    def test_launcherIndexKeptAndGroups(self):
+        from PyQt5.QtWidgets import QWidget
+        sc = ProviderSelectionController()
+        config = cfgService.getConfig()
+        config.providerGroups = [ConfigHolder.ProviderGroup('Words', [p.name for p in config.providers[:2]])]
+        cfgService.version += 1
+        self.assertIs(sc._getIndex(), ProviderSelectionController()._getIndex())
+        chosen = []
+
+        parent = QWidget()
+        launcher = sc.showLauncher(parent, chosen.append)
+        launcher._input.setText('words')
+        self.assertEqual(1, launcher._results.count())
+        launcher._choose()
+        self.assertEqual([config.providerGroups[0]], chosen)
+
+        index = sc._getIndex()
+        config.providerGroups = []
+        cfgService.version += 1
+        self.assertIsNot(index, sc._getIndex())
+
+    def test_lazySubmenu(self):
+        menu = QMenu()
+        filled = []
+        submenu = ProviderSelectionController.addLazySubmenu(
+            menu, 'More', lambda m: filled.append(m.addAction('item')))
+
+        self.assertEqual([], submenu.actions())
+        submenu.aboutToShow.emit()
+        submenu.aboutToShow.emit()
+        self.assertEqual(1, len(filled))
+        self.assertEqual(['item'], [a.text() for a in submenu.actions()])
+
+    def test_largeListPaged(self):
+        sc = ProviderSelectionController()
+        sc._providerList = [Provider('P%d' % i, 'https://p%d.com/{}' % i) for i in range(45)]
+        cfgService.version += 1
+        parent = QMenu()
+        sc.showCustomMenu(parent, FakeBrowser.open)
+
+        actions = parent.actions()[-1].menu().actions()
+        self.assertEqual(20 + 2, len(actions))
+        self.assertEqual(['More (21-40)', 'More (41-45)'], [a.text() for a in actions[20:]])
+        last = actions[-1].menu()
+        last.aboutToShow.emit()
+        self.assertEqual('(&45) P44', last.actions()[-1].text())
+        cfgService.version += 1
+
+    def test_statsOnMenuAndSortByScore(self):
+        import src.provider_stats as provider_stats
+        stats = provider_stats._shared = provider_stats.ProviderStats(None)
+        ranking = ProviderSelectionController.ranking()
+        ranking.path = None
+        sc = ProviderSelectionController()
+        sc._providerList = [Provider('Slow', 'https://slow.com/{}'), Provider('Fast', 'https://fast.com/{}'),
+                            Provider('Unused', 'https://unused.com/{}')]
+        for url in ('https://slow.com/{}', 'https://fast.com/{}'):
+            ranking.record(url)
+        stats.record('https://slow.com/{}', 9000, True)
+        stats.record('https://fast.com/{}', 500, True)
+        stats.record('https://fast.com/{}', 500, False)
+
+        config = cfgService.getConfig()
+        for sort, expected in ((False, ['Slow', 'Fast', 'Unused']), (True, ['Fast', 'Slow', 'Unused'])):
+            config.sortProvidersByScore = sort
+            parent = QMenu()
+            sc.showCustomMenu(parent, FakeBrowser.open)
+            texts = [a.text() for a in parent.actions()[-1].menu().actions()]
+            self.assertEqual(expected, [t.split(' ')[1].split('\t')[0] for t in texts])
+
+        self.assertIn('\t0.5 s, 50%', texts[0])
+        self.assertNotIn('\t', texts[2])
+        config.sortProvidersByScore = False
+        provider_stats._shared = None
+        cfgService.version += 1
+
+    def test_statsRefreshedOnShow(self):
+        import src.provider_stats as provider_stats
+        stats = provider_stats._shared = provider_stats.ProviderStats(None)
+        sc = ProviderSelectionController()
+        sc._providerList = [Provider('Dict', 'https://dict.com/{}')]
+        cfgService.version += 1
+        added = []
+
+        class Parent(QMenu):
+            def addMenu(self, m):
+                added.append(m)
+
+        sc.showCustomMenu(Parent(), FakeBrowser.open)
+        self.assertEqual('(&1) Dict', added[0].actions()[0].text())
+
+        stats.record('https://dict.com/{}', 1500, True)
+        sc.showCustomMenu(Parent(), FakeBrowser.open)
+        self.assertIs(added[0], added[1])
+        added[1].aboutToShow.emit()
+        self.assertEqual('(&1) Dict\t1.5 s, 100%', added[1].actions()[0].text())
+        provider_stats._shared = None
+        cfgService.version += 1
+
     def selectedWithText(self):
         return 'teste'
 
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Test code for provider_stats module
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from PyQt5.QtWidgets import QApplication
+
+from src.provider_stats import ProviderStats
+
+app = QApplication.instance() or QApplication(sys.argv[:1])
+
+URL = 'https://forvo.com/search/{}/'
+
+
+class ProviderStatsTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def test_movingAverages(self):
+        stats = ProviderStats(None)
+        stats.record(URL, 1000, True)
+        stats.record(URL, 2000, True)
+        stats.record(URL, 50000, False)     # failures don't count on the time
+        stats.recordBytes(URL, 100 * 1024)
+
+        entry = stats.get(URL)
+        self.assertEqual(3, entry['loads'])
+        self.assertEqual(1, entry['failures'])
+        self.assertAlmostEqual(1200, entry['ms'])
+        self.assertAlmostEqual(2 / 3, stats.successRate(URL))
+        self.assertEqual('1.2 s, 100 KB, 67%', stats.label(URL))
+
+    def test_withoutLoads(self):
+        stats = ProviderStats(None)
+        stats.recordBytes(URL, 1024)
+        self.assertIsNone(stats.get(URL))
+        self.assertEqual('', stats.label(URL))
+        self.assertEqual(1.0, stats.weight(URL))
+
+    def test_weight(self):
+        stats = ProviderStats(None)
+        stats.record('fast', 200, True)
+        stats.record('slow', 4000, True)
+        stats.record('failing', 200, False)
+        self.assertGreater(stats.weight('fast'), stats.weight('slow'))
+        self.assertEqual(0.0, stats.weight('failing'))
+
+    def test_versionChanges(self):
+        stats = ProviderStats(None)
+        stats.record(URL, 1000, True)
+        version = stats.version
+        stats.recordBytes(URL, 1024)
+        self.assertGreater(stats.version, version)
+
+    def test_persisted(self):
+        path = os.path.join(self.folder, 'user_files', 'provider_stats.json')
+        stats = ProviderStats(path)
+        stats.record(URL, 1000, True)
+        stats.recordBytes(URL, 2048)
+        self.assertFalse(os.path.exists(path))      # saved a while later, many loads at once
+        stats.flush()
+        self.assertEqual('1.0 s, 2 KB, 100%', ProviderStats(path).label(URL))
+
+    def test_invalidFileIgnored(self):
+        path = os.path.join(self.folder, 'provider_stats.json')
+        with open(path, 'w') as f:
+            f.write('[1, 2')
+        self.assertIsNone(ProviderStats(path).get(URL))
+
+
+if __name__ == '__main__':
+    unittest.main()
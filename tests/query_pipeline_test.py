@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Testing code for query_pipeline module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.config import ConfigHolder
+from src.query_pipeline import QueryPipeline, DEFAULT_STEPS
+
+
+class Tester(unittest.TestCase):
+
+    def test_fieldHtml(self):
+        pipeline = QueryPipeline(DEFAULT_STEPS)
+        self.assertEqual('big dog & cat', pipeline('<div><b>big</b>&nbsp;dog</div><br>&amp; cat'))
+        self.assertEqual('a < b', pipeline('a &lt; b'))
+
+    def test_cloze(self):
+        pipeline = QueryPipeline(DEFAULT_STEPS)
+        self.assertEqual('The capital is Paris', pipeline('The {{c1::capital}} is {{c2::Paris::city}}'))
+
+    def test_unicode(self):
+        pipeline = QueryPipeline(DEFAULT_STEPS)
+        self.assertEqual('ABC 123', pipeline('ＡＢＣ １２３'))
+        self.assertEqual('café', pipeline('café'))
+
+    def test_filteredWords(self):
+        pipeline = QueryPipeline(DEFAULT_STEPS, ['the', 'A', ''])
+        self.assertEqual('dog runs', pipeline('The dog  a runs'))
+        self.assertEqual('', pipeline('the'))
+
+    def test_maxLength(self):
+        pipeline = QueryPipeline(DEFAULT_STEPS, maxLength=10)
+        self.assertEqual('one two', pipeline('one two three'))
+        self.assertEqual('abcdefghij', pipeline('abcdefghijklmno'))
+        self.assertEqual('short', pipeline('short'))
+
+    def test_onlyChosenSteps(self):
+        pipeline = QueryPipeline(['stripHtml', 'unknown'])
+        self.assertEqual(['stripHtml'], pipeline.names)
+        self.assertEqual('&nbsp;{{c1::x}}', pipeline('<i>&nbsp;{{c1::x}}</i>'))
+        self.assertEqual('', pipeline(None))
+
+    def test_fromConfig(self):
+        config = ConfigHolder(filteredWords=['to'], queryMaxLength=0)
+        pipeline = QueryPipeline.fromConfig(config)
+        self.assertEqual(DEFAULT_STEPS, pipeline.names)
+        self.assertEqual('go', pipeline('to <b>go</b>'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+# Testing code for startup_report module
+
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.startup_report import StartupReport
+
+
+class Tester(unittest.TestCase):
+
+    def test_stepsAndTotal(self):
+        ticks = iter([1.0, 1.010, 2.0, 2.005])
+        report = StartupReport(os.devnull, clock=lambda: next(ticks))
+        with report.step('config'):
+            pass
+        with report.step('controllers'):
+            pass
+        report.add('imports', 20)
+
+        self.assertEqual(['config', 'controllers', 'imports'], [name for name, _ in report.steps])
+        self.assertAlmostEqual(35.0, report.total(), places=3)
+
+    def test_deferredNotInTotalAndSaved(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'user_files', 'report.txt')
+            report = StartupReport(path)
+            report.add('controllers', 12.5)
+            report.addDeferred('AwBrowser', 300)
+
+            self.assertEqual(12.5, report.total())
+            with open(path) as f:
+                text = f.read()
+            self.assertIn('Added to Anki startup: 12.5 ms', text)
+            self.assertIn('AwBrowser', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# Testing code for tab_cache module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.tab_cache import TabSet, TabSetCache
+
+
+def tabSet(size: int, context='query') -> TabSet:
+    return TabSet([('widget%d' % i, 'label%d' % i) for i in range(size)], 0, context)
+
+
+class Tester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.disposed = []
+
+    def cache(self, maxTabs=10) -> TabSetCache:
+        return TabSetCache(maxTabs, self.disposed.append)
+
+    def test_putAndTake(self):
+        cache = self.cache()
+        cache.put(1, tabSet(2, 'word'))
+        self.assertIn(1, cache)
+
+        restored = cache.take(1)
+        self.assertEqual('word', restored.context)
+        self.assertEqual(2, len(restored))
+        self.assertNotIn(1, cache)
+        self.assertIsNone(cache.take(1))
+
+    def test_emptySetIsNotKept(self):
+        cache = self.cache()
+        cache.put(1, tabSet(0))
+        self.assertEqual(0, len(cache))
+
+    def test_evictsLeastRecentByTabs(self):
+        cache = self.cache(maxTabs=4)
+        first, second, third = tabSet(2), tabSet(2), tabSet(2)
+        cache.put(1, first)
+        cache.put(2, second)
+        cache.put(3, third)
+
+        self.assertNotIn(1, cache)
+        self.assertEqual([first], self.disposed)
+        self.assertEqual(4, cache.tabCount())
+
+    def test_replacingKeyReleasesOldSet(self):
+        cache = self.cache()
+        old = tabSet(1)
+        cache.put(1, old)
+        cache.put(1, tabSet(1))
+        self.assertEqual([old], self.disposed)
+
+    def test_clear(self):
+        cache = self.cache()
+        cache.put(1, tabSet(1))
+        cache.put(2, tabSet(1))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(2, len(self.disposed))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# Testing code for tab_lifecycle module
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+from src.tab_lifecycle import TabLifecycleManager
+
+
+class Tab:
+
+    isLoading = False
+
+    def __init__(self, name, isPlaceholder=False):
+        self.name = name
+        self.isPlaceholder = isPlaceholder
+
+    def __repr__(self):
+        return self.name
+
+
+class Tester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = 0
+
+    def manager(self, freezeAfter=60, maxTabs=0) -> TabLifecycleManager:
+        return TabLifecycleManager(freezeAfter, maxTabs, clock=lambda: self.now)
+
+    def openTabs(self, manager, count):
+        tabs = []
+        for i in range(count):
+            tab = Tab('tab%d' % i)
+            manager.touch(tab)
+            tabs.append(tab)
+            self.now += 1
+        return tabs
+
+    def test_freezesInactiveTabs(self):
+        manager = self.manager(freezeAfter=60)
+        first, second, current = self.openTabs(manager, 3)
+
+        self.now = 60.5
+        toFreeze, toDiscard = manager.plan([first, second, current], current)
+        self.assertEqual([first], toFreeze)
+        self.assertEqual([], toDiscard)
+
+        manager.frozen(first)
+        self.now = 61.5
+        toFreeze, _ = manager.plan([first, second, current], current)
+        self.assertEqual([second], toFreeze)
+
+    def test_touchUnfreezes(self):
+        manager = self.manager(freezeAfter=10)
+        tab, current = self.openTabs(manager, 2)
+        manager.frozen(tab)
+        self.assertTrue(manager.isFrozen(tab))
+
+        manager.touch(tab)
+        self.assertFalse(manager.isFrozen(tab))
+        self.assertEqual(0, manager.stats()['frozen'])
+
+    def test_discardsOldestOverTabCount(self):
+        manager = self.manager(freezeAfter=0, maxTabs=2)
+        tabs = self.openTabs(manager, 4)
+        manager.touch(tabs[0])      # seen again, now the most recent
+
+        toFreeze, toDiscard = manager.plan(tabs, tabs[0])
+        self.assertEqual([], toFreeze)
+        self.assertEqual([tabs[1], tabs[2]], toDiscard)
+
+    def test_placeholdersNotCounted(self):
+        manager = self.manager(freezeAfter=0, maxTabs=2)
+        tabs = self.openTabs(manager, 3)
+        placeholder = Tab('placeholder', isPlaceholder=True)
+
+        _, toDiscard = manager.plan(tabs + [placeholder], tabs[2])
+        self.assertEqual([tabs[0]], toDiscard)
+
+    def test_loadingAndCurrentAreKept(self):
+        manager = self.manager(freezeAfter=1, maxTabs=1)
+        loading, current = self.openTabs(manager, 2)
+        loading.isLoading = True
+        self.now = 100
+
+        self.assertEqual(([], []), manager.plan([loading, current], current))
+
+    def test_counters(self):
+        manager = self.manager()
+        tab, other = self.openTabs(manager, 2)
+        manager.frozen(tab)
+        manager.discarded(tab)
+        manager.frozen(other)
+
+        self.assertEqual({'frozen': 1, 'freezeCount': 2, 'discardCount': 1}, manager.stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Test code for table_import module
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from src.table_import import mapTable, mapText, fieldChanges, supportValue
+
+FIELDS = {0: 'Front', 1: 'Chrome', 2: 'Edge', 3: 'Firefox', 4: 'Safari'}
+TABLE = {
+    'headers': ['', 'Chrome', 'Edge', 'Firefox', 'Safari'],
+    'rows': [['flex-wrap', 'Chrome Full support 29', 'Edge Full support 12', 'Firefox Full support 28.1',
+              'Safari No support No']],
+}
+
+
+class TableImportTester(unittest.TestCase):
+
+    def test_supportValue(self):
+        self.assertEqual('29', supportValue('Chrome Full support 29'))
+        self.assertEqual('Yes', supportValue('Yes'))
+        self.assertEqual('', supportValue('No support No'))
+        self.assertIsNone(supportValue('flex-wrap'))
+
+    def test_consecutiveFields(self):
+        self.assertEqual({1: ['29'], 2: ['12'], 3: ['28.1']}, mapTable(TABLE, 1, FIELDS, {}))
+
+    def test_beyondLastField(self):
+        self.assertEqual({3: ['29'], 4: ['12']}, mapTable(TABLE, 3, FIELDS, {}))
+
+    def test_mappedColumns(self):
+        mapping = {'Firefox': 'Chrome', 'Chrome': 'Firefox', 'Safari': 'Safari', 'Unknown': 'Front'}
+        self.assertEqual({1: ['Firefox Full support 28.1'], 3: ['Chrome Full support 29'],
+                          4: ['Safari No support No']}, mapTable(TABLE, 0, FIELDS, mapping))
+
+    def test_mappedTextColumns(self):
+        table = {'headers': ['Word', 'Meaning', 'Page'], 'rows': [['perro', 'dog', 'p. 12'], ['gato', 'cat 2', ' ']]}
+        fields = {0: 'Front', 1: 'Back', 2: 'Page'}
+        self.assertEqual({0: ['perro', 'gato'], 1: ['dog', 'cat 2'], 2: ['p. 12']},
+                         mapTable(table, 0, fields, {'Word': 'Front', 'Meaning': 'Back', 'Page': 'Page'}))
+
+    def test_severalRows(self):
+        table = {'headers': ['Feature', 'Chrome'], 'rows': [['a', '1'], ['b', 'Yes']]}
+        self.assertEqual({1: ['1', 'Yes']}, mapTable(table, 0, FIELDS, {'Chrome': 'Chrome'}))
+        self.assertEqual({0: ['1'], 1: ['Yes']}, mapTable(table, 0, FIELDS, {}))
+
+    def test_rawValues(self):
+        table = {'headers': ['Word', 'Meaning'], 'rows': [['casa', 'house']]}
+        self.assertEqual({0: ['casa'], 1: ['house']}, mapTable(table, 0, FIELDS, {}, valueOf=lambda text: text))
+
+    def test_mapText(self):
+        self.assertEqual({1: ['29'], 2: ['12'], 4: ['Yes']}, mapText('29 \t12\tNo\tYes', 1, FIELDS))
+        self.assertEqual({4: ['29']}, mapText('29\t12', 4, FIELDS))
+
+    def test_appendToEachFieldOwnContent(self):
+        current = ['flex-wrap', 'Chrome:', 'Edge:', 'Firefox:', 'Safari:']
+        values = mapText('29\t12\tNo\t10.1', 1, FIELDS)
+        self.assertEqual({1: 'Chrome: 29', 2: 'Edge: 12', 4: 'Safari: 10.1'}, fieldChanges(values, current, False))
+        self.assertEqual({1: '29', 2: '12', 4: '10.1'}, fieldChanges(values, current, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
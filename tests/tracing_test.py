@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Test code for tracing module
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + '/../')
+
+import unittest
+from src.tracing import Tracer
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+class TracerTester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = Clock()
+        self.tracer = Tracer(clock=self.clock)
+
+    def lookup(self, provider, totalMs):
+        traceId = self.tracer.begin(provider)
+        self.clock.advance(totalMs / 2)
+        self.tracer.mark(traceId, 'loadStarted')
+        self.clock.advance(totalMs / 2)
+        self.tracer.end(traceId)
+        return traceId
+
+    def test_stepsSinceSelection(self):
+        traceId = self.tracer.begin('Google')
+        self.assertEqual(traceId, self.tracer.current)
+        self.clock.advance(5)
+        self.tracer.mark(traceId, 'open')
+        self.clock.advance(20)
+        self.tracer.progress(traceId, 60)
+        self.clock.advance(10)
+        self.tracer.progress(traceId, 80)       # milestones already marked
+        self.tracer.mark(traceId, 'open')       # only the first mark counts
+        self.tracer.end(traceId)
+
+        stats = self.tracer.stats()['Google']
+        self.assertEqual(1, stats['lookups'])
+        self.assertEqual(35, stats['p50_ms'])
+        self.assertEqual({'open': 5, 'progress 10': 25, 'progress 50': 25}, stats['steps'])
+        self.assertIsNone(self.tracer.current)
+
+    def test_percentilesPerProvider(self):
+        for ms in range(10, 110, 10):
+            self.lookup('Forvo', ms)
+        self.lookup('Google', 40)
+
+        stats = self.tracer.stats()
+        self.assertEqual(10, stats['Forvo']['lookups'])
+        self.assertEqual(55, stats['Forvo']['p50_ms'])
+        self.assertEqual(100, stats['Forvo']['p95_ms'])
+        self.assertEqual(40, stats['Google']['p95_ms'])
+
+    def test_endedOrUnknownIgnored(self):
+        traceId = self.lookup('Google', 10)
+        count = len(self.tracer.events())
+        self.tracer.mark(traceId, 'loadFinished')
+        self.tracer.mark(None, 'loadFinished')
+        self.tracer.end(traceId)
+        self.assertEqual(count, len(self.tracer.events()))
+
+    def test_bounded(self):
+        tracer = Tracer(maxEvents=6, clock=self.clock)
+        for _ in range(tracer.MAX_OPEN + 5):
+            tracer.begin('Never loaded')
+        self.assertEqual(6, len(tracer.events()))
+        self.assertFalse(tracer.isOpen(1))
+        self.assertTrue(tracer.isOpen(tracer.current))
+
+        self.tracer = tracer
+        for _ in range(5):
+            self.lookup('Google', 10)
+        self.assertEqual(2, tracer.stats()['Google']['lookups'])     # the others are off the buffer
+
+    def test_export(self):
+        self.lookup('Google', 10)
+        folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder, 'trace.json')
+            self.tracer.export(path)
+            with open(path) as f:
+                content = json.load(f)
+        finally:
+            shutil.rmtree(folder)
+
+        self.assertEqual(['select', 'loadStarted', 'end'], [e['name'] for e in content['traceEvents']])
+        self.assertEqual(5000, content['traceEvents'][1]['ts'])
+        self.assertEqual('Google', content['traceEvents'][1]['args']['provider'])
+        self.assertEqual(1, content['stats']['Google']['lookups'])
+
+    def test_clear(self):
+        self.lookup('Google', 10)
+        self.tracer.begin('Forvo')
+        self.tracer.clear()
+        self.assertEqual({}, self.tracer.stats())
+        self.assertIsNone(self.tracer.current)
+
+
+if __name__ == '__main__':
+    unittest.main()